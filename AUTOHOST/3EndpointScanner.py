@@ -8,6 +8,10 @@ from typing import Dict, List, Set, Optional, Tuple
 import sys
 import time
 
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from AdaptiveLimiter import AdaptiveLimiter
+
 class EndpointScanner:
     def __init__(self, ipbank_path: Path, services_dir: Path):
         self.ipbank_path = ipbank_path
@@ -15,7 +19,9 @@ class EndpointScanner:
         self.ipbank_data: Dict = {}
         self.service_definitions: Dict = {}  # Service name -> List of definitions with ports
         self.total_endpoints = 0
-        self.scan_delay = 0.5  # Delay between requests in seconds
+        self.scan_delay = 0.5  # Least time between requests to one IP, whatever the limiter allows
+        self.max_per_host = 8  # Most requests in flight to one IP; the limiter adapts below it
+        self.limiter = None
         
     async def load_files(self):
         """Load IPBank.json and all service definition files."""
@@ -82,26 +88,37 @@ class EndpointScanner:
         """Test a single endpoint and return True if it returns 200 OK."""
         protocol = "https" if is_ssl else "http"
         url = f"{protocol}://{ip}:{port}{endpoint}"
-        print(f"Testing: {url}")
         
+        # Wait for room in this IP's window; the response then resizes it
+        limit = self.limiter.host(ip)
+        started = await limit.acquire()
+        print(f"Testing: {url}")
+        status = None
+        retry_after = None
         try:
             async with session.get(url, ssl=False, timeout=5) as response:
-                return response.status == 200
+                status = response.status
+                retry_after = response.headers.get("Retry-After")
+                return status == 200
         except (aiohttp.ClientError, asyncio.TimeoutError):
             return False
+        finally:
+            await limit.release(started, status, retry_after)
 
     async def scan_endpoints(self, ip: str, port: int, endpoints: List[str], endpoint_type: str, 
                            session: aiohttp.ClientSession, is_ssl: bool = False) -> List[str]:
-        """Scan a list of endpoints and return successful ones."""
+        """Scan a list of endpoints concurrently, as fast as the IP's limiter allows, and return successful ones."""
         successful_endpoints = []
         print(f"\nScanning {endpoint_type} endpoints for {ip}:{port}")
         
-        for endpoint in endpoints:
-            if await self.test_endpoint(session, ip, port, endpoint, is_ssl):
+        results = await asyncio.gather(
+            *(self.test_endpoint(session, ip, port, endpoint, is_ssl) for endpoint in endpoints)
+        )
+        for endpoint, accessible in zip(endpoints, results):
+            if accessible:
                 full_endpoint = f"{ip}:{port}{endpoint}"
                 successful_endpoints.append(full_endpoint)
                 print(f"Found accessible endpoint: {full_endpoint}")
-            await asyncio.sleep(self.scan_delay)
             
         return successful_endpoints
 
@@ -159,9 +176,14 @@ class EndpointScanner:
         self.total_endpoints = self.count_total_endpoints()
         print(f"\nTotal endpoints to scan: {self.total_endpoints}")
         
+        # Created inside the event loop, which its per-IP limits belong to
+        self.limiter = AdaptiveLimiter(maximum=self.max_per_host, min_interval=self.scan_delay)
         for ip, data in self.ipbank_data.items():
             print(f"\nProcessing {ip}...")
             await self.process_ip(ip, data)
+        
+        print("\nFinal per-IP rate limits:")
+        self.limiter.report()
 
 async def main():
     if len(sys.argv) != 3:
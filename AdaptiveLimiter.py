@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+# Statuses that mean the target wants us to slow down
+BACKOFF_STATUSES = {429, 503}
+
+# Longest Retry-After honoured, and the longest spacing backoff grows to (seconds)
+MAX_RETRY_AFTER = 300
+MAX_DELAY = 60
+# Spacing a host gets when it pushes back while already at one request in flight
+FIRST_BACKOFF_DELAY = 0.5
+
+# Responses kept per host for the p95, and how many are needed before it is trusted
+LATENCY_WINDOW = 40
+MIN_SAMPLES = 10
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or an HTTP date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return min(float(value), MAX_RETRY_AFTER)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return min(max(moment.timestamp() - time.time(), 0.0), MAX_RETRY_AFTER)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+class HostLimit:
+    """AIMD window of requests in flight to one host.
+
+    Every flat-latency response while the window is full adds 1/limit to it
+    (one extra request per round trip's worth of responses). A 429/503, a
+    failed request or a p95 latency above tolerance x the host's baseline
+    multiplies it by backoff instead; once it is down to minimum, further
+    pushback spaces request starts out (doubling a delay), and Retry-After
+    holds all requests back until it has passed. Responses to requests sent
+    before the last decrease do not count again, so one burst of 429s backs
+    off once rather than once per response.
+    """
+    def __init__(self, initial=1, minimum=1, maximum=16, min_interval=0.0, tolerance=1.5, backoff=0.5):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_interval = min_interval
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.delay = min_interval   # spacing between request starts
+        self.in_flight = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.baseline = None        # lowest p95 seen, drifting up slowly if the host stays slower
+        self.not_before = 0.0       # monotonic time Retry-After holds requests back to
+        self.last_start = 0.0
+        self.last_decrease = 0.0
+        self.backoffs = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for room in the window; returns the start time to pass to release()"""
+        async with self.condition:
+            while True:
+                now = time.monotonic()
+                wait = max(self.not_before, self.last_start + self.delay) - now
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                try:
+                    await asyncio.wait_for(self.condition.wait(), wait if wait > 0 else None)
+                except asyncio.TimeoutError:
+                    pass
+            self.in_flight += 1
+            self.last_start = now
+            return now
+
+    async def release(self, started, status=None, retry_after=None):
+        """Report how the request started at started went; status None means it failed outright"""
+        async with self.condition:
+            self.in_flight -= 1
+            self.update(started, time.monotonic() - started, status, retry_after)
+            self.condition.notify_all()
+
+    def p95(self):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        return percentile(self.latencies, 0.95)
+
+    def update(self, started, latency, status, retry_after=None):
+        if status is None or status in BACKOFF_STATUSES:
+            wait = parse_retry_after(retry_after) if status is not None else None
+            if wait:
+                self.not_before = max(self.not_before, time.monotonic() + wait)
+            self.decrease(started)
+            return
+        self.latencies.append(latency)
+        p95 = self.p95()
+        if p95 is not None:
+            if self.baseline is None or p95 < self.baseline:
+                self.baseline = p95
+            elif p95 > self.baseline * self.tolerance:
+                self.decrease(started)
+                return
+            else:
+                # A host that settles at a slower pace becomes the new normal eventually
+                self.baseline += (p95 - self.baseline) * 0.05
+        self.increase()
+
+    def decrease(self, started):
+        if started < self.last_decrease:
+            # Sent under the window that was already cut
+            return
+        if self.limit > self.minimum:
+            self.limit = max(float(self.minimum), self.limit * self.backoff)
+        else:
+            self.delay = min(MAX_DELAY, max(self.delay * 2, FIRST_BACKOFF_DELAY))
+        self.last_decrease = time.monotonic()
+        self.latencies.clear()
+        self.backoffs += 1
+
+    def increase(self):
+        if self.delay > self.min_interval:
+            # Undo spacing before widening the window again
+            self.delay *= 0.9
+            if self.delay < max(self.min_interval, 0.05):
+                self.delay = self.min_interval
+        elif self.in_flight + 1 >= int(self.limit):
+            self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+
+    def summary(self):
+        p95 = self.p95()
+        return (f"limit {self.limit:.1f}, delay {self.delay:.2f}s, {self.backoffs} backoffs"
+                + (f", p95 {p95 * 1000:.0f}ms" if p95 is not None else ""))
+
+class AdaptiveLimiter:
+    """Per-host HostLimits sharing one set of defaults.
+
+    rules maps a host to keyword overrides for its HostLimit
+    ({"host": {"maximum": 2, "min_interval": 5}}). Use it from one event loop;
+    limits are created on first use so they belong to the running loop.
+    """
+    def __init__(self, rules=None, **defaults):
+        self.defaults = defaults
+        self.rules = rules or {}
+        self.hosts = {}
+
+    def host(self, name):
+        if name not in self.hosts:
+            self.hosts[name] = HostLimit(**{**self.defaults, **self.rules.get(name, {})})
+        return self.hosts[name]
+
+    def report(self):
+        for name, limit in sorted(self.hosts.items()):
+            print(f"{name}: {limit.summary()}")
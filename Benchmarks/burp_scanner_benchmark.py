@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import iter_items, item_text, raw_body
+from BurpScanner import scan_items
+from burpgen import generate_export, add_generator_arguments, generator_options
+from iterparse_benchmark import peak_rss_mb
+
+MODES = ('etparse', 'stream', 'scanner')
+
+def run_mode(mode, xml_file):
+    """Read url, method, status and the decoded request of every item"""
+    start = time.perf_counter()
+    count = 0
+    request_bytes = 0
+    if mode == 'scanner':
+        for item in scan_items(xml_file, ('url', 'method', 'request', 'status')):
+            item.text('url')
+            item.text('method')
+            item.text('status')
+            request_bytes += len(item.body('request'))
+            count += 1
+    else:
+        items = ET.parse(xml_file).getroot().iter('item') if mode == 'etparse' else iter_items(xml_file)
+        for item in items:
+            item_text(item, 'url')
+            item_text(item, 'method')
+            item_text(item, 'status')
+            request_bytes += len(raw_body(item.find('request')))
+            count += 1
+    elapsed = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'items': count,
+        'seconds': round(elapsed, 3),
+        'items_per_sec': round(count / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'request_bytes': request_bytes,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ET.parse and iterparse against the mmap field scanner')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to benchmark (default: generate one)')
+    add_generator_arguments(parser)
+    parser.set_defaults(items=20000, body_size=8192)
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Each mode runs in its own process so peak RSS is not shared
+        print(json.dumps(run_mode(args.child, args.xml_file)))
+        return
+
+    xml_file = args.xml_file
+    if xml_file is None:
+        handle, xml_file = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        print(f"Generating {args.items} items into {xml_file}...")
+        generate_export(xml_file, **generator_options(args))
+
+    try:
+        size_mb = os.path.getsize(xml_file) / (1024 * 1024)
+        print(f"Export size: {size_mb:.1f} MB")
+        for mode in MODES:
+            result = subprocess.run(
+                [sys.executable, __file__, xml_file, '--child', mode],
+                capture_output=True, text=True, check=True
+            )
+            stats = json.loads(result.stdout)
+            print(f"{mode:>8}: {stats['items']} items in {stats['seconds']}s "
+                  f"({stats['items_per_sec']} items/sec), peak RSS {stats['peak_rss_mb']} MB")
+    finally:
+        if args.xml_file is None:
+            os.remove(xml_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import base64
+import gzip
+import json
+import random
+import string
+import uuid
+
+METHODS = ('GET', 'GET', 'GET', 'POST', 'POST', 'PUT', 'DELETE')
+RESOURCES = ('user', 'account', 'order', 'item', 'invoice', 'session', 'report', 'file', 'cart', 'admin')
+EXTENSIONS = ('', '', '', '.json', '.php', '.js', '.html', '.aspx')
+CONTENT_TYPES = {'': 'application/json', '.json': 'application/json', '.php': 'text/html',
+                 '.js': 'application/javascript', '.html': 'text/html', '.aspx': 'text/html'}
+
+CRLF = "\r\n"
+
+# Bodies are drawn from a fixed pool of variants so generation stays cheap
+BODY_VARIANTS = 32
+
+def text_body(rng, size):
+    """Printable body text of about size bytes (never contains ]]>)"""
+    alphabet = string.ascii_letters + string.digits + ' \n{}":,'
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+def make_endpoints(rng, count):
+    """count (path template, extension) pairs; {id} is filled in per item"""
+    endpoints = []
+    for i in range(count):
+        resource = RESOURCES[i % len(RESOURCES)]
+        version = f"v{i // len(RESOURCES) % 3 + 1}"
+        shape = rng.choice(('/api/{v}/{r}/{id}', '/api/{v}/{r}', '/{r}/{id}/details', '/{r}s/{id}'))
+        path = shape.format(v=version, r=f"{resource}{i // (len(RESOURCES) * 3) or ''}", id='{id}')
+        endpoints.append((path, rng.choice(EXTENSIONS)))
+    return endpoints
+
+def item_id(rng):
+    """Path id in one of the shapes EndpointCluster recognizes"""
+    kind = rng.random()
+    if kind < 0.6:
+        return str(rng.randrange(1, 10 ** 6))
+    if kind < 0.8:
+        return str(uuid.UUID(int=rng.getrandbits(128)))
+    return '%032x' % rng.getrandbits(128)
+
+def cdata(value):
+    return f"<![CDATA[{value}]]>"
+
+def base64_field(name, data):
+    return f'<{name} base64="true">{cdata(base64.b64encode(data).decode("ascii"))}</{name}>'
+
+def generate_export(output_file, items=10000, body_size=2048, body_jitter=0.5, gzip_ratio=0.2,
+                    base64_ratio=0.8, hosts=5, endpoints=200, seed=0):
+    """Write a Burp-schema XML export and return a summary of what was generated.
+
+    body_size is the average raw response size, varied by +/- body_jitter.
+    gzip_ratio of the responses are gzip-encoded (always base64, being
+    binary); of the rest, base64_ratio are base64 and the others plain CDATA
+    text. hosts and endpoints set the host and path-template cardinality.
+    """
+    rng = random.Random(seed)
+    host_names = [f"app{i}.example.com" if i else "example.com" for i in range(hosts)]
+    endpoint_list = make_endpoints(rng, endpoints)
+    low = max(1, int(body_size * (1 - body_jitter)))
+    high = max(low, int(body_size * (1 + body_jitter)))
+    bodies = [text_body(rng, rng.randint(low, high)) for _ in range(BODY_VARIANTS)]
+    gzipped = [gzip.compress(body.encode('ascii')) for body in bodies]
+
+    counts = {'items': 0, 'gzip': 0, 'base64': 0, 'plain': 0}
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0"?>\n<items burpVersion="2024.5.4" exportTime="Mon Jan 01 00:00:00 UTC 2024">\n')
+        for i in range(items):
+            host = rng.choice(host_names)
+            template, extension = rng.choice(endpoint_list)
+            path = template.replace('{id}', item_id(rng)) + extension
+            if rng.random() < 0.2:
+                path += f"?page={rng.randrange(1, 50)}&sort=asc"
+            method = rng.choice(METHODS)
+            url = f"https://{host}{path}"
+            variant = rng.randrange(BODY_VARIANTS)
+
+            request_body = '{"id": %d, "name": "test"}' % i if method in ('POST', 'PUT') else ''
+            request = (f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+                       f"User-Agent: Mozilla/5.0\r\nAccept: */*\r\n"
+                       f"Referer: https://{host}/\r\nCookie: session={variant:04x}{i % 97:02x}\r\n")
+            if request_body:
+                request += f"Content-Type: application/json\r\nContent-Length: {len(request_body)}\r\n"
+            request += "\r\n" + request_body
+
+            status = rng.choice((200, 200, 200, 200, 201, 302, 404, 500))
+            headers = (f"HTTP/1.1 {status} OK\r\nContent-Type: {CONTENT_TYPES[extension]}\r\n"
+                       f"Server: nginx\r\nSet-Cookie: track={i}\r\n")
+            roll = rng.random()
+            if roll < gzip_ratio:
+                # A gzip body is binary, so the response has to be base64
+                head = (headers + "Content-Encoding: gzip\r\n\r\n").encode('ascii')
+                request_field = base64_field('request', request.encode('ascii'))
+                response_field = base64_field('response', head + gzipped[variant])
+                counts['gzip'] += 1
+            elif rng.random() < base64_ratio:
+                request_field = base64_field('request', request.encode('ascii'))
+                response_field = base64_field('response', (headers + "\r\n" + bodies[variant]).encode('ascii'))
+                counts['base64'] += 1
+            else:
+                request_field = f'<request base64="false">{cdata(request)}</request>'
+                response_field = f'<response base64="false">{cdata(headers + CRLF + bodies[variant])}</response>'
+                counts['plain'] += 1
+
+            f.write(
+                f"  <item>\n"
+                f"    <time>Mon Jan 01 00:00:{i % 60:02d} UTC 2024</time>\n"
+                f"    <url>{cdata(url)}</url>\n"
+                f"    <host ip=\"10.0.0.{host_names.index(host) + 1}\">{host}</host>\n"
+                f"    <port>443</port>\n"
+                f"    <protocol>https</protocol>\n"
+                f"    <method>{cdata(method)}</method>\n"
+                f"    <path>{cdata(path)}</path>\n"
+                f"    <extension>{extension.lstrip('.') or 'null'}</extension>\n"
+                f"    {request_field}\n"
+                f"    <status>{status}</status>\n"
+                f"    <responselength>{len(headers) + len(bodies[variant])}</responselength>\n"
+                f"    <mimetype>{'JSON' if 'json' in CONTENT_TYPES[extension] else 'HTML'}</mimetype>\n"
+                f"    {response_field}\n"
+                f"    <comment></comment>\n"
+                f"  </item>\n"
+            )
+            counts['items'] += 1
+        f.write('</items>\n')
+
+    return {
+        'items': items, 'body_size': body_size, 'body_jitter': body_jitter, 'gzip_ratio': gzip_ratio,
+        'base64_ratio': base64_ratio, 'hosts': hosts, 'endpoints': endpoints, 'seed': seed,
+        'generated': counts,
+    }
+
+def add_generator_arguments(parser):
+    """Generator options shared with the benchmark harness"""
+    parser.add_argument('--items', type=int, default=10000, help='Number of items (default: 10000)')
+    parser.add_argument('--body-size', type=int, default=2048, help='Average raw response body bytes (default: 2048)')
+    parser.add_argument('--body-jitter', type=float, default=0.5,
+                        help='Body sizes vary by this fraction either way (default: 0.5)')
+    parser.add_argument('--gzip-ratio', type=float, default=0.2, help='Fraction of gzip-encoded responses (default: 0.2)')
+    parser.add_argument('--base64-ratio', type=float, default=0.8,
+                        help='Fraction of the other items stored base64 rather than as plain text (default: 0.8)')
+    parser.add_argument('--hosts', type=int, default=5, help='Number of distinct hosts (default: 5)')
+    parser.add_argument('--endpoints', type=int, default=200, help='Number of distinct path templates (default: 200)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed; the same options give the same export')
+
+def generator_options(args):
+    return {'items': args.items, 'body_size': args.body_size, 'body_jitter': args.body_jitter,
+            'gzip_ratio': args.gzip_ratio, 'base64_ratio': args.base64_ratio, 'hosts': args.hosts,
+            'endpoints': args.endpoints, 'seed': args.seed}
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic Burp Suite XML export for benchmarking')
+    parser.add_argument('output_file', help='XML file to write')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    summary = generate_export(args.output_file, **generator_options(args))
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ENVExtract and its pack reader live in SynackCookieMGMT
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "SynackCookieMGMT"))
+from ENVExtract import BurpExtractor
+from ENVPack import load_items
+from burpgen import generate_export, add_generator_arguments, generator_options
+
+def count_files(directory):
+    return sum(len(files) for _, _, files in os.walk(directory))
+
+def time_layout(xml_file, output_dir, pack):
+    """Extract the export in one layout, then load it the way ENVGUI does"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        BurpExtractor(output_dir, pack).process_xml(xml_file)
+    extract_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    items = load_items(output_dir)
+    load_time = time.perf_counter() - start
+    return extract_time, load_time, len(items), count_files(output_dir)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ENVExtract file-per-item output against the pack layout')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to extract (default: generate one)')
+    add_generator_arguments(parser)
+    parser.set_defaults(items=50000, body_size=1024)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    xml_file = args.xml_file
+    if xml_file is None:
+        xml_file = os.path.join(work_dir, "export.xml")
+        print(f"Generating {args.items} items into {xml_file}...")
+        generate_export(xml_file, **generator_options(args))
+
+    try:
+        for name, pack in (('files', False), ('pack', True)):
+            extract_time, load_time, count, files = time_layout(xml_file, os.path.join(work_dir, name), pack)
+            print(f"{name:>6}: extract {extract_time:.2f}s, load {load_time:.2f}s, "
+                  f"{count} items in {files} files")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
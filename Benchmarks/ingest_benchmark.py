@@ -0,0 +1,182 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root; the tools live next to them
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from BurpStream import open_items, scan_item_spans
+from burpgen import generate_export, add_generator_arguments, generator_options
+from iterparse_benchmark import peak_rss_mb
+
+# Run in this order: the viewer loaders read what the ENVExtract runs wrote
+TOOLS = ('xmlsorter', 'sortxml', 'envextract', 'envextract-pack', 'xml2curl',
+         'viewer-files', 'viewer-pack', 'viewer-index')
+# Tools whose -j splits the export into shards
+SHARDED_TOOLS = ('xmlsorter', 'envextract', 'envextract-pack', 'xml2curl')
+
+def run_tool(tool, xml_file, work_dir, processes=1):
+    """Run one tool over the export with its output under work_dir; returns items handled"""
+    work_dir = Path(work_dir)
+    output_dir = work_dir / tool
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if tool == 'xmlsorter':
+        from XMLSorterFinal import XMLProcessor
+        XMLProcessor(xml_file, output_dir=output_dir).process(processes=processes)
+        return None
+    if tool == 'sortxml':
+        sys.path.insert(0, str(ROOT / "SortXML"))
+        from sortxml import organize_burp_xml
+        # sortxml writes burp_organized/ into the working directory
+        os.chdir(output_dir)
+        organize_burp_xml(xml_file)
+        return None
+    if tool in ('envextract', 'envextract-pack'):
+        sys.path.insert(0, str(ROOT / "SynackCookieMGMT"))
+        from ENVExtract import BurpExtractor
+        BurpExtractor(output_dir, pack=tool == 'envextract-pack').process_xml(xml_file, processes=processes)
+        return None
+    if tool == 'xml2curl':
+        sys.path.insert(0, str(ROOT / "Mission3Tools"))
+        from XML2Curl import batch_curl_commands
+        written, skipped = batch_curl_commands(xml_file, output_dir, processes)
+        return written + skipped
+    if tool in ('viewer-files', 'viewer-pack'):
+        # What ENVGUI/GUIBeautified do when a directory is opened
+        sys.path.insert(0, str(ROOT / "SynackCookieMGMT"))
+        from ENVPack import load_items
+        source = work_dir / ('envextract' if tool == 'viewer-files' else 'envextract-pack')
+        return len(load_items(source))
+    if tool == 'viewer-index':
+        # What XMLProcessorApproved/CookieAnalyzer do: index, then parse each item on display
+        items = open_items(xml_file)
+        try:
+            for position in range(len(items)):
+                items[position]
+            return len(items)
+        finally:
+            items.close()
+    raise ValueError(f"Unknown tool: {tool}")
+
+def measure(tool, xml_file, work_dir, item_count, processes=1):
+    """Time one tool run and report wall time, peak RSS and items/sec"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        handled = run_tool(tool, xml_file, work_dir, processes)
+    elapsed = time.perf_counter() - start
+    count = handled if handled is not None else item_count
+    return {
+        'tool': tool,
+        'items': count,
+        'seconds': round(elapsed, 3),
+        'items_per_sec': round(count / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+def run_child(tool, xml_file, work_dir, item_count, processes=1):
+    """measure() one tool in a fresh process, so peak RSS is not shared between runs"""
+    result = subprocess.run(
+        [sys.executable, __file__, xml_file, '--child', tool, '--work-dir', work_dir,
+         '--item-count', str(item_count), '-j', str(processes)],
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, previous_file):
+    """Print the change in wall time per tool against an earlier results file"""
+    with open(previous_file, 'r') as f:
+        previous = {entry['tool']: entry for entry in json.load(f)['results']}
+    print(f"\nCompared with {previous_file}:")
+    for entry in results:
+        before = previous.get(entry['tool'])
+        if before is None or not before['seconds']:
+            continue
+        change = (entry['seconds'] - before['seconds']) / before['seconds'] * 100
+        print(f"{entry['tool']:>16}: {before['seconds']}s -> {entry['seconds']}s ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the XML tools against a synthetic (or given) Burp export')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to benchmark (default: generate one)')
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help='JSON results file to write (default: benchmark_results.json)')
+    parser.add_argument('--tools', nargs='+', choices=TOOLS, default=list(TOOLS), help='Tools to run (default: all)')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help='Worker processes for the tools that support them (default: 1)')
+    parser.add_argument('--compare', metavar='RESULTS', help='Earlier results file to compare wall times against')
+    parser.add_argument('--child', choices=TOOLS, help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--item-count', type=int, help=argparse.SUPPRESS)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    if args.child:
+        # Each tool runs in its own process so peak RSS is not shared
+        print(json.dumps(measure(args.child, args.xml_file, args.work_dir, args.item_count, args.processes)))
+        return
+
+    work_dir = tempfile.mkdtemp()
+    xml_file = args.xml_file
+    export = {'file': xml_file}
+    try:
+        if xml_file is None:
+            xml_file = os.path.join(work_dir, "export.xml")
+            print(f"Generating {args.items} items into {xml_file}...")
+            export = generate_export(xml_file, **generator_options(args))
+        xml_file = os.path.abspath(xml_file)
+        item_count = sum(1 for _ in scan_item_spans(xml_file))
+        export['size_mb'] = round(os.path.getsize(xml_file) / (1024 * 1024), 1)
+        print(f"Export: {item_count} items, {export['size_mb']} MB")
+
+        # Viewer loaders need the matching ENVExtract output
+        tools = [tool for tool in TOOLS if tool in args.tools]
+        if 'viewer-files' in tools and 'envextract' not in tools:
+            tools.insert(tools.index('viewer-files'), 'envextract')
+        if 'viewer-pack' in tools and 'envextract-pack' not in tools:
+            tools.insert(tools.index('viewer-pack'), 'envextract-pack')
+
+        results = []
+        for tool in tools:
+            stats = run_child(tool, xml_file, work_dir, item_count, args.processes)
+            results.append(stats)
+            print(f"{tool:>16}: {stats['items']} items in {stats['seconds']}s "
+                  f"({stats['items_per_sec']} items/sec), peak RSS {stats['peak_rss_mb']} MB")
+    finally:
+        shutil.rmtree(work_dir)
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'processes': args.processes,
+        'export': export,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
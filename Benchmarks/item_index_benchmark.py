@@ -0,0 +1,63 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import ItemIndex, default_index_path
+from burpgen import generate_export, add_generator_arguments, generator_options
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure viewer open time through the byte-offset item index')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to index (default: generate one)')
+    add_generator_arguments(parser)
+    parser.set_defaults(items=100000, body_size=2048)
+    parser.add_argument('--lookups', type=int, default=1000, help='Random item lookups to time')
+    args = parser.parse_args()
+
+    xml_file = args.xml_file
+    if xml_file is None:
+        handle, xml_file = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        print(f"Generating {args.items} items into {xml_file}...")
+        generate_export(xml_file, **generator_options(args))
+
+    index_file = default_index_path(xml_file)
+    try:
+        if os.path.exists(index_file):
+            os.remove(index_file)
+
+        start = time.perf_counter()
+        index = ItemIndex.open(xml_file)
+        build_time = time.perf_counter() - start
+        index.close()
+
+        # Second open reads the sidecar, which is what the viewers hit from then on
+        start = time.perf_counter()
+        index = ItemIndex.open(xml_file)
+        first_item = index[0]
+        open_time = time.perf_counter() - start
+
+        positions = [random.randrange(len(index)) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        for position in positions:
+            index[position]
+        lookup_time = time.perf_counter() - start
+        index.close()
+
+        print(f"Items: {len(index)} ({os.path.getsize(xml_file) / (1024 * 1024):.1f} MB)")
+        print(f"First open (scan + write index): {build_time:.3f}s")
+        print(f"Open with sidecar + first item:  {open_time:.3f}s")
+        print(f"Random item parse:               {lookup_time / args.lookups * 1000:.3f} ms/item")
+    finally:
+        if args.xml_file is None:
+            os.remove(xml_file)
+            if os.path.exists(index_file):
+                os.remove(index_file)
+
+if __name__ == "__main__":
+    main()
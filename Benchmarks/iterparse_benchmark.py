@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import iter_items
+from burpgen import generate_export, add_generator_arguments, generator_options
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def run_mode(mode, xml_file):
+    """Walk every item with the given reader and report timing and memory"""
+    start = time.perf_counter()
+    count = 0
+    total = 0
+    if mode == 'etparse':
+        root = ET.parse(xml_file).getroot()
+        for item in root.findall('.//item'):
+            count += 1
+            total += len(item.find('response').text or '')
+    else:
+        for item in iter_items(xml_file):
+            count += 1
+            total += len(item.find('response').text or '')
+    elapsed = time.perf_counter() - start
+    return {
+        'mode': mode,
+        'items': count,
+        'seconds': round(elapsed, 3),
+        'items_per_sec': round(count / elapsed, 1) if elapsed else None,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+        'payload_chars': total,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ET.parse against the streaming item reader')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to benchmark (default: generate one)')
+    add_generator_arguments(parser)
+    parser.set_defaults(items=20000, body_size=8192)
+    parser.add_argument('--child', choices=['etparse', 'stream'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        # Each mode runs in its own process so peak RSS is not shared
+        print(json.dumps(run_mode(args.child, args.xml_file)))
+        return
+
+    xml_file = args.xml_file
+    if xml_file is None:
+        handle, xml_file = tempfile.mkstemp(suffix='.xml')
+        os.close(handle)
+        print(f"Generating {args.items} items into {xml_file}...")
+        generate_export(xml_file, **generator_options(args))
+
+    try:
+        size_mb = os.path.getsize(xml_file) / (1024 * 1024)
+        print(f"Export size: {size_mb:.1f} MB")
+        for mode in ('etparse', 'stream'):
+            result = subprocess.run(
+                [sys.executable, __file__, xml_file, '--child', mode],
+                capture_output=True, text=True, check=True
+            )
+            stats = json.loads(result.stdout)
+            print(f"{mode:>8}: {stats['items']} items in {stats['seconds']}s "
+                  f"({stats['items_per_sec']} items/sec), peak RSS {stats['peak_rss_mb']} MB")
+    finally:
+        if args.xml_file is None:
+            os.remove(xml_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Shared helpers live in the repository root
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+from KeywordMatcher import KeywordAutomaton, keywords_from_json
+
+def random_segment(rng, min_len=3, max_len=10):
+    """Random lowercase path segment"""
+    return ''.join(rng.choice(string.ascii_lowercase + '-_') for _ in range(rng.randint(min_len, max_len)))
+
+def build_keywords(rng, count):
+    """Repository keyword lists padded with random path fragments up to count"""
+    keywords = keywords_from_json(REPO_ROOT / "IDORList.json") + keywords_from_json(REPO_ROOT / "DefaultPathsEnum1.json")
+    keywords = [keyword.lower() for keyword in keywords]
+    while len(keywords) < count:
+        keywords.append('/' + random_segment(rng))
+    return keywords[:count]
+
+def build_paths(rng, keywords, count):
+    """Synthetic request paths, a fraction of which contain a keyword"""
+    paths = []
+    for _ in range(count):
+        segments = [random_segment(rng) for _ in range(rng.randint(2, 6))]
+        path = '/' + '/'.join(segments)
+        if rng.random() < 0.3:
+            path += rng.choice(keywords)
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare generator-expression keyword checks with the Aho-Corasick matcher')
+    parser.add_argument('--keywords', type=int, default=10000, help='Number of keywords (default: 10000)')
+    parser.add_argument('--paths', type=int, default=20000, help='Number of paths to tag (default: 20000)')
+    parser.add_argument('--seed', type=int, default=1337)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keywords = build_keywords(rng, args.keywords)
+    paths = build_paths(rng, keywords, args.paths)
+    print(f"{len(keywords)} keywords, {len(paths)} paths")
+
+    # Current approach: one substring scan per keyword per path
+    start = time.perf_counter()
+    naive = [{keyword for keyword in keywords if keyword in path} for path in paths]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = KeywordAutomaton(keywords).compile()
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [matcher.find_tags(path) for path in paths]
+    match_time = time.perf_counter() - start
+
+    if naive != compiled:
+        print("Warning: matcher results differ from the generator expressions")
+
+    print(f"generator expressions: {naive_time:.3f}s ({len(paths) / naive_time:.0f} paths/sec)")
+    print(f"automaton build:       {build_time:.3f}s ({len(matcher)} states)")
+    print(f"automaton match:       {match_time:.3f}s ({len(paths) / match_time:.0f} paths/sec)")
+    print(f"speedup (match only):  {naive_time / match_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
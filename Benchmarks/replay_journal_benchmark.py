@@ -0,0 +1,51 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import ReplayJournal
+from ReplayJournal import ReplayJournal as Journal, load_completed
+
+def record_many(journal, worker, count):
+    for number in range(count):
+        journal.record('bench', f"curl $'http://example.com/{worker}/{number}'", number, 200, 0.05)
+
+def time_records(path, threads, count):
+    """Seconds per record with threads workers recording count entries each"""
+    journal = Journal(path)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        for worker in range(threads):
+            pool.submit(record_many, journal, worker, count)
+    journal.close()
+    return (time.perf_counter() - start) / (threads * count)
+
+def main():
+    parser = argparse.ArgumentParser(description='Time journal records with batched fsync against an fsync per record')
+    parser.add_argument('--records', type=int, default=2000, help='Entries each thread records')
+    parser.add_argument('--threads', type=int, default=8, help='Threads recording at once (like --concurrency)')
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp())
+    try:
+        batched = time_records(work_dir / "batched.jsonl", args.threads, args.records)
+        print(f"batched fsync: {batched * 1e6:.1f} us per record ({1 / batched:,.0f} records/sec)")
+
+        # Every record synced on its own, the naive crash-safe journal
+        ReplayJournal.SYNC_EVERY = 1
+        each = time_records(work_dir / "each.jsonl", args.threads, args.records)
+        print(f"  fsync each: {each * 1e6:.1f} us per record ({1 / each:,.0f} records/sec)")
+        print(f"     speedup: {each / batched:.0f}x")
+
+        loaded = len(load_completed(work_dir / "batched.jsonl"))
+        print(f"  resume load: {loaded} of {args.threads * args.records} entries read back")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from CurlRunner import ResponseCounter, find_next_response_number
+
+def allocate_many(output_dir, count):
+    counter = ResponseCounter(output_dir)
+    return [counter.allocate() for _ in range(count)]
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare globbing for the next response number against the counter file')
+    parser.add_argument('--existing', type=int, default=100000, help='Response files already in the folder')
+    parser.add_argument('--allocations', type=int, default=1000, help='Numbers to allocate with the counter')
+    parser.add_argument('--scans', type=int, default=5, help='Calls of the old glob scan to time')
+    parser.add_argument('--workers', type=int, default=4, help='Processes allocating concurrently in the race check')
+    args = parser.parse_args()
+
+    output_dir = Path(tempfile.mkdtemp())
+    try:
+        print(f"Creating {args.existing} response files...")
+        for number in range(1, args.existing + 1):
+            (output_dir / f"response{number}.txt").touch()
+
+        start = time.perf_counter()
+        for _ in range(args.scans):
+            find_next_response_number(output_dir)
+        scan_time = (time.perf_counter() - start) / args.scans
+        print(f"    glob scan: {scan_time * 1000:.1f} ms per number")
+
+        counter = ResponseCounter(output_dir)
+        start = time.perf_counter()
+        first = counter.allocate()  # seeds the counter from the existing files
+        seed_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.allocations):
+            counter.allocate()
+        counter_time = (time.perf_counter() - start) / args.allocations
+        print(f"      counter: {counter_time * 1000:.3f} ms per number "
+              f"(first allocation {seed_time * 1000:.1f} ms seeds it at {first})")
+        print(f"      speedup: {scan_time / counter_time:.0f}x")
+
+        # Concurrent runners must never be handed the same number
+        with ProcessPoolExecutor(args.workers) as pool:
+            batches = list(pool.map(allocate_many, [output_dir] * args.workers,
+                                    [args.allocations] * args.workers))
+        numbers = [number for batch in batches for number in batch]
+        unique = len(set(numbers)) == len(numbers)
+        print(f"   race check: {len(numbers)} numbers from {args.workers} processes, "
+              f"{'all unique' if unique else 'DUPLICATES FOUND'}")
+    finally:
+        shutil.rmtree(output_dir)
+
+if __name__ == "__main__":
+    main()
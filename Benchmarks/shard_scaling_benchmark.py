@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import scan_item_spans
+from burpgen import generate_export, add_generator_arguments, generator_options
+from ingest_benchmark import SHARDED_TOOLS, run_child, git_commit
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how the sharded tools scale with -j')
+    parser.add_argument('xml_file', nargs='?', help='Burp XML export to benchmark (default: generate one)')
+    parser.add_argument('-j', '--processes', type=int, nargs='+', default=[1, 2, 4, 8],
+                        help='Process counts to time each tool with (default: 1 2 4 8)')
+    parser.add_argument('--tools', nargs='+', choices=SHARDED_TOOLS, default=list(SHARDED_TOOLS),
+                        help='Tools to run (default: all sharded tools)')
+    parser.add_argument('-o', '--output', help='JSON file to write the results to')
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        xml_file = args.xml_file
+        if xml_file is None:
+            xml_file = os.path.join(work_dir, "export.xml")
+            print(f"Generating {args.items} items into {xml_file}...")
+            generate_export(xml_file, **generator_options(args))
+        xml_file = os.path.abspath(xml_file)
+        item_count = sum(1 for _ in scan_item_spans(xml_file))
+        print(f"Export: {item_count} items, {os.cpu_count()} CPUs")
+
+        for tool in args.tools:
+            baseline = None
+            for processes in args.processes:
+                # A clean output directory per run, so no run appends to another's output
+                run_dir = os.path.join(work_dir, f"{tool}-j{processes}")
+                os.makedirs(run_dir)
+                stats = run_child(tool, xml_file, run_dir, item_count, processes)
+                shutil.rmtree(run_dir)
+                if baseline is None:
+                    baseline = stats['seconds']
+                speedup = baseline / stats['seconds'] if stats['seconds'] else 0
+                stats.update(processes=processes, speedup=round(speedup, 2),
+                             efficiency=round(speedup / (processes / args.processes[0]), 2))
+                results.append(stats)
+                print(f"{tool:>16} -j {processes:<2}: {stats['seconds']}s, {stats['items_per_sec']} items/sec, "
+                      f"speedup {stats['speedup']}x, efficiency {stats['efficiency']:.0%}")
+    finally:
+        shutil.rmtree(work_dir)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'commit': git_commit(), 'cpus': os.cpu_count(), 'items': item_count,
+                       'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import random
+import string
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+# Shared helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from ChunkedText import ChunkedTextRenderer
+
+def make_body(size, minified=False):
+    """Text body of roughly size characters, either line-based or one long line"""
+    line = ''.join(random.choice(string.ascii_letters + ' {}":,') for _ in range(120))
+    body = (line * (size // len(line) + 1))[:size]
+    if not minified:
+        body = '\n'.join(body[i:i + 120] for i in range(0, len(body), 120))
+    return body
+
+def time_paint(root, paint):
+    """Run a paint function and wait until Tk has processed the redraw"""
+    start = time.perf_counter()
+    paint()
+    root.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure time-to-first-paint of large bodies in a tk.Text (needs a display)')
+    parser.add_argument('--sizes', default='10000,1000000,5000000,20000000',
+                        help='Comma-separated body sizes in characters')
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Error: cannot open a Tk display: {e}")
+        sys.exit(1)
+
+    text = tk.Text(root, wrap=tk.WORD, width=60, height=30)
+    text.pack()
+    renderer = ChunkedTextRenderer(text)
+    root.update()
+
+    print(f"{'size':>10} {'kind':>9} {'single insert ms':>17} {'chunked ms':>11}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        for minified in (False, True):
+            body = make_body(size, minified)
+
+            def insert_all():
+                text.delete('1.0', tk.END)
+                text.insert('1.0', body)
+
+            naive = time_paint(root, insert_all)
+            chunked = time_paint(root, lambda: renderer.set_content(body))
+            kind = "minified" if minified else "lines"
+            print(f"{size:>10} {kind:>9} {naive:>17.1f} {chunked:>11.1f}")
+
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from pathlib import Path
+import hashlib
+from BurpStream import item_text, raw_body
+
+# Headers that change what the server does with a request. Everything else
+# (User-Agent, Referer, Date, caching and sec-* headers, ...) is ignored so
+# the same request captured twice hashes the same.
+SIGNIFICANT_HEADERS = ('authorization', 'cookie', 'content-type', 'x-api-key',
+                       'x-csrf-token', 'x-xsrf-token', 'x-requested-with')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url):
+    """Lowercase scheme and host, drop default ports and sort query parameters"""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+def split_request(request_bytes):
+    """Split a raw HTTP request into ({lowercased header: value}, body)"""
+    head, _, body = request_bytes.partition(b'\r\n\r\n')
+    if not _:
+        head, _, body = request_bytes.partition(b'\n\n')
+    headers = {}
+    for line in head.decode('utf-8', errors='replace').splitlines()[1:]:
+        if ':' in line:
+            key, value = line.split(':', 1)
+            headers[key.strip().lower()] = value.strip()
+    return headers, body
+
+def request_fingerprint(method, url, request_bytes, significant_headers=SIGNIFICANT_HEADERS):
+    """Hash of method + normalized URL + significant headers + body digest"""
+    headers, body = split_request(request_bytes)
+    digest = hashlib.sha256()
+    digest.update(method.strip().upper().encode('utf-8') + b'\n')
+    digest.update(normalize_url(url).encode('utf-8') + b'\n')
+    for name in significant_headers:
+        if name in headers:
+            digest.update(f"{name}: {headers[name]}\n".encode('utf-8'))
+    digest.update(hashlib.sha256(body).digest())
+    return digest.hexdigest()
+
+def item_fingerprint(item):
+    """request_fingerprint of a Burp <item> element"""
+    return request_fingerprint(item_text(item, 'method', ''), item_text(item, 'url', ''),
+                               raw_body(item.find('request')))
+
+def scanned_fingerprint(item):
+    """request_fingerprint of a BurpScanner.ScannedItem (needs method, url and request)"""
+    return request_fingerprint(item.text('method', ''), item.text('url', ''), item.body('request'))
+
+class SeenSet:
+    """Persistent set of request fingerprints, one hex digest per line.
+
+    Loaded into memory on open. New fingerprints stay pending until commit(),
+    which leaving a with block without an exception does, so a run that is
+    interrupted before its items are written records none of them and the
+    next run picks them up again.
+    """
+    def __init__(self, seen_file):
+        self.seen_file = Path(seen_file)
+        self.seen = set()
+        if self.seen_file.exists():
+            with open(self.seen_file, 'r') as f:
+                self.seen.update(line.strip() for line in f if line.strip())
+        self.pending = []
+        self.added = 0
+
+    def add(self, fingerprint):
+        """Record a fingerprint; returns True if it had not been seen before"""
+        if fingerprint in self.seen:
+            return False
+        self.seen.add(fingerprint)
+        self.pending.append(fingerprint)
+        self.added += 1
+        return True
+
+    def commit(self):
+        """Append the fingerprints added since the last commit to the file"""
+        if not self.pending:
+            return
+        with open(self.seen_file, 'a') as f:
+            f.write(''.join(fingerprint + '\n' for fingerprint in self.pending))
+        self.pending = []
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self.seen
+
+    def __len__(self):
+        return len(self.seen)
+
+    def close(self, commit=True):
+        if commit:
+            self.commit()
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+def dedup_items(items, seen, stats=None, fingerprint=item_fingerprint):
+    """Yield only items whose fingerprint is not in seen, recording new ones.
+
+    stats, if given, is a dict updated with 'new' and 'duplicate' counts.
+    Pass fingerprint=scanned_fingerprint for items from BurpScanner.
+    """
+    for item in items:
+        if seen.add(fingerprint(item)):
+            if stats is not None:
+                stats['new'] = stats.get('new', 0) + 1
+            yield item
+        elif stats is not None:
+            stats['duplicate'] = stats.get('duplicate', 0) + 1
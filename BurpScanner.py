@@ -0,0 +1,205 @@
+import binascii
+import mmap
+import os
+import re
+from xml.sax.saxutils import unescape
+from BurpStream import iter_item_spans, iter_items, serialize_item
+
+# Opening tag of a child element of <item>: name, then the raw attribute text
+CHILD_TAG = re.compile(rb'<([A-Za-z_][\w.-]*)([^>]*)>')
+ATTRIBUTE = re.compile(rb'([\w.-]+)\s*=\s*"([^"]*)"')
+CDATA_START = b'<![CDATA['
+CDATA_END = b']]>'
+CDATA_LENGTH = len(CDATA_START)
+
+# Entities beyond &amp; &lt; &gt; that can appear in escaped element text
+XML_ENTITIES = {'&quot;': '"', '&apos;': "'"}
+
+class ScannedItem:
+    """Field spans of one <item>, found by byte search instead of building a tree.
+
+    Payloads are zero-copy memoryview slices of the mapped export, so they are
+    only valid while the scan is running; copy() detaches an item that has to
+    outlive it.
+    """
+    __slots__ = ('view', 'fields')
+
+    def __init__(self, view, fields):
+        self.view = view      # memoryview of the buffer the spans point into
+        self.fields = fields  # name -> (start, end, attribute bytes, is CDATA)
+
+    def __contains__(self, name):
+        return name in self.fields
+
+    def payload(self, name):
+        """Raw text of a field (base64 left encoded) as a memoryview, or None"""
+        span = self.fields.get(name)
+        if span is None:
+            return None
+        return self.view[span[0]:span[1]]
+
+    def attr(self, name, key, default=None):
+        """Value of an attribute on a field's tag, e.g. attr('host', 'ip')"""
+        span = self.fields.get(name)
+        if span is None:
+            return default
+        for match in ATTRIBUTE.finditer(span[2]):
+            if match.group(1).decode('ascii') == key:
+                return match.group(2).decode('utf-8')
+        return default
+
+    def is_base64(self, name):
+        return self.attr(name, 'base64') == 'true'
+
+    def text(self, name, default=None):
+        """Text of a field like item_text(): CDATA as-is, escaped text unescaped.
+
+        Line endings are normalized to LF first, as an XML parser does.
+        """
+        span = self.fields.get(name)
+        if span is None or span[0] == span[1]:
+            return default
+        raw = bytes(self.view[span[0]:span[1]]).decode('utf-8')
+        if '\r' in raw:
+            raw = raw.replace('\r\n', '\n').replace('\r', '\n')
+        if span[3]:
+            return raw
+        return unescape(raw, XML_ENTITIES)
+
+    def body(self, name):
+        """Decoded bytes of a request/response field, like BurpStream.raw_body()"""
+        if name not in self.fields:
+            return b""
+        if self.is_base64(name):
+            return binascii.a2b_base64(self.payload(name))
+        return (self.text(name) or "").encode('utf-8')
+
+    def decoded(self, name, errors='replace'):
+        """Text of a request/response field, like BurpStream.decode_field()"""
+        if self.is_base64(name):
+            try:
+                return self.body(name).decode('utf-8', errors=errors)
+            except Exception as e:
+                return f"Error decoding content: {str(e)}"
+        return self.text(name, "")
+
+    def copy(self):
+        """Detached copy that owns its bytes and stays valid after the scan"""
+        starts = [span[0] for span in self.fields.values()]
+        if not starts:
+            return ScannedItem(memoryview(b""), {})
+        base = min(starts)
+        end = max(span[1] for span in self.fields.values())
+        view = memoryview(bytes(self.view[base:end]))
+        fields = {name: (start - base, stop - base, attrs, cdata)
+                  for name, (start, stop, attrs, cdata) in self.fields.items()}
+        return ScannedItem(view, fields)
+
+def parse_fields(data, start, end, wanted=None):
+    """Locate the child fields of the <item> spanning data[start:end].
+
+    Children are walked in order and CDATA bodies are skipped whole, so
+    markup inside a request never looks like a field. Stops as soon as every
+    wanted field has been seen. Returns {name: (start, end, attrs, cdata)}.
+    """
+    fields = {}
+    remaining = {name.encode('ascii') for name in wanted} if wanted else None
+    search = CHILD_TAG.search
+    find = data.find
+    position = find(b'>', start, end) + 1  # past <item>
+    while True:
+        match = search(data, position, end)
+        if match is None:
+            break
+        tag, attrs = match.groups()
+        position = match.end()
+
+        if attrs[-1:] == b'/':
+            # <comment/>: empty element
+            value_start = value_end = position
+            cdata = False
+        elif data[position:position + CDATA_LENGTH] == CDATA_START:
+            value_start = position + CDATA_LENGTH
+            value_end = find(CDATA_END, value_start, end)
+            if value_end == -1:
+                break
+            # The closing tag follows the CDATA section directly
+            position = find(b'>', value_end + 3, end) + 1
+            if not position:
+                break
+            cdata = True
+        else:
+            # Escaped text has no '<' in it, so the next one opens the closing tag
+            value_start = position
+            value_end = find(b'<', value_start, end)
+            if value_end == -1:
+                break
+            position = find(b'>', value_end, end) + 1
+            if not position:
+                break
+            cdata = False
+
+        if remaining is None:
+            fields[tag.decode('ascii')] = (value_start, value_end, attrs, cdata)
+        elif tag in remaining:
+            fields[tag.decode('ascii')] = (value_start, value_end, attrs, cdata)
+            remaining.discard(tag)
+            if not remaining:
+                break
+    return fields
+
+class BurpScanner:
+    """Memory-mapped scanner over the items of a Burp XML export.
+
+    Iterating yields a ScannedItem per <item> with only the requested fields
+    located, e.g. BurpScanner(xml_file, ('url', 'method', 'request')). Use it
+    as a context manager so the mapping is released when done.
+    """
+    def __init__(self, xml_file, fields=None):
+        self.xml_file = xml_file
+        self.fields = tuple(fields) if fields else None
+        self.handle = open(xml_file, 'rb')
+        self.data = None
+        self.view = None
+        if os.fstat(self.handle.fileno()).st_size:
+            self.data = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self.data)
+
+    def __iter__(self):
+        if self.data is None:
+            return
+        yield from self.items_at(iter_item_spans(self.data))
+
+    def items_at(self, spans):
+        """ScannedItems for known (offset, length) item spans, e.g. a shard of an ItemIndex"""
+        for offset, length in spans:
+            yield ScannedItem(self.view, parse_fields(self.data, offset, offset + length, self.fields))
+
+    def close(self):
+        if self.view is not None:
+            try:
+                self.view.release()
+                self.data.close()
+            except BufferError:
+                # A caller still holds a payload slice; the mapping goes with it
+                pass
+            self.view = self.data = None
+        self.handle.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def scan_items(xml_file, fields=None):
+    """Yield ScannedItems of an export, or of a BurpStore database via iter_items()"""
+    from BurpStore import is_store
+    if is_store(xml_file):
+        for item in iter_items(xml_file):
+            data = serialize_item(item).encode('utf-8')
+            yield ScannedItem(memoryview(data), parse_fields(data, 0, len(data), fields))
+        return
+
+    with BurpScanner(xml_file, fields) as scanner:
+        yield from scanner
@@ -0,0 +1,269 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import argparse
+import base64
+import hashlib
+import sqlite3
+import sys
+import threading
+import zlib
+from BurpStream import iter_items, item_text, raw_body, ItemWriter
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    time TEXT,
+    url TEXT,
+    host TEXT,
+    ip TEXT,
+    port INTEGER,
+    protocol TEXT,
+    method TEXT,
+    path TEXT,
+    extension TEXT,
+    status INTEGER,
+    mime TEXT,
+    response_length INTEGER,
+    comment TEXT,
+    request BLOB,
+    response BLOB,
+    compressed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_items_host ON items(host);
+CREATE INDEX IF NOT EXISTS idx_items_method ON items(method);
+CREATE INDEX IF NOT EXISTS idx_items_path ON items(path);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items(status);
+CREATE INDEX IF NOT EXISTS idx_items_mime ON items(mime);
+CREATE INDEX IF NOT EXISTS idx_items_extension ON items(extension);
+"""
+
+# Columns that can be filtered on; each one is indexed
+FILTER_COLUMNS = ('host', 'method', 'path', 'status', 'mime', 'extension')
+
+def is_store(path):
+    """True if path is a SQLite database (an ingested store) rather than an XML export"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+def to_int(value):
+    """int() that tolerates the empty/missing fields Burp sometimes exports"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def content_hash(url, request, response):
+    """SHA-256 over the URL and decoded bodies; identical items hash the same"""
+    digest = hashlib.sha256()
+    for part in (url.encode('utf-8'), request, response):
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+class BurpStore:
+    """SQLite store of decoded Burp items, ingested once from an XML export"""
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def ingest(self, xml_file, compress=False, batch_size=1000):
+        """Stream an export into the store, skipping items already present.
+
+        Returns (inserted, skipped).
+        """
+        inserted = skipped = 0
+        pending = 0
+        for item in iter_items(xml_file):
+            url = item_text(item, 'url', '')
+            path = item_text(item, 'path', '')
+            request = raw_body(item.find('request'))
+            response = raw_body(item.find('response'))
+            host = item.find('host')
+
+            extension = item_text(item, 'extension')
+            if not extension or extension == 'null':
+                suffix = Path(path.split('?', 1)[0]).suffix
+                extension = suffix[1:] if suffix else None
+
+            row = (
+                content_hash(url, request, response),
+                item_text(item, 'time'),
+                url,
+                host.text if host is not None else None,
+                host.get('ip') if host is not None else None,
+                to_int(item_text(item, 'port')),
+                item_text(item, 'protocol'),
+                (item_text(item, 'method') or '').strip(),
+                path,
+                extension,
+                to_int(item_text(item, 'status')),
+                item_text(item, 'mimetype'),
+                to_int(item_text(item, 'responselength')),
+                item_text(item, 'comment'),
+                zlib.compress(request) if compress else request,
+                zlib.compress(response) if compress else response,
+                1 if compress else 0,
+            )
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO items (content_hash, time, url, host, ip, port, protocol, method, "
+                "path, extension, status, mime, response_length, comment, request, response, compressed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            if cursor.rowcount:
+                inserted += 1
+            else:
+                skipped += 1
+
+            pending += 1
+            if pending >= batch_size:
+                self.conn.commit()
+                pending = 0
+
+        self.conn.commit()
+        return inserted, skipped
+
+    def where_clause(self, filters):
+        """Build a WHERE clause over the indexed columns from keyword filters"""
+        clauses = []
+        params = []
+        for column in FILTER_COLUMNS:
+            value = filters.get(column)
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def rows(self, **filters):
+        """Yield matching rows in ingest order using the column indexes"""
+        where, params = self.where_clause(filters)
+        yield from self.conn.execute(f"SELECT * FROM items{where} ORDER BY id", params)
+
+    def ids(self, **filters):
+        """Row ids of matching items in ingest order"""
+        where, params = self.where_clause(filters)
+        return [row[0] for row in self.conn.execute(f"SELECT id FROM items{where} ORDER BY id", params)]
+
+    def get(self, item_id):
+        """Fetch one row by id"""
+        with self.lock:
+            return self.conn.execute("SELECT * FROM items WHERE id = ?", (item_id,)).fetchone()
+
+    def count(self, **filters):
+        where, params = self.where_clause(filters)
+        return self.conn.execute(f"SELECT COUNT(*) FROM items{where}", params).fetchone()[0]
+
+    def iter_items(self, **filters):
+        """Yield matching items as Burp <item> elements for the XML-based tools"""
+        for row in self.rows(**filters):
+            yield row_to_item(row)
+
+def row_body(row, column):
+    """Decoded body bytes of a row, decompressing if stored compressed"""
+    data = row[column] or b""
+    return zlib.decompress(data) if row['compressed'] else data
+
+def row_to_item(row):
+    """Rebuild a Burp-schema <item> element (base64 bodies) from a store row"""
+    item = ET.Element('item')
+
+    def add(tag, value, **attrib):
+        child = ET.SubElement(item, tag, attrib)
+        child.text = None if value is None else str(value)
+        return child
+
+    add('time', row['time'])
+    add('url', row['url'])
+    add('host', row['host'], ip=row['ip'] or '')
+    add('port', row['port'])
+    add('protocol', row['protocol'])
+    add('method', row['method'])
+    add('path', row['path'])
+    add('extension', row['extension'] or 'null')
+    add('request', base64.b64encode(row_body(row, 'request')).decode('ascii'), base64='true')
+    add('status', row['status'])
+    add('responselength', row['response_length'])
+    add('mimetype', row['mime'])
+    add('response', base64.b64encode(row_body(row, 'response')).decode('ascii'), base64='true')
+    add('comment', row['comment'])
+    return item
+
+class StoreIndex:
+    """ItemIndex-compatible random access to the items of a store"""
+    def __init__(self, db_file, **filters):
+        self.store = BurpStore(db_file)
+        self.ids = self.store.ids(**filters)
+
+    def __getitem__(self, position):
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("item index out of range")
+        return row_to_item(self.store.get(self.ids[position]))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def close(self):
+        self.store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest Burp XML exports into a SQLite store and query it')
+    parser.add_argument('-d', '--db', default='burp.sqlite', help='SQLite store (default: burp.sqlite)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Stream one or more exports into the store')
+    ingest_parser.add_argument('xml_files', nargs='+', help='Burp XML exports')
+    ingest_parser.add_argument('-z', '--compress', action='store_true', help='zlib-compress stored bodies')
+
+    query_parser = subparsers.add_parser('query', help='Write matching items as a Burp XML export')
+    for column in FILTER_COLUMNS:
+        query_parser.add_argument(f'--{column}', help=f'Only items with this {column}')
+    query_parser.add_argument('-o', '--output', help='Output XML file (default: print counts only)')
+
+    subparsers.add_parser('stats', help='Show item counts per host and method')
+
+    args = parser.parse_args()
+    store = BurpStore(args.db)
+
+    try:
+        if args.command == 'ingest':
+            for xml_file in args.xml_files:
+                if not Path(xml_file).exists():
+                    print(f"Error: Input file '{xml_file}' does not exist")
+                    sys.exit(1)
+                inserted, skipped = store.ingest(xml_file, compress=args.compress)
+                print(f"{xml_file}: {inserted} new items, {skipped} already in store")
+
+        elif args.command == 'query':
+            filters = {column: getattr(args, column) for column in FILTER_COLUMNS}
+            if filters['status'] is not None:
+                filters['status'] = to_int(filters['status'])
+            if args.output:
+                with ItemWriter(args.output, xml_declaration=True) as writer:
+                    for item in store.iter_items(**filters):
+                        writer.write(item)
+                print(f"Wrote {writer.count} items to {args.output}")
+            else:
+                print(f"{store.count(**filters)} matching items")
+
+        elif args.command == 'stats':
+            print(f"Total items: {store.count()}")
+            for row in store.conn.execute(
+                    "SELECT host, method, COUNT(*) AS n FROM items GROUP BY host, method ORDER BY n DESC"):
+                print(f"{row['n']:>8}  {row['method']:<8} {row['host']}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,449 @@
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+from array import array
+from collections import OrderedDict
+import base64
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+
+# <item> boundaries; CDATA sections are skipped whole so markup inside
+# non-base64 request/response bodies is never mistaken for a boundary
+ITEM_BOUNDARY = re.compile(rb'<!\[CDATA\[|<item>|</item>')
+
+INDEX_MAGIC = b'BURPIDX1'
+INDEX_HEADER = struct.Struct('<8sQQQ')  # magic, source size, source mtime_ns, item count
+
+def iter_items(xml_file):
+    """Yield each <item> of a Burp XML export one at a time with constant memory.
+
+    The yielded element is only valid until the next item is requested; it is
+    cleared and detached from the tree as soon as the consumer moves on. Copy
+    what you need (or serialize it) before advancing.
+
+    xml_file may also be a SQLite store built by BurpStore.py, in which case
+    the items are rebuilt from the store instead of parsed.
+    """
+    from BurpStore import is_store, BurpStore
+    if is_store(xml_file):
+        store = BurpStore(xml_file)
+        try:
+            yield from store.iter_items()
+        finally:
+            store.close()
+        return
+
+    context = ET.iterparse(xml_file, events=('start', 'end'))
+    root = None
+
+    for event, elem in context:
+        if root is None:
+            # First event is the start of the document root (<items>)
+            root = elem
+            continue
+
+        if event == 'end' and elem.tag == 'item':
+            yield elem
+
+            # Drop the consumed item and anything the root still references
+            elem.clear()
+            root.clear()
+
+def item_text(item, tag, default=None):
+    """Return the text of a child element, or default if missing/empty"""
+    child = item.find(tag)
+    if child is None or child.text is None:
+        return default
+    return child.text
+
+def decode_field(elem, errors='replace'):
+    """Return the text of a <request>/<response> element, base64-decoding if flagged"""
+    if elem is None or elem.text is None:
+        return ""
+    if elem.get('base64') == 'true':
+        try:
+            return base64.b64decode(elem.text).decode('utf-8', errors=errors)
+        except Exception as e:
+            return f"Error decoding content: {str(e)}"
+    return elem.text
+
+def raw_body(elem):
+    """Decoded bytes of a <request>/<response> element"""
+    if elem is None or elem.text is None:
+        return b""
+    if elem.get('base64') == 'true':
+        return base64.b64decode(elem.text)
+    return elem.text.encode('utf-8')
+
+def serialize_item(item):
+    """Serialize an <item> element to a string without its trailing whitespace"""
+    tail = item.tail
+    item.tail = None
+    try:
+        return ET.tostring(item, encoding='unicode')
+    finally:
+        item.tail = tail
+
+class ItemWriter:
+    """Append serialized <item> elements to an <items> document on disk.
+
+    The file is only created when the first item is written, so empty
+    buckets leave no file behind. With append=True an existing document is
+    reopened and new items go in front of its closing </items> tag.
+    """
+    def __init__(self, output_file, root_attrib=None, xml_declaration=False, append=False):
+        self.output_file = output_file
+        self.root_attrib = root_attrib or {}
+        self.xml_declaration = xml_declaration
+        self.append = append
+        self.handle = None
+        self.count = 0
+
+    def open_tag(self):
+        """Build the opening <items> tag including any root attributes"""
+        attrs = ''.join(f" {key}={quoteattr(value)}" for key, value in self.root_attrib.items())
+        return f"<items{attrs}>"
+
+    def reopen(self):
+        """Open an existing document positioned just before its closing tag, or None"""
+        try:
+            handle = open(self.output_file, 'r+b')
+        except FileNotFoundError:
+            return None
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(max(0, size - 64))
+        closing = handle.read().rfind(b'</items>')
+        if closing == -1:
+            handle.close()
+            return None
+        handle.seek(max(0, size - 64) + closing)
+        handle.truncate()
+        return handle
+
+    def write(self, item):
+        """Serialize one item into the output file"""
+        self.write_raw(serialize_item(item))
+
+    def ensure_open(self):
+        """Open (or reopen) the output file on first write"""
+        if self.handle is None:
+            self.handle = self.reopen() if self.append else None
+            if self.handle is None:
+                self.handle = open(self.output_file, 'wb')
+                if self.xml_declaration:
+                    self.handle.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+                self.handle.write(self.open_tag().encode('utf-8'))
+
+    def write_raw(self, item_xml):
+        """Write an already serialized <item> into the output file"""
+        self.ensure_open()
+        self.handle.write(item_xml.encode('utf-8'))
+        self.count += 1
+
+    def copy_items_from(self, document, count=0):
+        """Copy every item of another <items> document written by ItemWriter into this one.
+
+        The items are copied as bytes without being parsed; count is added to
+        self.count since it cannot be known without parsing.
+        """
+        with open(document, 'rb') as source:
+            head = source.read(4096)
+            start = head.index(b'>', head.index(b'<items')) + 1
+            size = source.seek(0, os.SEEK_END)
+            source.seek(max(0, size - 64))
+            end = max(0, size - 64) + source.read().rindex(b'</items>')
+            if end <= start:
+                return
+
+            self.ensure_open()
+            source.seek(start)
+            remaining = end - start
+            while remaining:
+                chunk = source.read(min(remaining, 1024 * 1024))
+                self.handle.write(chunk)
+                remaining -= len(chunk)
+        self.count += count
+
+    def close(self):
+        """Close the <items> root and the file handle"""
+        if self.handle is not None:
+            self.handle.write(b"</items>")
+            self.handle.close()
+            self.handle = None
+
+    def suspend(self):
+        """Close the file for now; the next write reopens it and continues"""
+        self.close()
+        self.append = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class ItemWriterPool:
+    """Stream items into many <items> documents with a bounded number of open files.
+
+    One ItemWriter per output file; at most max_open of them hold a handle at
+    a time. The least recently written file is suspended (closed with a valid
+    </items> root) when the pool is full and reopened if it gets more items.
+    """
+    def __init__(self, max_open=128, **writer_options):
+        self.max_open = max_open
+        self.writer_options = writer_options  # passed to every ItemWriter
+        self.writers = {}          # output file -> ItemWriter
+        self.active = OrderedDict()  # output files with an open handle, oldest first
+
+    def write_raw(self, output_file, item_xml):
+        """Write an already serialized <item> into output_file"""
+        writer = self.writers.get(output_file)
+        if writer is None:
+            writer = self.writers[output_file] = ItemWriter(output_file, **self.writer_options)
+
+        if output_file in self.active:
+            self.active.move_to_end(output_file)
+        else:
+            if len(self.active) >= self.max_open:
+                _, oldest = self.active.popitem(last=False)
+                oldest.suspend()
+            self.active[output_file] = writer
+        writer.write_raw(item_xml)
+
+    def write(self, output_file, item):
+        """Serialize one item into output_file"""
+        self.write_raw(output_file, serialize_item(item))
+
+    def close(self):
+        """Close the <items> root of every file still open"""
+        for writer in self.active.values():
+            writer.close()
+        self.active.clear()
+
+    def __len__(self):
+        return len(self.writers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def iter_item_spans(data):
+    """Yield (offset, length) of every <item>...</item> in a bytes-like buffer (bytes or mmap)"""
+    start = None
+    position = 0
+    while True:
+        match = ITEM_BOUNDARY.search(data, position)
+        if match is None:
+            break
+        token = match.group()
+        position = match.end()
+        if token == b'<![CDATA[':
+            # Jump straight to the end of the section
+            cdata_end = data.find(b']]>', position)
+            if cdata_end == -1:
+                break
+            position = cdata_end + 3
+        elif token == b'<item>':
+            start = match.start()
+        elif start is not None:
+            yield start, position - start
+            start = None
+
+def scan_item_spans(xml_file):
+    """Yield (offset, length) of every <item>...</item> in the file by byte scan"""
+    with open(xml_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from iter_item_spans(data)
+
+def default_index_path(xml_file):
+    """Sidecar index file stored next to the export"""
+    return f"{xml_file}.idx"
+
+class ItemIndex:
+    """Random access to the items of a Burp export through a byte-offset index.
+
+    The index records the offset and length of each <item>; indexing the
+    object seeks to one item and parses only that fragment, so opening a
+    large export costs one scan (or one small read once the sidecar exists).
+    """
+    def __init__(self, xml_file, offsets, lengths):
+        self.xml_file = xml_file
+        self.offsets = offsets
+        self.lengths = lengths
+        self.handle = open(xml_file, 'rb')
+        self.lock = threading.Lock()
+
+    @classmethod
+    def build(cls, xml_file, index_file=None):
+        """Scan the export once and write the sidecar index"""
+        offsets = array('Q')
+        lengths = array('Q')
+        for offset, length in scan_item_spans(xml_file):
+            offsets.append(offset)
+            lengths.append(length)
+
+        index_file = index_file or default_index_path(xml_file)
+        stat = os.stat(xml_file)
+        try:
+            with open(index_file, 'wb') as f:
+                f.write(INDEX_HEADER.pack(INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets)))
+                f.write(offsets.tobytes())
+                f.write(lengths.tobytes())
+        except OSError as e:
+            # A read-only export directory still gets an in-memory index
+            print(f"Warning: could not write index {index_file}: {str(e)}")
+
+        return cls(xml_file, offsets, lengths)
+
+    @classmethod
+    def load(cls, xml_file, index_file=None):
+        """Load the sidecar index, or return None if it is missing or stale"""
+        index_file = index_file or default_index_path(xml_file)
+        try:
+            with open(index_file, 'rb') as f:
+                magic, size, mtime_ns, count = INDEX_HEADER.unpack(f.read(INDEX_HEADER.size))
+                stat = os.stat(xml_file)
+                if magic != INDEX_MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+                    return None
+                offsets = array('Q')
+                lengths = array('Q')
+                offsets.frombytes(f.read(count * offsets.itemsize))
+                lengths.frombytes(f.read(count * lengths.itemsize))
+        except (OSError, struct.error):
+            return None
+
+        if len(offsets) != count or len(lengths) != count:
+            return None
+        return cls(xml_file, offsets, lengths)
+
+    @classmethod
+    def open(cls, xml_file, index_file=None):
+        """Load the sidecar index if it is current, otherwise build it"""
+        return cls.load(xml_file, index_file) or cls.build(xml_file, index_file)
+
+    def read_bytes(self, position):
+        """Raw bytes of one <item> element"""
+        with self.lock:
+            self.handle.seek(self.offsets[position])
+            return self.handle.read(self.lengths[position])
+
+    def __getitem__(self, position):
+        """Parse and return a single <item> element"""
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("item index out of range")
+        return ET.fromstring(self.read_bytes(position))
+
+    def iter_range(self, start, stop):
+        """Parse and yield items start..stop-1 in file order"""
+        for position in range(start, stop):
+            yield ET.fromstring(self.read_bytes(position))
+
+    def shard_ranges(self, shard_count):
+        """Split the items into up to shard_count contiguous (start, stop) ranges of similar byte size"""
+        count = len(self)
+        if count == 0:
+            return []
+        shard_count = max(1, min(shard_count, count))
+        total = sum(self.lengths)
+        ranges = []
+        start = 0
+        consumed = 0
+        for position in range(count):
+            consumed += self.lengths[position]
+            # Close a shard once it reaches its share of the bytes
+            if consumed * shard_count >= total * (len(ranges) + 1) and len(ranges) < shard_count - 1:
+                ranges.append((start, position + 1))
+                start = position + 1
+        if start < count:
+            ranges.append((start, count))
+        return ranges
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def close(self):
+        self.handle.close()
+
+def open_items(filename):
+    """Random-access items of an export (via ItemIndex) or of a BurpStore database"""
+    from BurpStore import is_store, StoreIndex
+    if is_store(filename):
+        return StoreIndex(filename)
+    return ItemIndex.open(filename)
+
+class DecodedBodyCache:
+    """LRU cache of decoded items/bodies bounded by their total size in bytes.
+
+    Values are weighed with sys.getsizeof (strings, or dicts/tuples of
+    strings), and the least recently used entries are evicted until the
+    total fits under max_bytes. Safe to share between threads.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.size = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def weigh(value):
+        """Approximate memory used by a decoded value"""
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value.values())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+        return sys.getsizeof(value)
+
+    def get(self, key, default=None):
+        """Return a cached value and mark it most recently used"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        """Cache a value, evicting least recently used entries to fit"""
+        size = self.weigh(value)
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            if size > self.max_bytes:
+                # Too large to ever fit; don't flush everything else for it
+                return value
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+        return value
+
+    def get_or_decode(self, key, decode):
+        """Return the cached value for key, calling decode() only on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, decode())
+        return value
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
@@ -0,0 +1,120 @@
+import tkinter as tk
+import time
+
+def looks_binary(sample):
+    """Guess whether decoded text is really binary (NULs or many replacement chars)"""
+    if '\x00' in sample:
+        return True
+    return sample.count('\ufffd') > len(sample) // 20
+
+def looks_minified(sample, max_line_chars):
+    """Guess whether text is minified (a single enormous line)"""
+    return any(len(line) > max_line_chars for line in sample.split('\n'))
+
+class ChunkedTextRenderer:
+    """Render large bodies into a tk.Text a window at a time.
+
+    set_content() inserts only the first chunk; the rest is appended as the
+    user scrolls near the bottom, so the cost of the first paint depends on
+    chunk_chars rather than on the size of the body. Binary or minified
+    bodies show a short preview plus an explicit "expand" link.
+    """
+    def __init__(self, text_widget, chunk_chars=64 * 1024, preview_chars=4096,
+                 max_line_chars=10000, load_threshold=0.9):
+        self.text = text_widget
+        self.chunk_chars = chunk_chars
+        self.preview_chars = preview_chars
+        self.max_line_chars = max_line_chars
+        self.load_threshold = load_threshold
+
+        self.content = ""
+        self.rendered = 0          # characters of content already in the widget
+        self.truncated = False     # waiting for the user to click "expand"
+        self.last_paint_ms = 0.0   # time-to-first-paint of the latest set_content
+        self.load_pending = False
+        self.scrollbar = None
+
+        self.text.tag_configure('expand', foreground='blue', underline=True)
+        self.text.tag_bind('expand', '<Button-1>', lambda e: self.expand())
+        self.text.tag_bind('expand', '<Enter>', lambda e: self.text.config(cursor='hand2'))
+        self.text.tag_bind('expand', '<Leave>', lambda e: self.text.config(cursor=''))
+
+    def attach_scrollbar(self, scrollbar):
+        """Route the widget's scroll updates through the renderer"""
+        self.scrollbar = scrollbar
+        self.text['yscrollcommand'] = self.on_scroll
+
+    def on_scroll(self, first, last):
+        """yscrollcommand hook: update the scrollbar and load more near the end"""
+        if self.scrollbar is not None:
+            self.scrollbar.set(first, last)
+        if (not self.truncated and not self.load_pending and self.rendered < len(self.content)
+                and float(last) >= self.load_threshold):
+            # Defer so the insert doesn't happen inside Tk's scroll callback
+            self.load_pending = True
+            self.text.after_idle(self.load_more)
+
+    def set_content(self, content):
+        """Replace the widget's text, painting only the first window"""
+        start = time.perf_counter()
+        self.content = content or ""
+        self.rendered = 0
+        self.text.delete('1.0', tk.END)
+
+        sample = self.content[:self.chunk_chars]
+        self.truncated = len(self.content) > self.preview_chars and (
+            looks_binary(sample) or looks_minified(sample, self.max_line_chars))
+
+        if self.truncated:
+            self.append(self.preview_chars)
+            kind = "binary" if looks_binary(sample) else "minified"
+            remaining = len(self.content) - self.rendered
+            self.text.insert(tk.END, "\n\n")
+            self.text.insert(tk.END, f"[{kind} body truncated, {remaining:,} more characters - click to expand]", 'expand')
+        else:
+            self.append(self.chunk_chars)
+
+        self.last_paint_ms = (time.perf_counter() - start) * 1000
+
+    def append(self, count):
+        """Insert the next count characters of content at the end of the rendered text"""
+        chunk = self.content[self.rendered:self.rendered + count]
+        if chunk:
+            self.text.insert('end-1c', chunk)
+            self.rendered += len(chunk)
+
+    def load_more(self):
+        """Append the next chunk if anything is left"""
+        self.load_pending = False
+        if not self.truncated and self.rendered < len(self.content):
+            self.append(self.chunk_chars)
+
+    def expand(self):
+        """Drop the truncation notice and continue with normal chunked loading"""
+        if not self.truncated:
+            return
+        self.truncated = False
+        ranges = self.text.tag_ranges('expand')
+        if ranges:
+            # The notice is preceded by two newlines that belong to it too
+            self.text.delete(f"{ranges[0]}-2c", ranges[-1])
+        self.load_more()
+
+    def render_through(self, offset):
+        """Make sure content up to offset is in the widget, expanding a truncated preview first"""
+        if offset <= self.rendered:
+            return
+        self.expand()
+        missing = offset - self.rendered
+        if missing > 0:
+            # Whole chunks, so later scrolling continues on chunk boundaries
+            self.append(-(-missing // self.chunk_chars) * self.chunk_chars)
+
+    def get_text(self):
+        """Full text: the (possibly edited) rendered part plus anything not yet loaded"""
+        if self.truncated:
+            ranges = self.text.tag_ranges('expand')
+            shown = self.text.get('1.0', f"{ranges[0]}-2c") if ranges else self.text.get('1.0', 'end-1c')
+        else:
+            shown = self.text.get('1.0', 'end-1c')
+        return shown + self.content[self.rendered:]
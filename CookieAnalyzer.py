@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import xml.etree.ElementTree as ET
 import base64
 from pathlib import Path
 import re
@@ -8,6 +7,8 @@ from datetime import datetime
 import os
 import sys
 import argparse
+from BurpStream import open_items, DecodedBodyCache
+from ChunkedText import ChunkedTextRenderer
 
 class HTTPComparisonViewer:
     def __init__(self, root):
@@ -15,9 +16,9 @@ class HTTPComparisonViewer:
         self.root.title("HTTP Request/Response Comparison Viewer")
         self.root.geometry("1400x900")
         
-        # Data
-        self.requests = []
-        self.responses = []
+        # Data: both panes navigate the same random-access index of the export
+        self.items = []
+        self.body_cache = DecodedBodyCache()  # (position, field) -> (url, decoded body)
         self.current_request_index = 0
         self.current_response_index = 0
         self.output_dir = Path.home() / "http_viewer_output"
@@ -94,7 +95,8 @@ class HTTPComparisonViewer:
         self.req_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         req_scroll = ttk.Scrollbar(req_frame, orient=tk.VERTICAL, command=self.req_text.yview)
         req_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.req_text['yscrollcommand'] = req_scroll.set
+        self.req_renderer = ChunkedTextRenderer(self.req_text)
+        self.req_renderer.attach_scrollbar(req_scroll)
         
         # Response frame
         resp_frame = ttk.LabelFrame(comp_frame, text="Response", padding="5")
@@ -104,7 +106,8 @@ class HTTPComparisonViewer:
         self.resp_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         resp_scroll = ttk.Scrollbar(resp_frame, orient=tk.VERTICAL, command=self.resp_text.yview)
         resp_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.resp_text['yscrollcommand'] = resp_scroll.set
+        self.resp_renderer = ChunkedTextRenderer(self.resp_text)
+        self.resp_renderer.attach_scrollbar(resp_scroll)
         
         # Configure text highlighting
         self.req_text.tag_configure('highlight', background='yellow')
@@ -132,9 +135,13 @@ class HTTPComparisonViewer:
             # Remove existing highlights in response
             self.resp_text.tag_remove('match', '1.0', tk.END)
             
-            # Search for matches in response
-            response_text = self.resp_text.get('1.0', tk.END)
+            # Only the first window of a large response is in the widget; bring in
+            # everything up to the last match in the full body before searching
+            last = self.resp_renderer.content.rfind(selected)
+            if last >= 0:
+                self.resp_renderer.render_through(last + len(selected))
             start_idx = '1.0'
+            first_match = None
             
             while True:
                 match_idx = self.resp_text.search(selected, start_idx, tk.END)
@@ -146,44 +153,42 @@ class HTTPComparisonViewer:
                 
                 # Highlight match
                 self.resp_text.tag_add('match', match_idx, end_idx)
+                if first_match is None:
+                    first_match = match_idx
                 
                 # Move start index
                 start_idx = end_idx
                 
+            if first_match is not None:
+                self.resp_text.see(first_match)
+                
         except tk.TclError:
             # Selection was removed
             pass
             
     def load_xml_file(self, filename):
-        """Load and parse XML file"""
+        """Open XML file (or BurpStore database) for random access; items are decoded on display"""
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
-            
-            # Separate requests and responses
-            for item in root.findall('.//item'):
-                request = item.find('request')
-                response = item.find('response')
-                url = item.find('url').text
-                
-                if request is not None:
-                    self.requests.append({
-                        'url': url,
-                        'content': self.decode_base64(request.text) if request.get('base64') == 'true' else request.text
-                    })
-                    
-                if response is not None:
-                    self.responses.append({
-                        'url': url,
-                        'content': self.decode_base64(response.text) if response.get('base64') == 'true' else response.text,
-                        'status': item.find('status').text
-                    })
-                    
+            self.items = open_items(filename)
+            self.body_cache.clear()
             self.update_display()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load XML file: {str(e)}")
             
+    def get_content(self, element):
+        """Return request/response text, decoding base64 if flagged"""
+        if element is None or element.text is None:
+            return ""
+        return self.decode_base64(element.text) if element.get('base64') == 'true' else element.text
+            
+    def get_entry(self, position, field):
+        """Return (url, decoded request or response) of an item, decoding only on a cache miss"""
+        def decode():
+            item = self.items[position]
+            return item.find('url').text, self.get_content(item.find(field))
+        return self.body_cache.get_or_decode((position, field), decode)
+            
     def decode_base64(self, content):
         """Decode base64 content"""
         try:
@@ -193,26 +198,24 @@ class HTTPComparisonViewer:
             
     def update_display(self):
         """Update all display elements"""
-        if not self.requests or not self.responses:
+        if not self.items:
             return
             
         # Update request
-        request = self.requests[self.current_request_index]
+        request_url, request_content = self.get_entry(self.current_request_index, 'request')
         self.req_url_entry.delete(0, tk.END)
-        self.req_url_entry.insert(0, request['url'])
-        self.req_text.delete('1.0', tk.END)
-        self.req_text.insert('1.0', request['content'])
+        self.req_url_entry.insert(0, request_url)
+        self.req_renderer.set_content(request_content)
         
         # Update response
-        response = self.responses[self.current_response_index]
+        response_url, response_content = self.get_entry(self.current_response_index, 'response')
         self.resp_url_entry.delete(0, tk.END)
-        self.resp_url_entry.insert(0, response['url'])
-        self.resp_text.delete('1.0', tk.END)
-        self.resp_text.insert('1.0', response['content'])
+        self.resp_url_entry.insert(0, response_url)
+        self.resp_renderer.set_content(response_content)
         
         # Update counters
-        self.req_counter.config(text=f"Request: {self.current_request_index + 1}/{len(self.requests)}")
-        self.resp_counter.config(text=f"Response: {self.current_response_index + 1}/{len(self.responses)}")
+        self.req_counter.config(text=f"Request: {self.current_request_index + 1}/{len(self.items)}")
+        self.resp_counter.config(text=f"Response: {self.current_response_index + 1}/{len(self.items)}")
         
     def prev_request(self):
         """Navigate to previous request"""
@@ -222,7 +225,7 @@ class HTTPComparisonViewer:
             
     def next_request(self):
         """Navigate to next request"""
-        if self.current_request_index < len(self.requests) - 1:
+        if self.current_request_index < len(self.items) - 1:
             self.current_request_index += 1
             self.update_display()
             
@@ -234,7 +237,7 @@ class HTTPComparisonViewer:
             
     def next_response(self):
         """Navigate to next response"""
-        if self.current_response_index < len(self.responses) - 1:
+        if self.current_response_index < len(self.items) - 1:
             self.current_response_index += 1
             self.update_display()
 
@@ -0,0 +1,322 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Escapes understood inside bash $'...' quoting
+ANSI_C_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '\\': '\\', "'": "'", '"': '"', '?': '?',
+                  'a': '\a', 'b': '\b', 'e': '\x1b', 'E': '\x1b', 'f': '\f', 'v': '\v'}
+
+# Characters that make a command more than a single curl invocation
+SHELL_OPERATORS = set('|;&<>`()')
+
+# curl options that only change output/TLS behaviour we already reproduce
+FLAG_OPTIONS = {'-i': 'include', '--include': 'include', '-s': None, '--silent': None,
+                '-k': 'insecure', '--insecure': 'insecure', '--path-as-is': None, '--compressed': 'compressed'}
+DATA_OPTIONS = ('-d', '--data', '--data-raw', '--data-binary', '--data-ascii')
+
+# What ansi_c_quote escapes when writing $'...' words
+ANSI_C_QUOTES = {'\\': '\\\\', "'": "\\'", '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+
+# Parsed commands memoized per command text and per (file, mtime)
+PARSE_CACHE_SIZE = 4096
+
+class CurlParseError(ValueError):
+    """Raised for commands the in-process replay cannot reproduce exactly"""
+
+class CurlRequest:
+    """Compact request model shared by the curl tools, with a curl codec both ways.
+
+    Built from a curl command (from_curl), or from a raw HTTP request as
+    stored in a Burp export (from_raw); to_curl() writes it back out in the
+    Burp format XML2Curl has always produced.
+    """
+    __slots__ = ('method', 'url', 'headers', 'cookie', 'data', 'insecure', 'include', 'compressed')
+
+    def __init__(self, method, url, headers=None, cookie=None, data=None,
+                 insecure=False, include=False, compressed=False):
+        self.method = method
+        self.url = url
+        self.headers = headers or []  # [(name, value)] in command order
+        self.cookie = cookie          # -b value; a raw request keeps its Cookie header instead
+        self.data = data              # request body bytes, or None
+        self.insecure = insecure
+        self.include = include
+        self.compressed = compressed
+
+    @classmethod
+    def from_curl(cls, command):
+        return parse_curl_command(command)
+
+    @classmethod
+    def from_raw(cls, url, raw_request):
+        """Request from raw HTTP text (request line, headers, blank line, body) sent to url"""
+        head, separator, body = raw_request.partition('\r\n\r\n')
+        if not separator:
+            head, _, body = raw_request.partition('\n\n')
+        lines = [line.rstrip('\r') for line in head.split('\n')]
+        method = lines[0].split(' ', 1)[0].strip() if lines and lines[0].strip() else 'GET'
+        headers = []
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers.append((name.strip(), value.strip()))
+        return cls(method, url, headers, data=body.encode('utf-8') if body else None)
+
+    def to_curl(self, extra_headers=()):
+        """Burp-format curl command: sorted -H lines, cookie as -b, body as --data-binary"""
+        parts = [f"curl --path-as-is -i -s -k -X $'{ansi_c_quote(self.method)}'"]
+        cookie = self.cookie
+        header_lines = []
+        for name, value in list(extra_headers) + self.headers:
+            lower = name.lower()
+            # curl sets Connection and Content-Length itself
+            if lower in ('connection', 'content-length'):
+                continue
+            if lower == 'cookie':
+                cookie = self.cookie or value
+                continue
+            header_lines.append(f"    -H $'{ansi_c_quote(name)}: {ansi_c_quote(value)}'")
+        parts.extend(sorted(header_lines))
+        if cookie:
+            parts.append(f"    -b $'{ansi_c_quote(cookie)}'")
+        if self.data is not None:
+            parts.append(f"    --data-binary $'{ansi_c_quote(self.data.decode('utf-8', errors='replace'))}'")
+        parts.append(f"    $'{ansi_c_quote(self.url)}'")
+        return ' \\\n'.join(parts)
+
+    def copy(self):
+        return CurlRequest(self.method, self.url, list(self.headers), self.cookie, self.data,
+                           self.insecure, self.include, self.compressed)
+
+    @property
+    def parts(self):
+        return urlsplit(self.url)
+
+    @property
+    def host(self):
+        return self.parts.hostname
+
+    @property
+    def cookies(self):
+        """Cookie name -> value, from -b or a Cookie header"""
+        cookie = self.cookie or self.header('Cookie') or ''
+        pairs = (pair.strip().split('=', 1) for pair in cookie.split(';') if '=' in pair)
+        return {name: value for name, value in pairs}
+
+    def header(self, name, default=None):
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    def __eq__(self, other):
+        if not isinstance(other, CurlRequest):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"CurlRequest({self.method} {self.url})"
+
+def ansi_c_quote(text):
+    """Escape text for the inside of a bash $'...' word"""
+    if not any(char in text for char in ANSI_C_QUOTES):
+        return text
+    return ''.join(ANSI_C_QUOTES.get(char, char) for char in text)
+
+def ansi_c_unquote(command, position):
+    """Read a $'...' word body starting after the opening quote; returns (text, end)"""
+    out = []
+    length = len(command)
+    while position < length:
+        char = command[position]
+        if char == "'":
+            return ''.join(out), position + 1
+        if char == '\\' and position + 1 < length:
+            escape = command[position + 1]
+            if escape in ANSI_C_ESCAPES:
+                out.append(ANSI_C_ESCAPES[escape])
+                position += 2
+            elif escape == 'x':
+                digits = ''
+                position += 2
+                while position < length and len(digits) < 2 and command[position] in '0123456789abcdefABCDEF':
+                    digits += command[position]
+                    position += 1
+                out.append(chr(int(digits, 16)) if digits else '\\x')
+            elif escape in '01234567':
+                digits = ''
+                position += 1
+                while position < length and len(digits) < 3 and command[position] in '01234567':
+                    digits += command[position]
+                    position += 1
+                out.append(chr(int(digits, 8)))
+            else:
+                out.append('\\' + escape)
+                position += 2
+            continue
+        out.append(char)
+        position += 1
+    raise CurlParseError("Unterminated $'...' string")
+
+def split_command(command):
+    """Split a curl command into words the way bash would.
+
+    Handles $'...', '...' and "..." quoting and backslash line continuations.
+    Anything that needs a real shell (variables, pipes, substitutions) raises
+    CurlParseError so the caller can fall back to bash.
+    """
+    words = []
+    word = []
+    in_word = False
+    position = 0
+    length = len(command)
+    while position < length:
+        char = command[position]
+        if char in ' \t\n':
+            if in_word:
+                words.append(''.join(word))
+                word = []
+                in_word = False
+            position += 1
+        elif char == '\\':
+            if position + 1 < length and command[position + 1] == '\n':
+                position += 2  # line continuation
+            elif position + 1 < length:
+                word.append(command[position + 1])
+                in_word = True
+                position += 2
+            else:
+                position += 1
+        elif char == '$' and command[position + 1:position + 2] == "'":
+            text, position = ansi_c_unquote(command, position + 2)
+            word.append(text)
+            in_word = True
+        elif char == "'":
+            end = command.find("'", position + 1)
+            if end == -1:
+                raise CurlParseError("Unterminated '...' string")
+            word.append(command[position + 1:end])
+            in_word = True
+            position = end + 1
+        elif char == '"':
+            end = position + 1
+            text = []
+            while end < length and command[end] != '"':
+                if command[end] == '\\' and end + 1 < length and command[end + 1] in '"\\$`':
+                    text.append(command[end + 1])
+                    end += 2
+                    continue
+                if command[end] in '$`':
+                    raise CurlParseError("Shell expansion inside double quotes")
+                text.append(command[end])
+                end += 1
+            if end >= length:
+                raise CurlParseError('Unterminated "..." string')
+            word.append(''.join(text))
+            in_word = True
+            position = end + 1
+        elif char == '$' or char in SHELL_OPERATORS:
+            raise CurlParseError(f"Unsupported shell syntax: {char!r}")
+        else:
+            word.append(char)
+            in_word = True
+            position += 1
+    if in_word:
+        words.append(''.join(word))
+    return words
+
+def parse_curl_command(command):
+    """Parse a Burp-style curl command (as XML2Curl writes) into a CurlRequest.
+
+    Only the options those commands use are understood; anything else raises
+    CurlParseError rather than replaying a different request than curl would.
+    Results are memoized by command text; each call returns its own copy.
+    """
+    return parse_cached(command.strip()).copy()
+
+def read_command_list(cmds_file):
+    """Curl command files named in a CMDs.txt, resolved against its folder"""
+    cmds_file = Path(cmds_file)
+    with open(cmds_file, 'r') as f:
+        names = [line.strip() for line in f if line.strip()]
+    return [cmds_file.parent / name for name in names]
+
+def load_curl_file(path):
+    """CurlRequest for a curl command file, parsed once per (path, mtime, size)"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return load_cached(path, stat.st_mtime_ns, stat.st_size).copy()
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def load_cached(path, mtime_ns, size):
+    with open(path, 'r') as f:
+        return parse_cached(f.read().strip())
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_cached(command):
+    words = split_command(command)
+    if not words or words[0] != 'curl':
+        raise CurlParseError("Not a curl command")
+
+    method = None
+    url = None
+    headers = []
+    cookie = None
+    data = None
+    flags = {'include': False, 'insecure': False, 'compressed': False}
+    position = 1
+    while position < len(words):
+        word = words[position]
+        position += 1
+        if word in FLAG_OPTIONS:
+            if FLAG_OPTIONS[word]:
+                flags[FLAG_OPTIONS[word]] = True
+            continue
+        if word.startswith('-') and not word.startswith('--') and len(word) > 2 and \
+                all(f"-{flag}" in FLAG_OPTIONS for flag in word[1:]):
+            # Bundled short flags such as -iks
+            for flag in word[1:]:
+                if FLAG_OPTIONS[f"-{flag}"]:
+                    flags[FLAG_OPTIONS[f"-{flag}"]] = True
+            continue
+        if word in ('-X', '--request', '-H', '--header', '-b', '--cookie', '--url') + DATA_OPTIONS:
+            if position >= len(words):
+                raise CurlParseError(f"Missing value for {word}")
+            value = words[position]
+            position += 1
+            if word in ('-X', '--request'):
+                method = value
+            elif word in ('-H', '--header'):
+                if ':' not in value:
+                    raise CurlParseError(f"Unsupported header form: {value!r}")
+                name, header_value = value.split(':', 1)
+                headers.append((name.strip(), header_value.strip()))
+            elif word in ('-b', '--cookie'):
+                if '=' not in value:
+                    raise CurlParseError("Cookie jar files are not supported")
+                cookie = value if cookie is None else f"{cookie}; {value}"
+            elif word == '--url':
+                url = value
+            else:
+                if value.startswith('@'):
+                    raise CurlParseError("Reading data from files is not supported")
+                chunk = value.encode('utf-8')
+                data = chunk if data is None else data + b'&' + chunk
+            continue
+        if word.startswith('-'):
+            raise CurlParseError(f"Unsupported curl option: {word}")
+        if url is not None:
+            raise CurlParseError("More than one URL")
+        url = word
+
+    if url is None:
+        raise CurlParseError("No URL in curl command")
+    if '://' not in url:
+        url = f"http://{url}"
+    if urlsplit(url).scheme not in ('http', 'https'):
+        raise CurlParseError(f"Unsupported URL scheme: {url}")
+    if method is None:
+        method = 'POST' if data is not None else 'GET'
+    return CurlRequest(method, url, headers, cookie, data, **flags)
@@ -3,8 +3,38 @@ import subprocess
 from pathlib import Path
 import re
 import argparse
-import gzip
-import io
+import asyncio
+import tempfile
+import json
+import time
+import http.client
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from base64 import b64encode
+from urllib.parse import urlsplit, unquote
+from urllib.request import getproxies_environment, proxy_bypass_environment
+from CurlRequest import parse_curl_command, read_command_list, CurlParseError
+from ResponseDecoder import ResponseDecoder, CHUNK_SIZE, DEFAULT_MAX_BODY
+from ResponseStore import ResponseStore
+from AdaptiveLimiter import AdaptiveLimiter, BACKOFF_STATUSES
+from ReplayJournal import ReplayJournal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Next free response number of an output folder, shared by every runner writing to it
+COUNTER_FILE = ".response_counter"
+
+# Errors that mean a kept-alive connection was closed by the server in between requests
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                           ConnectionResetError, BrokenPipeError)
+# Methods resent after such an error even if the request had gone out; others might be applied twice
+RETRY_METHODS = {'GET', 'HEAD', 'OPTIONS', 'TRACE'}
 
 def find_next_response_number(output_dir):
     """Find the next available response number by checking existing files"""
@@ -20,97 +50,593 @@ def find_next_response_number(output_dir):
             
     return max(numbers) + 1 if numbers else 1
 
-def is_gzipped(content):
-    """Check if content is gzipped by looking at magic numbers"""
-    return len(content) > 2 and content[0] == 0x1f and content[1] == 0x8b
+class ResponseCounter:
+    """Atomic response-number allocator for an output folder.
 
-def decode_response(raw_content):
-    """Decode response content, handling gzip if necessary"""
-    try:
-        # First try to split headers from body
-        parts = raw_content.split(b'\r\n\r\n', 1)
-        
-        if len(parts) < 2:
-            # No clear header/body split, return as-is
-            return raw_content.decode('utf-8', errors='replace')
-            
-        headers, body = parts
-        
-        # Decode headers normally
-        headers_text = headers.decode('utf-8', errors='replace')
-        
-        # Check if body is gzipped
-        if is_gzipped(body):
+    The next free number lives in a small counter file that is read and
+    bumped under an exclusive lock, so each allocation is O(1) and runners
+    sharing the folder never hand out the same number. The first allocation
+    in a folder without a counter seeds it from the existing response files.
+    """
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.counter_file = self.output_dir / COUNTER_FILE
+
+    def lock(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def unlock(self, fd):
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def allocate(self, count=1):
+        """Reserve count consecutive numbers and return the first"""
+        fd = os.open(self.counter_file, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self.lock(fd)
             try:
-                body_text = gzip.decompress(body).decode('utf-8', errors='replace')
-            except Exception as e:
-                body_text = f"[Error decompressing gzipped content: {str(e)}]"
+                os.lseek(fd, 0, os.SEEK_SET)
+                content = os.read(fd, 64).strip()
+                first = int(content) if content else find_next_response_number(self.output_dir)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, str(first + count).encode('ascii'))
+            finally:
+                self.unlock(fd)
+        finally:
+            os.close(fd)
+        return first
+
+class HTTPReplayer:
+    """Replays parsed curl commands in-process over pooled keep-alive connections.
+
+    Idle connections are kept per (scheme, host, port, proxy) and reused by
+    the next request to the same origin, so a run of commands pays for one
+    TCP/TLS handshake per host instead of one bash and one curl process per
+    command. Proxies from http_proxy/https_proxy/ALL_PROXY (and NO_PROXY) are
+    honoured as curl would: https through a CONNECT tunnel, http by sending
+    the full URL to the proxy. Safe to share between threads: a connection is
+    used by one request at a time.
+    """
+    def __init__(self, timeout=30, max_idle_per_host=4):
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self.idle = defaultdict(list)  # (scheme, host, port, proxy) -> [connection]
+        self.lock = threading.Lock()
+        self.insecure_context = ssl._create_unverified_context()
+        self.verified_context = ssl.create_default_context()
+        self.proxies = getproxies_environment()
+
+    def prepare(self, curl_command):
+        """Parse a command for send(); CurlParseError if it has to go through bash curl instead"""
+        request = parse_curl_command(curl_command)
+        self.proxy_for(request)
+        return request
+
+    def proxy_for(self, request):
+        """(host, port, Proxy-Authorization or None) of the proxy the request goes through, or None"""
+        parts = request.parts
+        proxy = self.proxies.get(parts.scheme) or self.proxies.get('all')
+        if not proxy or proxy_bypass_environment(parts.hostname, self.proxies):
+            return None
+        if '://' not in proxy:
+            proxy = f"http://{proxy}"
+        proxy_parts = urlsplit(proxy)
+        if proxy_parts.scheme != 'http':
+            # SOCKS and HTTPS proxies are left to curl
+            raise CurlParseError(f"Unsupported proxy: {proxy}")
+        authorization = None
+        if proxy_parts.username is not None:
+            credentials = f"{unquote(proxy_parts.username)}:{unquote(proxy_parts.password or '')}"
+            authorization = f"Basic {b64encode(credentials.encode('utf-8')).decode('ascii')}"
+        return proxy_parts.hostname, proxy_parts.port or 1080, authorization
+
+    def connect(self, key, insecure):
+        scheme, host, port, proxy = key
+        address = (proxy[0], proxy[1]) if proxy else (host, port)
+        if scheme == 'https':
+            context = self.insecure_context if insecure else self.verified_context
+            connection = http.client.HTTPSConnection(*address, timeout=self.timeout, context=context)
+            if proxy:
+                tunnel_headers = {'Proxy-Authorization': proxy[2]} if proxy[2] else None
+                connection.set_tunnel(host, port, headers=tunnel_headers)
+            return connection
+        return http.client.HTTPConnection(*address, timeout=self.timeout)
+
+    def checkout(self, key, insecure):
+        """An idle connection to the origin if there is one, else a new one; (connection, reused)"""
+        with self.lock:
+            if self.idle[key]:
+                return self.idle[key].pop(), True
+        return self.connect(key, insecure), False
+
+    def checkin(self, key, connection):
+        with self.lock:
+            if len(self.idle[key]) < self.max_idle_per_host:
+                self.idle[key].append(connection)
+                return
+        connection.close()
+
+    def build_headers(self, request):
+        """Headers in the order curl sends them: its defaults unless overridden, then the command's"""
+        names = {name.lower() for name, _ in request.headers}
+        headers = [('Host', request.header('Host', urlsplit(request.url).netloc))]
+        if 'user-agent' not in names:
+            headers.append(('User-Agent', 'curl'))
+        if 'accept' not in names:
+            headers.append(('Accept', '*/*'))
+        if request.compressed and 'accept-encoding' not in names:
+            headers.append(('Accept-Encoding', 'gzip, deflate'))
+        if request.cookie:
+            headers.append(('Cookie', request.cookie))
+        # An empty -H 'Name:' removes the header, as with curl
+        headers.extend((name, value) for name, value in request.headers if value and name.lower() != 'host')
+        if request.data is not None:
+            headers.append(('Content-Length', str(len(request.data))))
+            if 'content-type' not in names:
+                headers.append(('Content-Type', 'application/x-www-form-urlencoded'))
+        return headers
+
+    def send(self, request, sink=None):
+        """Send a CurlRequest and return the response as curl -i prints it (raw bytes).
+
+        With a sink (a ResponseDecoder), the response is fed to it chunk by
+        chunk instead, and the connection is dropped if the sink stops early.
+        """
+        parts = urlsplit(request.url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        proxy = self.proxy_for(request)
+        key = (parts.scheme, parts.hostname, port, proxy)
+        # --path-as-is: the path goes out exactly as written
+        target = parts.path or '/'
+        if parts.query:
+            target += f"?{parts.query}"
+        headers = self.build_headers(request)
+        if proxy and parts.scheme == 'http':
+            # A plain http proxy is sent the full URL
+            target = f"http://{parts.netloc}{target}"
+            if proxy[2]:
+                headers.append(('Proxy-Authorization', proxy[2]))
+
+        while True:
+            connection, reused = self.checkout(key, request.insecure)
+            sent = False
+            try:
+                connection.putrequest(request.method, target, skip_host=True, skip_accept_encoding=True)
+                for name, value in headers:
+                    connection.putheader(name, value)
+                connection.endheaders(request.data)
+                sent = True
+                response = connection.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused and (not sent or request.method.upper() in RETRY_METHODS):
+                    # The server dropped an idle keep-alive connection; retry on a fresh one.
+                    # A request that went out is only resent if sending it twice is harmless.
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            break
+
+        try:
+            if sink is None:
+                raw = format_raw_response(response, response.read())
+            else:
+                raw = None
+                wanted = sink.feed(format_raw_response(response, b""))
+                while wanted:
+                    chunk = response.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    wanted = sink.feed(chunk)
+        except Exception:
+            connection.close()
+            raise
+        if response.will_close or not response.isclosed():
+            # Closed by the server, or a truncated body is still unread
+            connection.close()
         else:
-            body_text = body.decode('utf-8', errors='replace')
-            
-        return f"{headers_text}\r\n\r\n{body_text}"
-        
-    except Exception as e:
-        return f"[Error decoding response: {str(e)}]"
+            self.checkin(key, connection)
+        return raw
+
+    def close(self):
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def format_raw_response(response, body):
+    """Status line, headers and body of an http.client response as curl -i writes them"""
+    version = 'HTTP/1.0' if response.version == 10 else 'HTTP/1.1'
+    lines = [f"{version} {response.status} {response.reason}".rstrip()]
+    lines.extend(f"{name}: {value}" for name, value in response.msg.items())
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1', errors='replace')
+    return head + body
+
+def execute_curl_command(curl_command, output, replayer=None, max_body=DEFAULT_MAX_BODY, head_output=None):
+    """Run a curl command, streaming its decoded response into output.
+
+    Commands the parser understands go through the in-process replayer;
+    anything else (or replayer=None) runs through bash and curl as before. The response is decoded as it arrives and cut off after
+    max_body bytes, so large downloads never sit in memory. Status lines and
+    headers go to head_output if one is given. Returns (stderr bytes, exit
+    code, decoder); the decoder holds the final response's status and headers.
+    """
+    decoder = ResponseDecoder(output, max_body, head_output=head_output)
+    if replayer is not None:
+        try:
+            request = replayer.prepare(curl_command)
+        except CurlParseError as e:
+            print(f"Falling back to bash curl: {e}")
+        else:
+            try:
+                replayer.send(request, decoder)
+                return b"", 0, decoder
+            except Exception as e:
+                return f"{type(e).__name__}: {e}".encode('utf-8'), 1, decoder
+            finally:
+                decoder.close()
+    
+    # curl has already dechunked its output unless asked for --raw,
+    # and decompressed it (keeping Content-Encoding) if asked for --compressed
+    decoder.dechunk = '--raw' in curl_command
+    decoder.content_encoding = '--compressed' not in curl_command
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(['bash', '-c', curl_command], stdout=subprocess.PIPE, stderr=stderr)
+        with process.stdout:
+            while True:
+                chunk = process.stdout.read1(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if not decoder.feed(chunk):
+                    process.kill()
+                    break
+        returncode = process.wait()
+        decoder.close()
+        stderr.seek(0)
+        return stderr.read(), returncode, decoder
 
-def process_curl_command(input_file, output_dir):
-    """Process a curl command from input file and save response"""
+def process_curl_command(input_file, output_dir, replayer=None, max_body=DEFAULT_MAX_BODY, run=None):
+    """Process a curl command from input file and save response (into run's store if given)"""
     try:
-        # Create output directory if it doesn't exist
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
         # Read curl command
         with open(input_file, 'r') as f:
             curl_command = f.read().strip()
         
-        # Find next available response number
-        response_num = find_next_response_number(output_dir)
-        output_file = output_dir / f"response{response_num}.txt"
+        if run is not None:
+            replay_to_store(run, run.entries + 1, Path(input_file).name, curl_command, replayer, max_body)
+            return
         
-        # Execute curl command and capture raw output
-        result = subprocess.run(
-            ['bash', '-c', curl_command],
-            capture_output=True
-        )
-        
-        # Save response, handling potential gzipped content
-        with open(output_file, 'w', encoding='utf-8') as f:
-            if result.stdout:
-                decoded_output = decode_response(result.stdout)
-                f.write(decoded_output)
-            if result.stderr:
-                f.write(f"\n--- Error Output ---\n{result.stderr.decode('utf-8', errors='replace')}")
-                
-        print(f"Response saved to: {output_file}")
+        # Create output directory if it doesn't exist
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save the original request too
-        request_file = output_dir / f"request{response_num}.txt"
-        with open(request_file, 'w', encoding='utf-8') as f:
-            f.write(curl_command)
-        print(f"Request saved to: {request_file}")
+        # Reserve the next response number (O(1), safe with concurrent runners)
+        response_num = ResponseCounter(output_dir).allocate()
         
-        # Check if command was successful
-        if result.returncode != 0:
-            print(f"Warning: Curl command returned non-zero exit code: {result.returncode}")
+        # Execute curl command, streaming its response to disk
+        replay_to_files(output_dir, response_num, curl_command, replayer, max_body)
             
     except Exception as e:
         print(f"Error processing curl command: {str(e)}")
         raise
 
+def replay_to_files(output_dir, response_num, curl_command, replayer=None, max_body=DEFAULT_MAX_BODY):
+    """Execute one command and write its response{N}.txt and request{N}.txt; returns (status, headers)"""
+    output_file = output_dir / f"response{response_num}.txt"
+    
+    # Save response as it arrives, handling compressed content
+    with open(output_file, 'w', encoding='utf-8') as f:
+        stderr, returncode, response = execute_curl_command(curl_command, f, replayer, max_body)
+        if stderr:
+            f.write(f"\n--- Error Output ---\n{stderr.decode('utf-8', errors='replace')}")
+            
+    print(f"Response saved to: {output_file}")
+    
+    # Save the original request too
+    request_file = output_dir / f"request{response_num}.txt"
+    with open(request_file, 'w', encoding='utf-8') as f:
+        f.write(curl_command)
+    print(f"Request saved to: {request_file}")
+    
+    # Check if command was successful
+    if returncode != 0:
+        print(f"Warning: Curl command returned non-zero exit code: {returncode}")
+    return response.status, response.headers
+
+def replay_to_store(run, response_num, key, curl_command, replayer=None, max_body=DEFAULT_MAX_BODY):
+    """Execute one command and record it in a ResponseStore run instead of writing files.
+
+    Head and body stream into separate blob writers that hash them, so a
+    body already stored by an earlier run is not written again even though
+    its Date header changed. Returns (status, headers) like replay_to_files().
+    """
+    store = run.store
+    with store.writer() as head, store.writer() as body:
+        stderr, returncode, response = execute_curl_command(curl_command, body, replayer, max_body,
+                                                            head_output=head)
+        if stderr:
+            body.write(f"\n--- Error Output ---\n{stderr.decode('utf-8', errors='replace')}")
+    run.record({
+        'key': key,
+        'number': response_num,
+        'request': store.put_text(curl_command),
+        'head': head.digest,
+        'body': body.digest,
+        'size': head.size + body.size,
+        'returncode': returncode,
+    }, body)
+    print(f"Response stored: {key} -> {body.digest[:12]}{' (new)' if body.new else ''}")
+    if returncode != 0:
+        print(f"Warning: Curl command returned non-zero exit code: {returncode}")
+    return response.status, response.headers
+
+class TokenBucket:
+    """Allows burst requests at once, refilling one token every interval seconds"""
+    def __init__(self, interval, burst=1):
+        self.interval = interval
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if self.interval > 0:
+                    self.tokens = min(self.burst, self.tokens + (now - self.updated) / self.interval)
+                else:
+                    self.tokens = self.burst
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.interval)
+
+class HostScheduler:
+    """Per-host token buckets: each target gets its own rate, different hosts run concurrently.
+
+    rules maps a host to {"interval": seconds, "burst": n}; other hosts use
+    the default interval and burst.
+    """
+    def __init__(self, interval=15, burst=1, rules=None):
+        self.interval = interval
+        self.burst = burst
+        self.rules = rules or {}
+        self.buckets = {}
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            rule = self.rules.get(host, {})
+            self.buckets[host] = TokenBucket(rule.get('interval', self.interval), rule.get('burst', self.burst))
+        return self.buckets[host]
+
+def command_host(curl_command):
+    """Target host of a curl command, for scheduling; parsed if possible, else taken from the URL text"""
+    try:
+        return parse_curl_command(curl_command).host or 'unknown'
+    except CurlParseError:
+        match = re.search(r"https?://([^/:'\"\s]+)", curl_command)
+        return match.group(1).lower() if match else 'unknown'
+
+def plan_batch(cmds_files, output_dir, allocate=True, journal=None):
+    """One job per listed command: (command file, command, host, output folder, response number).
+
+    Responses of each CMDs.txt go to output_dir/<its folder name>, numbered in
+    list order from one block reserved up front, so neither concurrent hosts
+    nor other runners on the same folder race for a number. Without allocate
+    (store runs) commands are numbered by their position in the list.
+    Commands a journal already has as done are left out.
+    """
+    jobs = []
+    skipped = 0
+    for cmds_file in cmds_files:
+        folder = Path(output_dir) / Path(cmds_file).resolve().parent.name
+        commands = []
+        for position, command_file in enumerate(read_command_list(cmds_file), 1):
+            try:
+                with open(command_file, 'r') as f:
+                    curl_command = f.read().strip()
+            except OSError as e:
+                print(f"Skipping {command_file}: {e}")
+                continue
+            if journal is not None and journal.is_done(folder.name, curl_command):
+                skipped += 1
+                continue
+            commands.append((command_file, curl_command, position))
+        if not commands:
+            continue
+        first = ResponseCounter(folder).allocate(len(commands)) if allocate else None
+        for offset, (command_file, curl_command, position) in enumerate(commands):
+            response_num = first + offset if allocate else position
+            jobs.append((command_file, curl_command, command_host(curl_command), folder, response_num))
+    if skipped:
+        print(f"Resuming: skipping {skipped} commands already in the journal")
+    return jobs
+
+def replay_job(job, replayer, max_body=DEFAULT_MAX_BODY, run=None, journal=None):
+    """Replay one planned job to files or the store; returns (status, headers).
+
+    Commands that got a final response are recorded in the journal, if one is
+    kept; throttled ones (429/503) are not, so --resume replays them. A job
+    that fails is logged and journaled as an error (also replayed on --resume)
+    and returns (None, {}), so the rest of the batch carries on.
+    """
+    command_file, curl_command, _, folder, response_num = job
+    started = time.perf_counter()
+    try:
+        if run is not None:
+            key = f"{folder.name}/{Path(command_file).name}"
+            status, headers = replay_to_store(run, response_num, key, curl_command, replayer, max_body)
+        else:
+            status, headers = replay_to_files(folder, response_num, curl_command, replayer, max_body)
+    except Exception as e:
+        print(f"Failed to replay {command_file}: {str(e)}")
+        if journal is not None:
+            journal.record(folder.name, curl_command, response_num, None, time.perf_counter() - started,
+                           error=str(e))
+        return None, {}
+    if journal is not None and status is not None and status not in BACKOFF_STATUSES:
+        journal.record(folder.name, curl_command, response_num, status, time.perf_counter() - started)
+    return status, headers
+
+async def replay_host(host, jobs, scheduler, replayer, executor, max_body=DEFAULT_MAX_BODY, run=None, limiter=None,
+                      journal=None):
+    """Run one host's commands in list order, each after taking a token from its bucket.
+
+    With an AdaptiveLimiter, commands also wait for room in the host's
+    window and may overlap; each response's status, Retry-After and latency
+    then resize the window.
+    """
+    loop = asyncio.get_running_loop()
+    bucket = scheduler.bucket(host)
+    if limiter is None:
+        for job in jobs:
+            await bucket.acquire()
+            await loop.run_in_executor(executor, replay_job, job, replayer, max_body, run, journal)
+        return
+
+    limit = limiter.host(host)
+
+    async def replay_limited(job, started):
+        status = None
+        headers = {}
+        try:
+            status, headers = await loop.run_in_executor(executor, replay_job, job, replayer, max_body, run,
+                                                         journal)
+        finally:
+            await limit.release(started, status, headers.get('retry-after'))
+
+    tasks = []
+    for job in jobs:
+        await bucket.acquire()
+        started = await limit.acquire()
+        tasks.append(asyncio.create_task(replay_limited(job, started)))
+    await asyncio.gather(*tasks)
+
+async def replay_batch(cmds_files, output_dir, scheduler, replayer=None, concurrency=8, max_body=DEFAULT_MAX_BODY,
+                       run=None, limiter=None, journal=None):
+    """Replay every command listed in the CMDs.txt files, hosts concurrently, each at its own rate.
+
+    With a journal, finished commands are recorded in it and the ones it
+    already holds are skipped.
+    """
+    jobs = plan_batch(cmds_files, output_dir, allocate=run is None, journal=journal)
+    by_host = defaultdict(list)
+    for job in jobs:
+        by_host[job[2]].append(job)
+    print(f"Replaying {len(jobs)} commands across {len(by_host)} hosts")
+    
+    # Blocking sends run on a bounded thread pool; the event loop only schedules
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        await asyncio.gather(*(replay_host(host, host_jobs, scheduler, replayer, executor, max_body, run, limiter,
+                                           journal)
+                               for host, host_jobs in by_host.items()))
+    return len(jobs)
+
 def main():
     parser = argparse.ArgumentParser(description='Run curl commands from file and save responses')
-    parser.add_argument('input_file', help='Input file containing curl command')
+    parser.add_argument('input_files', nargs='+', metavar='input_file',
+                        help='Input file(s) containing a curl command; several share one connection pool')
     parser.add_argument('--output-dir', '-o', default='./responses',
                       help='Output directory for responses (default: ./responses)')
+    parser.add_argument('--bash', action='store_true',
+                        help='Run every command through bash and curl instead of the in-process client')
+    parser.add_argument('--timeout', type=float, default=30,
+                        help='Connect/read timeout in seconds for the in-process client (default: 30)')
+    parser.add_argument('--max-body', type=float, default=DEFAULT_MAX_BODY / (1024 * 1024),
+                        help='Cut each saved response body after this many MB, 0 for no limit (default: 64)')
+    parser.add_argument('--store',
+                        help='Store responses in this content-addressed store (see ResponseStore.py) '
+                             'instead of response{N}.txt files')
+    parser.add_argument('--run', help='Name of this run in the store (default: a timestamp)')
+    parser.add_argument('--batch', action='store_true',
+                        help='Inputs are CMDs.txt lists (CurlLister); replay them with per-host rate limits, '
+                             'responses going to OUTPUT_DIR/<list folder>')
+    parser.add_argument('--interval', type=float,
+                        help='Batch: seconds between requests to the same host (default: 15, or 0 with --adaptive)')
+    parser.add_argument('--burst', type=int, default=1,
+                        help='Batch: requests a host may receive back to back before the interval applies (default: 1)')
+    parser.add_argument('--host-rules',
+                        help='Batch: JSON file of per-host overrides ({"host": {"interval": 30, "burst": 1}})')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Batch: requests in flight at once across all hosts (default: 8)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='Batch: size each host\'s requests in flight by its responses (AdaptiveLimiter.py): '
+                             'grow while latency stays flat, back off on 429/503, Retry-After or rising p95')
+    parser.add_argument('--max-per-host', type=int, default=8,
+                        help='Batch with --adaptive: most requests in flight to one host (default: 8)')
+    parser.add_argument('--journal',
+                        help='Batch: journal of finished commands (default: OUTPUT_DIR/replay_journal.jsonl, '
+                             'or STORE/runs/RUN.journal with --store)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Batch: skip commands the journal already has as finished '
+                             '(with --store, give the --run being resumed)')
                       
     args = parser.parse_args()
+    if args.resume and not args.batch:
+        parser.error('--resume needs --batch')
+    if args.resume and args.store and not args.run:
+        parser.error('--resume with --store needs the --run name to resume')
     
+    replayer = None if args.bash else HTTPReplayer(timeout=args.timeout)
+    max_body = int(args.max_body * 1024 * 1024) or None
+    run = ResponseStore(args.store).start_run(args.run) if args.store else None
+    journal = None
     try:
-        process_curl_command(args.input_file, args.output_dir)
+        if args.batch:
+            rules = None
+            if args.host_rules:
+                with open(args.host_rules, 'r') as f:
+                    rules = json.load(f)
+            interval = args.interval if args.interval is not None else (0 if args.adaptive else 15)
+            scheduler = HostScheduler(interval, args.burst, rules)
+            limiter = AdaptiveLimiter(maximum=args.max_per_host) if args.adaptive else None
+            journal_path = args.journal
+            if journal_path is None:
+                journal_path = (run.store.root / "runs" / f"{run.name}.journal" if run is not None
+                                else Path(args.output_dir) / "replay_journal.jsonl")
+            if not args.resume and os.path.exists(journal_path):
+                # A fresh run starts a fresh journal; the last one is kept beside it
+                os.replace(journal_path, f"{journal_path}.old")
+            journal = ReplayJournal(journal_path)
+            asyncio.run(replay_batch(args.input_files, args.output_dir, scheduler, replayer, args.concurrency,
+                                     max_body, run, limiter, journal))
+            if limiter is not None:
+                limiter.report()
+            return
+        for input_file in args.input_files:
+            process_curl_command(input_file, args.output_dir, replayer, max_body, run)
     except Exception as e:
         print(f"Failed to process curl command: {str(e)}")
         exit(1)
+    finally:
+        if journal is not None:
+            journal.close()
+        if replayer is not None:
+            replayer.close()
+        if run is not None:
+            run.close()
+            print(f"Run {run.name}: {run.entries} responses, {run.new_blobs} new bodies "
+                  f"({run.new_bytes} bytes), the rest already stored")
 
 if __name__ == "__main__":
     main()
@@ -1,3 +1,11 @@
+# CurlRunner.py can replay CMDs.txt lists itself: 15s between requests to the same host,
+# different hosts concurrently, one process for the whole run:
+python3 CurlRunner.py --batch */CMDs.txt --interval 15
+# Or let each host's responses set the pace (backs off on 429/503, Retry-After, slow responses):
+python3 CurlRunner.py --batch */CMDs.txt --adaptive --max-per-host 4
+# If a batch run dies, rerun it with --resume to skip what replay_journal.jsonl says finished:
+python3 CurlRunner.py --batch */CMDs.txt --interval 15 --resume
+
 while read file; do python3 curlLaunch.py "$file"; sleep 15; done < CMDs.txt
 
 # If CMDs.txt is in the same directory as curlLaunch.py:
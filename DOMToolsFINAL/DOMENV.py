@@ -1,30 +1,24 @@
-import xml.etree.ElementTree as ET
 import os
+import sys
+from pathlib import Path
 
-def parse_burp_xml(xml_content):
-    # Parse XML
-    root = ET.fromstring(xml_content)
-    
-    # Extract URLs and create folders
-    urls = []
-    for item in root.findall('item'):
-        url = item.find('url').text
-        urls.append(url)
-        
-        # Get path and create folder
-        path = item.find('path').text.strip('/')
-        if path:
-            # Replace slashes with hyphens
-            folder_name = path.replace('/', '-')
-            os.makedirs(folder_name, exist_ok=True)
-    
-    # Write URLs to file
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpScanner import scan_items
+
+def parse_burp_xml(xml_file):
+    # Extract URLs and create folders, scanning only those two fields of each item
     with open('URLs.txt', 'w') as f:
-        for url in urls:
+        for item in scan_items(xml_file, ('url', 'path')):
+            url = item.text('url')
             f.write(f"{url}\n")
+            
+            # Get path and create folder
+            path = item.text('path', '').strip('/')
+            if path:
+                # Replace slashes with hyphens
+                folder_name = path.replace('/', '-')
+                os.makedirs(folder_name, exist_ok=True)
 
-# Read XML file
-with open('DOMTest.xml', 'r') as f:
-    xml_content = f.read()
-
-parse_burp_xml(xml_content)
\ No newline at end of file
+# Stream XML file
+parse_burp_xml('DOMTest.xml')
\ No newline at end of file
@@ -0,0 +1,90 @@
+import re
+from functools import lru_cache
+
+# Placeholders for path segments that vary per object rather than per endpoint,
+# tried in order against the whole segment (or its stem, for "123.json")
+SEGMENT_PATTERNS = [
+    ('{uuid}', re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)),
+    ('{date}', re.compile(r'(19|20)\d{2}-?(0[1-9]|1[0-2])-?(0[1-9]|[12]\d|3[01])')),
+    ('{int}', re.compile(r'\d+')),
+    ('{hash}', re.compile(r'(?=[0-9a-f]*\d)(?=[0-9a-f]*[a-f])[0-9a-f]{16,}', re.IGNORECASE)),
+]
+
+def template_segment(segment):
+    """Replace one path segment with its placeholder, if it looks like an ID"""
+    for placeholder, pattern in SEGMENT_PATTERNS:
+        if pattern.fullmatch(segment):
+            return placeholder
+
+    # Keep a file extension on templated names, e.g. 123.json -> {int}.json
+    stem, dot, ext = segment.rpartition('.')
+    if dot and stem and ext.isalpha():
+        for placeholder, pattern in SEGMENT_PATTERNS:
+            if pattern.fullmatch(stem):
+                return f"{placeholder}.{ext}"
+    return segment
+
+@lru_cache(maxsize=65536)
+def endpoint_template(path):
+    """Normalize an endpoint path into its template: /api/user/123 -> /api/user/{int}"""
+    return '/'.join(template_segment(segment) for segment in path.split('/'))
+
+class EndpointCluster:
+    """All items of one method + endpoint template: a representative item plus counts"""
+    def __init__(self, method, template, representative=None):
+        self.method = method
+        self.template = template
+        self.representative = representative
+        self.count = 0
+        self.paths = set()
+
+class EndpointClusterer:
+    """Group items by method and endpoint template, keeping the first item of each as representative.
+
+    max_examples bounds how many literal paths are remembered per cluster.
+    """
+    def __init__(self, max_examples=10):
+        self.max_examples = max_examples
+        self.clusters = {}  # "METHOD template" -> EndpointCluster
+
+    def cluster_for(self, method, template):
+        key = f"{method} {template}"
+        cluster = self.clusters.get(key)
+        if cluster is None:
+            cluster = self.clusters[key] = EndpointCluster(method, template)
+        return cluster
+
+    def add(self, method, path, item=None):
+        """Count an item under its cluster; returns the cluster.
+
+        The first item of a new cluster is kept as its representative; callers
+        that write items out as they go can pass none and check count == 1.
+        """
+        cluster = self.cluster_for(method, endpoint_template(path))
+        if cluster.representative is None and cluster.count == 0:
+            cluster.representative = item
+        cluster.count += 1
+        if len(cluster.paths) < self.max_examples:
+            cluster.paths.add(path)
+        return cluster
+
+    def merge_summary(self, summary):
+        """Seed counts from an earlier summary(); those clusters keep no representative here"""
+        for key, entry in summary.items():
+            method, _, template = key.partition(' ')
+            cluster = self.cluster_for(method, template)
+            cluster.count += entry.get('count', 0)
+            for path in entry.get('examples', []):
+                if len(cluster.paths) < self.max_examples:
+                    cluster.paths.add(path)
+
+    def summary(self):
+        """{"METHOD template": {'count': n, 'examples': [paths]}}, largest clusters first"""
+        ordered = sorted(self.clusters.items(), key=lambda kv: (-kv[1].count, kv[0]))
+        return {key: {'count': c.count, 'examples': sorted(c.paths)} for key, c in ordered}
+
+    def __iter__(self):
+        return iter(self.clusters.values())
+
+    def __len__(self):
+        return len(self.clusters)
@@ -0,0 +1,126 @@
+import json
+from collections import deque
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton that finds every keyword in a string in one scan.
+
+    Each keyword maps to one or more tags; find_tags() returns the tags of all
+    keywords occurring anywhere in the text, so hundreds of substring checks
+    per path become a single pass over its characters.
+    """
+    def __init__(self, keywords=None, case_insensitive=True):
+        self.case_insensitive = case_insensitive
+        self.goto = [{}]       # state -> {char: next state}
+        self.fail = [0]        # state -> failure link
+        self.out = [()]        # state -> tags of keywords ending here
+        self.compiled = False
+
+        for keyword in keywords or ():
+            self.add(keyword)
+
+    def add(self, keyword, tag=None):
+        """Add a keyword; matches report tag (defaults to the keyword itself)"""
+        if not keyword:
+            return
+        if self.case_insensitive:
+            keyword = keyword.lower()
+        tag = keyword if tag is None else tag
+
+        state = 0
+        for char in keyword:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = next_state
+
+        if tag not in self.out[state]:
+            self.out[state] = self.out[state] + (tag,)
+        self.compiled = False
+
+    def compile(self):
+        """Build failure links breadth-first and merge suffix outputs"""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                # Longest proper suffix of next_state that is also a prefix
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+
+                # Keywords ending at the suffix state also end here
+                if self.out[self.fail[next_state]]:
+                    merged = self.out[next_state] + tuple(
+                        tag for tag in self.out[self.fail[next_state]] if tag not in self.out[next_state])
+                    self.out[next_state] = merged
+
+        self.compiled = True
+        return self
+
+    def iter_matches(self, text):
+        """Yield (end_index, tag) for every keyword occurrence in text"""
+        if not self.compiled:
+            self.compile()
+        if self.case_insensitive:
+            text = text.lower()
+
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for tag in out[state]:
+                yield index, tag
+
+    def find_tags(self, text):
+        """Return the set of tags of all keywords found in text"""
+        if not self.compiled:
+            self.compile()
+        if self.case_insensitive:
+            text = text.lower()
+
+        goto, fail, out = self.goto, self.fail, self.out
+        tags = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                tags.update(out[state])
+        return tags
+
+    def __len__(self):
+        return len(self.goto)
+
+def keywords_from_json(json_file):
+    """Collect path keywords (strings starting with '/') from a nested JSON file
+    such as IDORList.json or DefaultPathsEnum1.json"""
+    with open(json_file, 'r') as f:
+        data = json.load(f)
+
+    keywords = []
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, str) and node.startswith('/') and len(node) > 1:
+            keywords.append(node)
+
+    # Preserve first-seen order while dropping duplicates
+    return list(dict.fromkeys(keywords))
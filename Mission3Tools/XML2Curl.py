@@ -1,7 +1,20 @@
-import xml.etree.ElementTree as ET
+import argparse
 import base64
+import multiprocessing
 import random
 import re
+import sys
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpScanner import scan_items
+from CurlLister import create_txt_list
+from CurlRequest import CurlRequest
+
+# Only these fields of each item are located by the scanner
+CURL_FIELDS = ('protocol', 'host', 'port', 'path', 'request')
+FILTER_FIELDS = ('method', 'url')
 
 def decode_base64(encoded_str):
     """Decode base64 string and return decoded bytes."""
@@ -11,137 +24,196 @@ def decode_base64(encoded_str):
         print(f"Error decoding base64: {e}")
         return None
 
-def parse_request(request_bytes):
-    """Parse raw HTTP request into components."""
-    try:
-        # Split request into lines and remove empty lines
-        request_lines = [line for line in request_bytes.decode('utf-8').split('\n') if line.strip()]
-        
-        # Parse first line for method, path, and HTTP version
-        method, path, version = request_lines[0].strip().split(' ')
-        
-        # Parse headers
-        headers = {}
-        for line in request_lines[1:]:
-            if ':' in line:
-                key, value = line.split(':', 1)
-                headers[key.strip()] = value.strip()
-            
-        return {
-            'method': method,
-            'path': path,
-            'version': version,
-            'headers': headers
-        }
-    except Exception as e:
-        print(f"Error parsing request: {e}")
-        return None
-
 def format_curl_command(url, method, headers):
     """Format request details into a curl command exactly matching Burp format."""
-    curl_parts = [f"curl --path-as-is -i -s -k -X $'{method}'"]
+    return CurlRequest(method, url, list(headers.items())).to_curl()
+
+def item_fields(item):
+    """Copy what a curl command needs out of a scanned item (plain strings, safe to send to workers)"""
+    has_request = 'request' in item
+    return (item.text('protocol'), item.text('host'), item.text('port'), item.text('path'),
+            has_request, has_request and item.is_base64('request'), item.text('request'))
+
+def build_curl_command(fields):
+    """Turn item_fields() into a Burp-format curl command; raises on unusable items"""
+    protocol, host, port, path, has_request, is_base64, request_data = fields
     
-    cookie = None
-    header_lines = []
+    # Construct full URL
+    url = f"{protocol}://{host}"
+    if (protocol == 'https' and port != '443') or (protocol == 'http' and port != '80'):
+        url += f":{port}"
+    url += path
     
-    # Process headers
-    for header, value in headers.items():
-        # Skip Connection and Content-Length headers
-        if header.lower() in ['connection', 'content-length']:
+    # Get request details
+    if not has_request:
+        raise Exception("No request element found")
+        
+    if not request_data:
+        raise Exception("Empty request data")
+        
+    # Decode if needed
+    if is_base64:
+        decoded_request = decode_base64(request_data)
+        if not decoded_request:
+            raise Exception("Failed to decode base64 request")
+    else:
+        decoded_request = request_data.encode('utf-8')
+        
+    # Parse request
+    try:
+        request = CurlRequest.from_raw(url, decoded_request.decode('utf-8'))
+    except UnicodeDecodeError:
+        raise Exception("Failed to parse request")
+        
+    # Format curl command
+    return request.to_curl()
+
+def try_build_curl_command(job):
+    """Pool worker: (position, host, fields) -> (position, host, curl command or None, error)"""
+    position, host, fields = job
+    try:
+        return position, host, build_curl_command(fields), None
+    except Exception as e:
+        return position, host, None, str(e)
+
+def iter_candidates(xml_file, method=None, host=None, url_pattern=None):
+    """Yield (position, item) for scanned items passing the optional filters"""
+    url_regex = re.compile(url_pattern) if url_pattern else None
+    for position, item in enumerate(scan_items(xml_file, CURL_FIELDS + FILTER_FIELDS)):
+        if method and (item.text('method') or '').strip().upper() != method.upper():
             continue
-        # Handle Cookie separately
-        if header.lower() == 'cookie':
-            cookie = value
+        if host and (item.text('host') or '').lower() != host.lower():
             continue
-        # Add other headers
-        header_lines.append(f"    -H $'{header}: {value}'")
-    
-    # Sort headers for consistency (except Cookie)
-    curl_parts.extend(sorted(header_lines))
-    
-    # Add cookie if present
-    if cookie:
-        curl_parts.append(f"    -b $'{cookie}'")
-    
-    # Add URL
-    curl_parts.append(f"    $'{url}'")
-    
-    return ' \\\n'.join(curl_parts)
+        if url_regex and not url_regex.search(item.text('url') or ''):
+            continue
+        yield position, item
+
+def sample_items(candidates, k, rng=random):
+    """Pick k random (position, item) pairs in one pass (reservoir sampling).
+
+    Memory stays at k items whatever the export size; the sample is returned
+    in export order as (position, host, item_fields()) jobs.
+    """
+    reservoir = []
+    for seen, (position, item) in enumerate(candidates, 1):
+        if seen <= k:
+            reservoir.append((position, item.text('host'), item_fields(item)))
+        else:
+            slot = rng.randrange(seen)
+            if slot < k:
+                reservoir[slot] = (position, item.text('host'), item_fields(item))
+    return sorted(reservoir, key=lambda job: job[0])
+
+def all_items(candidates):
+    """Every candidate as a (position, host, item_fields()) job"""
+    for position, item in candidates:
+        yield position, item.text('host'), item_fields(item)
+
+def sample_curl_commands(xml_file, k=1, seed=None, **filters):
+    """Return curl commands for k random items (fewer if the export is smaller)"""
+    rng = random.Random(seed)
+    commands = []
+    for position, host, command, error in map(try_build_curl_command,
+                                              sample_items(iter_candidates(xml_file, **filters), k, rng)):
+        if command is None:
+            print(f"Skipping item {position + 1}: {error}")
+        else:
+            commands.append(command)
+    return commands
 
 def process_burp_xml(xml_file):
     """Process Burp XML file and return a random request as curl command."""
     try:
-        # Parse XML
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        
-        # Find all items with requests
-        items = root.findall('.//item')
-        if not items:
+        # Select a random item in one streaming pass (reservoir of size 1)
+        jobs = sample_items(iter_candidates(xml_file), 1)
+        if not jobs:
             raise Exception("No request items found in XML")
-            
-        # Select random item
-        item = random.choice(items)
-        
-        # Get URL components
-        protocol = item.find('protocol').text
-        host = item.find('host').text
-        port = item.find('port').text
-        path = item.find('path').text
-        
-        # Construct full URL
-        url = f"{protocol}://{host}"
-        if (protocol == 'https' and port != '443') or (protocol == 'http' and port != '80'):
-            url += f":{port}"
-        url += path
-        
-        # Get request details
-        request_elem = item.find('request')
-        if request_elem is None:
-            raise Exception("No request element found")
-            
-        # Check if base64 encoded
-        is_base64 = request_elem.get('base64', 'false') == 'true'
-        request_data = request_elem.text
-        
-        if not request_data:
-            raise Exception("Empty request data")
-            
-        # Decode if needed
-        if is_base64:
-            decoded_request = decode_base64(request_data)
-            if not decoded_request:
-                raise Exception("Failed to decode base64 request")
-        else:
-            decoded_request = request_data.encode('utf-8')
-            
-        # Parse request
-        parsed_request = parse_request(decoded_request)
-        if not parsed_request:
-            raise Exception("Failed to parse request")
-            
-        # Format curl command
-        curl_cmd = format_curl_command(url, parsed_request['method'], parsed_request['headers'])
-        
-        return curl_cmd
+        return build_curl_command(jobs[0][2])
         
     except Exception as e:
         print(f"Error processing XML: {e}")
         return None
 
+def folder_name(host):
+    """Filesystem-safe subfolder name for a host"""
+    return "".join(x if x.isalnum() or x in "._-" else "_" for x in (host or "unknown_host"))
+
+def batch_curl_commands(xml_file, output_dir, processes=1, k=None, seed=None, **filters):
+    """Write a curl command file per item into output_dir/<host>/ plus a CMDs.txt per folder.
+
+    Commands are built across a worker pool but written by this process in
+    export order, named curl_<position>.txt so the CMDs.txt ordering follows
+    the export. With k, only k randomly sampled items are converted.
+    Returns (written, skipped).
+    """
+    output_dir = Path(output_dir)
+    candidates = iter_candidates(xml_file, **filters)
+    jobs = sample_items(candidates, k, random.Random(seed)) if k else all_items(candidates)
+    
+    written = skipped = 0
+    pool = multiprocessing.Pool(processes) if processes > 1 else None
+    try:
+        results = pool.imap(try_build_curl_command, jobs, chunksize=256) if pool else map(try_build_curl_command, jobs)
+        for position, host, command, error in results:
+            if command is None:
+                print(f"Skipping item {position + 1}: {error}")
+                skipped += 1
+                continue
+            folder = output_dir / folder_name(host)
+            folder.mkdir(parents=True, exist_ok=True)
+            with open(folder / f"curl_{position + 1:06d}.txt", 'w') as f:
+                f.write(command)
+            written += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    
+    # Same CMDs.txt layout CurlLister produces, for CurlRunner loops
+    if written:
+        create_txt_list(output_dir)
+    return written, skipped
+
 def main():
-    """Main function to process XML file and save curl command."""
-    xml_file = 'NBA.xml'  # Input XML file
-    output_file = 'curl_3.txt'  # Output file for curl command
+    """Main function to process XML file and save curl commands."""
+    parser = argparse.ArgumentParser(description='Turn Burp XML items into Burp-format curl commands')
+    parser.add_argument('xml_file', nargs='?', default='NBA.xml', help='Input XML file (default: NBA.xml)')
+    parser.add_argument('-o', '--output', default='curl_3.txt',
+                        help='Output file for sampled commands (default: curl_3.txt)')
+    parser.add_argument('-k', '--count', type=int,
+                        help='Number of random items to convert (default: 1, or every item with --batch)')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible samples')
+    parser.add_argument('--batch', metavar='DIR',
+                        help='Write one command file per item into DIR/<host>/ with a CMDs.txt per folder')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help='Worker processes for --batch (default: 1)')
+    parser.add_argument('--method', help='Only items with this HTTP method')
+    parser.add_argument('--host', help='Only items for this host')
+    parser.add_argument('--url-match', help='Only items whose URL matches this regex')
+    args = parser.parse_args()
+    filters = {'method': args.method, 'host': args.host, 'url_pattern': args.url_match}
     
     try:
-        curl_cmd = process_burp_xml(xml_file)
-        if curl_cmd:
-            with open(output_file, 'w') as f:
-                f.write(curl_cmd)
-            print(f"Curl command has been saved to {output_file}")
-        else:
+        if args.batch:
+            written, skipped = batch_curl_commands(args.xml_file, args.batch, args.processes, args.count,
+                                                   args.seed, **filters)
+            print(f"Wrote {written} curl commands to {args.batch} ({skipped} skipped)")
+            return
+        
+        commands = sample_curl_commands(args.xml_file, args.count or 1, args.seed, **filters)
+        if not commands:
             print("Failed to generate curl command")
+        elif len(commands) == 1:
+            with open(args.output, 'w') as f:
+                f.write(commands[0])
+            print(f"Curl command has been saved to {args.output}")
+        else:
+            # One file per command, numbered after the output name
+            output = Path(args.output)
+            for number, command in enumerate(commands, 1):
+                with open(output.with_name(f"{output.stem}_{number}{output.suffix}"), 'w') as f:
+                    f.write(command)
+            print(f"{len(commands)} curl commands have been saved to {output.stem}_N{output.suffix}")
     except Exception as e:
         print(f"Error in main: {e}")
 
@@ -1,41 +1,41 @@
 import argparse
+import hashlib
+import sys
 import requests
-import re
-
-def modify_and_send_request(input_file, new_method):
-    # Read the curl command from file
-    with open(input_file, 'r') as f:
-        curl_command = f.read()
-
-    # Extract the URL
-    url_pattern = r'\$\'(http.*?)\''
-    url_match = re.search(url_pattern, curl_command)
-    if url_match:
-        url = url_match.group(1)
-    else:
-        raise ValueError("No URL found in curl command")
-
-    # Extract headers
-    headers = {}
-    header_pattern = r'-H \$\'(.*?): (.*?)\''
-    header_matches = re.finditer(header_pattern, curl_command)
-    
-    for match in header_matches:
-        header_name = match.group(1)
-        header_value = match.group(2)
-        headers[header_name] = header_value
-
-    # Extract cookies
-    cookies = {}
-    cookie_pattern = r'-b \$\'(.*?)\''
-    cookie_match = re.search(cookie_pattern, curl_command)
-    if cookie_match:
-        cookie_str = cookie_match.group(1)
-        cookie_pairs = cookie_str.split('; ')
-        for pair in cookie_pairs:
-            if '=' in pair:
-                key, value = pair.split('=', 1)
-                cookies[key] = value
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from CurlRequest import load_curl_file as load_curl_request, read_command_list, CurlParseError
+
+# Verbs tried by --all-methods
+DEFAULT_METHODS = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS', 'TRACE', 'HEAD']
+# Verbs that normally carry no body; the command's body is dropped for them unless --keep-body
+BODYLESS_METHODS = {'GET', 'HEAD', 'TRACE', 'OPTIONS'}
+
+def load_curl_file(input_file):
+    """Parse a Burp-style curl command file into (url, headers, body); parsed once per file version"""
+    request = load_curl_request(input_file)
+    headers = {name: value for name, value in request.headers if value}
+    if request.cookie:
+        headers['Cookie'] = request.cookie
+    return request.url, headers, request.data
+
+def body_for(method, data, keep_body=False):
+    """The command's body, unless method normally has none"""
+    return data if keep_body or method.upper() not in BODYLESS_METHODS else None
+
+def modify_and_send_request(input_file, new_method, keep_body=False):
+    # Read and parse the curl command from file
+    try:
+        url, headers, data = load_curl_file(input_file)
+    except OSError as e:
+        print(f"Error reading {input_file}: {e}")
+        return
+    except CurlParseError as e:
+        print(f"Error: {input_file} is not a curl command methodfuzz can parse: {e}")
+        return
 
     # Send request with new method
     try:
@@ -43,7 +43,7 @@ def modify_and_send_request(input_file, new_method):
             method=new_method.upper(),
             url=url,
             headers=headers,
-            cookies=cookies,
+            data=body_for(new_method, data, keep_body),
             verify=False,
             allow_redirects=True
         )
@@ -58,13 +58,98 @@ def modify_and_send_request(input_file, new_method):
     except requests.exceptions.RequestException as e:
         print(f"Error sending request: {e}")
 
+def make_session(concurrency):
+    """One keep-alive session whose connection pool fits the worker count"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.verify = False
+    return session
+
+def probe(session, url, headers, data, method, timeout):
+    """Send one method and summarize the response as (status, length, short body hash)"""
+    try:
+        with session.request(method, url, headers=headers, data=data, timeout=timeout,
+                             allow_redirects=True, stream=True) as response:
+            digest = hashlib.sha256()
+            length = 0
+            for chunk in response.iter_content(64 * 1024):
+                digest.update(chunk)
+                length += len(chunk)
+            return str(response.status_code), length, digest.hexdigest()[:8]
+    except requests.exceptions.RequestException as e:
+        return f"ERR:{type(e).__name__}", 0, '-'
+
+def fan_out(input_files, methods, concurrency=16, timeout=30, keep_body=False):
+    """Send every method to every curl file concurrently over one session.
+
+    Returns {input_file: {method: (status, length, hash)}}; files that cannot
+    be parsed are reported and left out. The command's body goes out only
+    with methods that normally have one, unless keep_body.
+    """
+    targets = {}
+    for input_file in input_files:
+        try:
+            targets[input_file] = load_curl_file(input_file)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {input_file}: {e}")
+
+    # Quiet the per-request warnings verify=False would print
+    requests.packages.urllib3.disable_warnings()
+    matrix = {input_file: {} for input_file in targets}
+    with make_session(concurrency) as session, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {}
+        for input_file, (url, headers, data) in targets.items():
+            for method in methods:
+                future = executor.submit(probe, session, url, headers, body_for(method, data, keep_body),
+                                         method, timeout)
+                futures[future] = (input_file, method)
+        for future, (input_file, method) in futures.items():
+            matrix[input_file][method] = future.result()
+    return matrix
+
+def write_matrix(matrix, methods, output_file):
+    """One tab-separated row per curl file: status/length/hash for each method"""
+    lines = ['\t'.join(['file'] + methods)]
+    for input_file, results in matrix.items():
+        cells = [f"{status}/{length}/{digest}" for status, length, digest in (results[m] for m in methods)]
+        lines.append('\t'.join([str(input_file)] + cells))
+    with open(output_file, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
 def main():
     parser = argparse.ArgumentParser(description='Modify HTTP method in curl command')
-    parser.add_argument('-f', '--file', required=True, help='Input file containing curl command')
-    parser.add_argument('-X', '--method', required=True, help='New HTTP method (GET, POST, PUT, etc.)')
-    
+    parser.add_argument('-f', '--file', nargs='+', default=[], help='Input file(s) containing a curl command')
+    parser.add_argument('-l', '--list', nargs='+', default=[],
+                        help='CMDs.txt list(s) of curl command files (as written by CurlLister)')
+    parser.add_argument('-X', '--method', nargs='+', default=[],
+                        help='HTTP method(s) to send (GET, POST, PUT, custom verbs, ...)')
+    parser.add_argument('--all-methods', action='store_true', help=f"Send {', '.join(DEFAULT_METHODS)}")
+    parser.add_argument('-o', '--output', default='method_matrix.tsv',
+                        help='Matrix file for fan-out runs (default: method_matrix.tsv)')
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='Requests in flight at once (default: 16)')
+    parser.add_argument('--timeout', type=float, default=30, help='Request timeout in seconds (default: 30)')
+    parser.add_argument('--keep-body', action='store_true',
+                        help=f"Send the command's body with {', '.join(sorted(BODYLESS_METHODS))} too")
+
     args = parser.parse_args()
-    modify_and_send_request(args.file, args.method)
+    input_files = list(args.file)
+    for cmds_file in args.list:
+        input_files.extend(read_command_list(cmds_file))
+    methods = [method.upper() for method in args.method]
+    if args.all_methods:
+        methods += [method for method in DEFAULT_METHODS if method not in methods]
+    if not input_files or not methods:
+        parser.error('need at least one curl file (-f/-l) and one method (-X/--all-methods)')
+
+    if len(input_files) == 1 and len(methods) == 1:
+        modify_and_send_request(input_files[0], methods[0], args.keep_body)
+        return
+
+    matrix = fan_out(input_files, methods, args.concurrency, args.timeout, args.keep_body)
+    write_matrix(matrix, methods, args.output)
+    print(f"Sent {len(matrix) * len(methods)} requests; matrix written to {args.output}")
 
 if __name__ == '__main__':
     main()
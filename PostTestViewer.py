@@ -4,6 +4,7 @@ from pathlib import Path
 import re
 from datetime import datetime
 import json
+from ChunkedText import ChunkedTextRenderer
 
 class HTTPFolderViewer:
     def __init__(self, root):
@@ -74,7 +75,8 @@ class HTTPFolderViewer:
         self.req_text.pack(fill=tk.BOTH, expand=True)
         req_scroll = ttk.Scrollbar(req_frame, orient=tk.VERTICAL, command=self.req_text.yview)
         req_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.req_text['yscrollcommand'] = req_scroll.set
+        self.req_renderer = ChunkedTextRenderer(self.req_text)
+        self.req_renderer.attach_scrollbar(req_scroll)
         
         # Response Frame
         resp_frame = ttk.LabelFrame(self.main_frame, text="Response", padding="5")
@@ -84,7 +86,8 @@ class HTTPFolderViewer:
         self.resp_text.pack(fill=tk.BOTH, expand=True)
         resp_scroll = ttk.Scrollbar(resp_frame, orient=tk.VERTICAL, command=self.resp_text.yview)
         resp_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.resp_text['yscrollcommand'] = resp_scroll.set
+        self.resp_renderer = ChunkedTextRenderer(self.resp_text)
+        self.resp_renderer.attach_scrollbar(resp_scroll)
 
     def browse_folder(self):
         """Open folder browser dialog"""
@@ -130,8 +133,8 @@ class HTTPFolderViewer:
     def update_display(self):
         """Update the display with current request/response pair"""
         # Clear displays
-        self.req_text.delete('1.0', tk.END)
-        self.resp_text.delete('1.0', tk.END)
+        self.req_renderer.set_content("")
+        self.resp_renderer.set_content("")
         
         if not self.request_response_pairs:
             self.counter_label.config(text="No request/response pairs found")
@@ -146,16 +149,16 @@ class HTTPFolderViewer:
         # Load request
         try:
             with open(req_file, 'r', encoding='utf-8') as f:
-                self.req_text.insert('1.0', f.read())
+                self.req_renderer.set_content(f.read())
         except Exception as e:
-            self.req_text.insert('1.0', f"Error loading request: {str(e)}")
+            self.req_renderer.set_content(f"Error loading request: {str(e)}")
             
         # Load response
         try:
             with open(resp_file, 'r', encoding='utf-8') as f:
-                self.resp_text.insert('1.0', f.read())
+                self.resp_renderer.set_content(f.read())
         except Exception as e:
-            self.resp_text.insert('1.0', f"Error loading response: {str(e)}")
+            self.resp_renderer.set_content(f"Error loading response: {str(e)}")
             
         # Update button states
         self.prev_button.state(['!disabled'] if self.current_index > 0 else ['disabled'])
@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# Entries are fsynced after this many records or this many seconds, whichever comes first
+SYNC_EVERY = 256
+SYNC_INTERVAL = 1.0
+
+def command_hash(curl_command):
+    return hashlib.sha256(curl_command.encode('utf-8')).hexdigest()
+
+def load_completed(path):
+    """(list, command hash) of every finished entry in a journal; errors and a torn last line are ignored"""
+    completed = set()
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'error' in entry:
+                    continue
+                completed.add((entry['list'], entry['hash']))
+    except FileNotFoundError:
+        pass
+    return completed
+
+class ReplayJournal:
+    """Append-only journal of the commands a batch replay has finished.
+
+    One JSON line per command that got a final response (not a 429/503
+    asking to come back later): its list, command hash, response number,
+    status and time taken. Lines are written as commands finish but fsynced
+    in batches (SYNC_EVERY entries or SYNC_INTERVAL seconds), so a crash
+    loses at most the last batch, whose commands are simply replayed again
+    on --resume. Commands that failed are recorded with their error, and
+    --resume replays those too. Safe to record from several threads.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.completed = load_completed(self.path)
+        self.lock = threading.Lock()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if self.file.tell() and not self.ends_with_newline():
+            # Finish a line torn by a crash so the next entry starts cleanly
+            self.file.write("\n")
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.entries = 0
+
+    def ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def is_done(self, list_name, curl_command):
+        return (list_name, command_hash(curl_command)) in self.completed
+
+    def record(self, list_name, curl_command, response_num, status, seconds, error=None):
+        entry = {
+            'list': list_name,
+            'hash': command_hash(curl_command),
+            'response': response_num,
+            'status': status,
+            'seconds': round(seconds, 3),
+            'time': round(time.time(), 3),
+        }
+        if error is not None:
+            entry['error'] = error
+        line = json.dumps(entry) + "\n"
+        with self.lock:
+            self.file.write(line)
+            self.entries += 1
+            self.pending += 1
+            if self.pending < SYNC_EVERY and time.monotonic() - self.last_sync < SYNC_INTERVAL:
+                return
+            self.file.flush()
+            self.pending = 0
+            self.last_sync = time.monotonic()
+        # fsync outside the lock: other threads keep appending while the disk catches up
+        os.fsync(self.file.fileno())
+
+    def sync(self):
+        with self.lock:
+            self.file.flush()
+            self.pending = 0
+            self.last_sync = time.monotonic()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,242 @@
+import codecs
+import re
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: br bodies are kept compressed without it
+    brotli = None
+
+CHUNK_SIZE = 64 * 1024
+HEADER_END = b'\r\n\r\n'
+# 1xx heads before the real response (101 Switching Protocols is final)
+INTERIM_STATUS = re.compile(rb'^HTTP/[\d.]+ 1(?!01)\d\d\b')
+STATUS_LINE = re.compile(rb'^HTTP/[\d.]+ (\d{3})\b')
+
+# Decoded body bytes written per response before it is cut off (None: no limit)
+DEFAULT_MAX_BODY = 64 * 1024 * 1024
+
+class ChunkedDecoder:
+    """Incremental Transfer-Encoding: chunked decoder; trailers are dropped"""
+    def __init__(self):
+        self.buffer = b""
+        self.remaining = 0   # bytes left in the current chunk
+        self.state = 'size'  # size -> data -> crlf -> size ... -> done
+
+    def decode(self, data):
+        self.buffer += data
+        out = []
+        while self.buffer and self.state != 'done':
+            if self.state == 'size':
+                line_end = self.buffer.find(b'\r\n')
+                if line_end == -1:
+                    break
+                size_text = self.buffer[:line_end].split(b';', 1)[0].strip()
+                self.buffer = self.buffer[line_end + 2:]
+                self.remaining = int(size_text, 16)
+                self.state = 'data' if self.remaining else 'done'
+            elif self.state == 'data':
+                piece = self.buffer[:self.remaining]
+                self.buffer = self.buffer[len(piece):]
+                self.remaining -= len(piece)
+                out.append(piece)
+                if not self.remaining:
+                    self.state = 'crlf'
+            else:
+                if len(self.buffer) < 2:
+                    break
+                self.buffer = self.buffer[2:]
+                self.state = 'size'
+        return b"".join(out)
+
+class Decompressor:
+    """Incremental decoder for one Content-Encoding, bounded by an output budget"""
+    def __init__(self, encoding):
+        self.encoding = encoding
+        self.first = True
+        if encoding in ('gzip', 'x-gzip'):
+            self.engine = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == 'deflate':
+            self.engine = zlib.decompressobj()
+        elif encoding == 'br':
+            self.engine = brotli.Decompressor()
+            if not hasattr(self.engine, 'can_accept_more_data'):
+                # Before brotli 1.1 a chunk always expands in full, however large
+                raise ValueError("brotli module too old to bound decoded output")
+        else:
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def decompress(self, data, max_length):
+        """Up to about max_length decoded bytes of data; see pending for what is left over"""
+        if self.encoding == 'br':
+            return self.engine.process(data, output_buffer_limit=max_length)
+        try:
+            return self.engine.decompress(data, max_length)
+        except zlib.error:
+            if not (self.first and self.encoding == 'deflate'):
+                raise
+            # Some servers send raw deflate without the zlib wrapper
+            self.engine = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self.engine.decompress(data, max_length)
+        finally:
+            self.first = False
+
+    @property
+    def pending(self):
+        """Input to feed again because the last call hit its output budget, or None"""
+        if self.encoding == 'br':
+            # brotli keeps the input itself; b"" asks it for the rest of the output
+            return None if self.engine.can_accept_more_data() else b""
+        return self.engine.unconsumed_tail or None
+
+def parse_status(head):
+    """Status code of a raw response head, or None if its status line is not HTTP"""
+    match = STATUS_LINE.match(head)
+    return int(match.group(1)) if match else None
+
+def parse_headers(head):
+    """Lowercased header name -> value of a raw response head"""
+    headers = {}
+    for line in head.split(b'\r\n')[1:]:
+        if b':' in line:
+            name, value = line.split(b':', 1)
+            headers[name.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+    return headers
+
+class ResponseDecoder:
+    """Streams raw curl -i output into the text saved as response{N}.txt.
+
+    Interim 1xx responses are written through as they are, the final head is
+    parsed, and the body is dechunked (if dechunk and the response is chunked;
+    curl and http.client already dechunk), decompressed per Content-Encoding
+    (unless content_encoding is False, as for curl --compressed output that
+    curl has already decoded; gzip is still recognized by its magic bytes, as
+    before) and decoded as UTF-8 while it is fed, so memory stays at one
+    chunk. A body that fails to decompress is written as received. Past
+    max_bytes decoded bytes the body is cut and a truncation marker written;
+    feed() then returns False. Heads go to head_output instead when one is
+    given (e.g. to store them apart).
+    """
+    def __init__(self, output, max_bytes=DEFAULT_MAX_BODY, dechunk=False, head_output=None,
+                 content_encoding=True):
+        self.output = output  # text file (or StringIO) to write to
+        self.head_output = head_output or output
+        self.max_bytes = max_bytes
+        self.dechunk = dechunk
+        self.content_encoding = content_encoding
+        self.buffer = b""
+        self.in_body = False
+        self.sniffing = False
+        self.chunked = None
+        self.decompressor = None
+        self.text = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.written = 0
+        self.truncated = False
+        self.status = None   # status code and headers of the final response, once read
+        self.headers = {}
+
+    def feed(self, data):
+        """Take the next bytes of the response; False once no more are wanted"""
+        if self.truncated:
+            return False
+        if not self.in_body:
+            self.buffer += data
+            if not self.read_heads():
+                return True
+            data, self.buffer = self.buffer, b""
+        if self.chunked is not None:
+            data = self.chunked.decode(data)
+        if self.sniffing:
+            # No Content-Encoding: gzip is still recognized by its magic bytes
+            self.buffer += data
+            if len(self.buffer) < 2:
+                return True
+            data, self.buffer = self.buffer, b""
+            self.sniffing = False
+            if data[0] == 0x1f and data[1] == 0x8b:
+                self.decompressor = Decompressor('gzip')
+        self.write_body(data)
+        return not self.truncated
+
+    def read_heads(self):
+        """Write every complete head in the buffer; True once the final one is done"""
+        while True:
+            end = self.buffer.find(HEADER_END)
+            if end == -1:
+                return False
+            head = self.buffer[:end]
+            self.buffer = self.buffer[end + len(HEADER_END):]
+            self.head_output.write(head.decode('utf-8', errors='replace') + "\r\n\r\n")
+            if INTERIM_STATUS.match(head):
+                # 100 Continue and friends: the real response follows
+                continue
+            self.status = parse_status(head)
+            self.headers = parse_headers(head)
+            self.start_body(self.headers)
+            return True
+
+    def start_body(self, headers):
+        self.in_body = True
+        if self.dechunk and 'chunked' in headers.get('transfer-encoding', '').lower():
+            self.chunked = ChunkedDecoder()
+        encoding = headers.get('content-encoding', '').lower() if self.content_encoding else ''
+        if not encoding or encoding == 'identity':
+            self.sniffing = True
+        elif encoding == 'br' and brotli is None:
+            self.output.write("[brotli module not installed; body left compressed]\n")
+        else:
+            try:
+                self.decompressor = Decompressor(encoding)
+            except ValueError as e:
+                # Unknown or stacked encodings (or an unboundable br) are written as received
+                if encoding == 'br':
+                    self.output.write(f"[{e}; body left compressed]\n")
+
+    def budget(self):
+        """Decoded bytes to ask for per call: enough to see the cap crossed, never more than a few chunks"""
+        if self.max_bytes is None:
+            return CHUNK_SIZE * 16
+        return min(max(self.max_bytes - self.written, 0) + 1, CHUNK_SIZE * 16)
+
+    def write_body(self, data):
+        """Decompress (if needed) and write dechunked body bytes"""
+        if self.decompressor is None:
+            self.write_decoded(data)
+            return
+        try:
+            while data is not None and not self.truncated:
+                self.write_decoded(self.decompressor.decompress(data, self.budget()))
+                data = self.decompressor.pending
+        except Exception:
+            # Not actually encoded as labelled: keep the bytes as they came
+            self.decompressor = None
+            if data:
+                self.write_decoded(data)
+
+    def write_decoded(self, data):
+        if self.max_bytes is not None and self.written + len(data) > self.max_bytes:
+            data = data[:self.max_bytes - self.written]
+            self.truncated = True
+        self.written += len(data)
+        self.output.write(self.text.decode(data))
+        if self.truncated:
+            self.output.write(self.text.decode(b"", final=True))
+            self.output.write(f"\n[... response truncated after {self.max_bytes} bytes ...]")
+
+    def close(self):
+        """Flush what is left; a response without a blank line after its head is written as-is"""
+        if not self.in_body:
+            if self.buffer:
+                self.output.write(self.buffer.decode('utf-8', errors='replace'))
+            return
+        if self.sniffing and self.buffer:
+            self.sniffing = False
+            self.write_body(self.buffer)
+        if self.decompressor is not None and not self.truncated \
+                and self.decompressor.encoding != 'br':
+            try:
+                self.write_decoded(self.decompressor.engine.flush())
+            except Exception as e:
+                self.output.write(f"[Error decompressing {self.decompressor.encoding} content: {str(e)}]")
+        if not self.truncated:
+            self.output.write(self.text.decode(b"", final=True))
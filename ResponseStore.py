@@ -0,0 +1,215 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Responses smaller than this are hashed in memory, so a repeat costs no disk writes
+SPOOL_SIZE = 8 * 1024 * 1024
+
+class BlobWriter:
+    """Text sink that hashes what is written and stores it as a blob on close.
+
+    Content is spooled (in memory up to SPOOL_SIZE) while its SHA-256 is
+    computed; on close it is gzipped into the store only if no blob with
+    that hash exists yet. The digest is available as .digest afterwards.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.hasher = hashlib.sha256()
+        self.spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE, dir=store.root)
+        self.size = 0
+        self.digest = None
+        self.new = False
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self.hasher.update(data)
+        self.spool.write(data)
+        self.size += len(data)
+
+    def close(self):
+        if self.digest is not None:
+            return
+        self.digest = self.hasher.hexdigest()
+        try:
+            if not self.store.has(self.digest):
+                self.spool.seek(0)
+                self.new = self.store.add_stream(self.digest, self.spool)
+        finally:
+            self.spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class ResponseStore:
+    """Content-addressed store of replayed responses with one manifest per run.
+
+    Blobs live at blobs/<2 hex>/<sha256>.gz and are written once, whatever
+    the number of runs that produced them; runs/<name>.jsonl lists what each
+    command returned as digests (status line and headers apart from the body,
+    which is what repeats), so comparing runs is comparing hashes.
+    """
+    def __init__(self, root):
+        self.root = Path(root)
+        (self.root / "blobs").mkdir(parents=True, exist_ok=True)
+        (self.root / "runs").mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, digest):
+        return self.root / "blobs" / digest[:2] / f"{digest}.gz"
+
+    def has(self, digest):
+        return self.blob_path(digest).exists()
+
+    def add_stream(self, digest, source):
+        """Gzip source into the blob for digest; False if another writer got there first"""
+        path = self.blob_path(digest)
+        path.parent.mkdir(exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+                shutil.copyfileobj(source, f, 1024 * 1024)
+            if path.exists():
+                os.remove(temp_path)
+                return False
+            os.replace(temp_path, path)
+            return True
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def writer(self):
+        return BlobWriter(self)
+
+    def put_text(self, text):
+        """Store a string and return its digest"""
+        with self.writer() as blob:
+            blob.write(text)
+        return blob.digest
+
+    def read_text(self, digest):
+        with gzip.open(self.blob_path(digest), 'rb') as f:
+            return f.read().decode('utf-8')
+
+    def run_path(self, name):
+        return self.root / "runs" / f"{name}.jsonl"
+
+    def start_run(self, name=None):
+        return RunManifest(self, name or time.strftime('%Y%m%d-%H%M%S'))
+
+    def load_run(self, name):
+        """Manifest entries of a run, in the order they were recorded"""
+        with open(self.run_path(name), 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def runs(self):
+        return sorted(path.stem for path in (self.root / "runs").glob("*.jsonl"))
+
+class RunManifest:
+    """Append-only manifest of one replay run; safe to record from several threads"""
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+        self.lock = threading.Lock()
+        self.file = open(store.run_path(name), 'a', encoding='utf-8')
+        self.new_blobs = 0
+        self.new_bytes = 0
+        self.entries = 0
+
+    def record(self, entry, body_blob=None):
+        """Append one entry (a dict with at least key, request, head and body digests)"""
+        with self.lock:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            self.entries += 1
+            if body_blob is not None and body_blob.new:
+                self.new_blobs += 1
+                self.new_bytes += body_blob.size
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def status_line(store, entry):
+    return store.read_text(entry['head']).split('\r\n', 1)[0]
+
+def compare_runs(store, run_a, run_b):
+    """(changed, added, removed, unchanged) entry keys between two runs.
+
+    An entry changed if its body digest differs, or if its status line does
+    (headers such as Date are expected to differ and are ignored).
+    """
+    first = {entry['key']: entry for entry in store.load_run(run_a)}
+    second = {entry['key']: entry for entry in store.load_run(run_b)}
+    changed, unchanged = [], []
+    for key in second:
+        if key not in first:
+            continue
+        before, after = first[key], second[key]
+        if before['body'] != after['body'] or status_line(store, before) != status_line(store, after):
+            changed.append(key)
+        else:
+            unchanged.append(key)
+    added = [key for key in second if key not in first]
+    removed = [key for key in first if key not in second]
+    return changed, added, removed, unchanged
+
+def export_run(store, name, output_dir):
+    """Write a run back out as response{N}.txt/request{N}.txt files"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    entries = store.load_run(name)
+    for entry in entries:
+        with open(output_dir / f"response{entry['number']}.txt", 'w', encoding='utf-8') as f:
+            f.write(store.read_text(entry['head']) + store.read_text(entry['body']))
+        with open(output_dir / f"request{entry['number']}.txt", 'w', encoding='utf-8') as f:
+            f.write(store.read_text(entry['request']))
+    return len(entries)
+
+def main():
+    parser = argparse.ArgumentParser(description='Inspect a CurlRunner response store')
+    parser.add_argument('store', help='Store directory (as given to CurlRunner --store)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('runs', help='List runs')
+    diff_parser = subparsers.add_parser('diff', help='Show which responses changed between two runs')
+    diff_parser.add_argument('run_a')
+    diff_parser.add_argument('run_b')
+    show_parser = subparsers.add_parser('show', help='Print a blob')
+    show_parser.add_argument('digest')
+    export_parser = subparsers.add_parser('export', help='Write a run out as response{N}.txt files')
+    export_parser.add_argument('run')
+    export_parser.add_argument('output_dir')
+    args = parser.parse_args()
+
+    store = ResponseStore(args.store)
+    if args.command == 'runs':
+        for name in store.runs():
+            print(f"{name}: {len(store.load_run(name))} responses")
+    elif args.command == 'diff':
+        changed, added, removed, unchanged = compare_runs(store, args.run_a, args.run_b)
+        for label, keys in (('changed', changed), ('added', added), ('removed', removed)):
+            for key in keys:
+                print(f"{label:>8}: {key}")
+        print(f"{len(changed)} changed, {len(added)} added, {len(removed)} removed, {len(unchanged)} unchanged")
+    elif args.command == 'show':
+        print(store.read_text(args.digest), end='')
+    elif args.command == 'export':
+        count = export_run(store, args.run, args.output_dir)
+        print(f"Exported {count} responses to {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,15 @@
 import sys
-import xml.etree.ElementTree as ET
 import os
-import shutil
+import argparse
+import json
 from pathlib import Path
-from collections import defaultdict
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import iter_items, serialize_item, ItemWriterPool
+from KeywordMatcher import KeywordAutomaton, keywords_from_json
+from BurpDedup import SeenSet, dedup_items
+from EndpointCluster import EndpointClusterer, endpoint_template
 
 def create_directory(directory):
     """Create directory if it doesn't exist"""
@@ -21,12 +27,31 @@ def get_filetype(path):
     ext = Path(path).suffix
     return ext[1:] if ext else "no_extension"
 
-def organize_burp_xml(input_file):
-    """Organize Burp Suite XML export into different categories"""
-    # Parse XML
-    tree = ET.parse(input_file)
-    root = tree.getroot()
-    
+def safe_name(value, keep=""):
+    """Turn an endpoint path or keyword into a flat filename; keep lists extra characters to leave in"""
+    safe_value = "".join(x for x in value if x.isalnum() or x in "._-/" + keep)
+    return safe_value.replace("/", "_")
+
+def build_keyword_matcher(keyword_files):
+    """Compile the path keywords of the given JSON files into one automaton"""
+    matcher = KeywordAutomaton()
+    for keyword_file in keyword_files:
+        for keyword in keywords_from_json(keyword_file):
+            matcher.add(keyword)
+    return matcher.compile()
+
+def organize_burp_xml(input_file, keyword_files=None, seen=None, cluster=False, max_open=128):
+    """Organize Burp Suite XML export into different categories.
+
+    With seen (a BurpDedup.SeenSet), items from earlier runs are skipped and
+    new items are added to the existing category files. With cluster,
+    Endpoints/ gets one file per endpoint template (/api/user/{int}) holding
+    a single representative item per method, and Endpoints/clusters.json
+    records how many items each template stands for.
+
+    Items are written to their bucket files as they are read, keeping at
+    most max_open files open at once, so memory does not grow with the export.
+    """
     # Create base directories
     base_dir = "burp_organized"
     directories = {
@@ -35,70 +60,83 @@ def organize_burp_xml(input_file):
         "filetypes": os.path.join(base_dir, "Filetypes")
     }
     
+    # Keyword tagging is optional: one scan of each path against every keyword
+    matcher = None
+    if keyword_files:
+        matcher = build_keyword_matcher(keyword_files)
+        directories["keywords"] = os.path.join(base_dir, "Keywords")
+    
     for directory in directories.values():
         create_directory(directory)
     
-    # Data containers
-    methods_data = defaultdict(list)
-    endpoints_data = defaultdict(list)
-    filetypes_data = defaultdict(list)
+    # Every bucket file is written as items arrive, through a bounded pool of handles
+    pool = ItemWriterPool(max_open=max_open, root_attrib={"burpVersion": "2024.5.4"},
+                          xml_declaration=True, append=seen is not None)
     
-    # Process each item
-    for item in root.findall(".//item"):
-        # Extract basic information
-        method = item.find("method").text
-        url = item.find("url").text
-        endpoint = get_endpoint_path(url)
-        filetype = get_filetype(endpoint)
-        
-        # Store item in respective containers
-        methods_data[method].append(item)
-        endpoints_data[endpoint].append(item)
-        filetypes_data[filetype].append(item)
+    # Templates clustered by earlier runs already have their representative on disk
+    clusterer = None
+    if cluster:
+        clusterer = EndpointClusterer()
+        summary_file = os.path.join(directories["endpoints"], "clusters.json")
+        if seen is not None and os.path.exists(summary_file):
+            with open(summary_file, 'r') as f:
+                clusterer.merge_summary(json.load(f))
     
-    # Create XML files for methods
-    for method, items in methods_data.items():
-        output_file = os.path.join(directories["methods"], f"{method}.xml")
-        create_xml_file(output_file, items)
+    # Process each item as it is streamed from the export
+    items = iter_items(input_file)
+    if seen is not None:
+        items = dedup_items(items, seen)
+    with pool:
+        for item in items:
+            # Extract basic information
+            method = item.find("method").text
+            url = item.find("url").text
+            endpoint = get_endpoint_path(url)
+            filetype = get_filetype(endpoint)
+            
+            # Serialize the item once and share it between buckets
+            item_xml = serialize_item(item)
+            pool.write_raw(os.path.join(directories["methods"], f"{method}.xml"), item_xml)
+            if clusterer is None:
+                pool.write_raw(os.path.join(directories["endpoints"], f"{safe_name(endpoint)}.xml"), item_xml)
+            elif clusterer.add(method, endpoint).count == 1:
+                # First item of this method + template is its representative
+                template = endpoint_template(endpoint)
+                pool.write_raw(os.path.join(directories["endpoints"], f"{safe_name(template, keep='{}')}.xml"), item_xml)
+            pool.write_raw(os.path.join(directories["filetypes"], f"{filetype}.xml"), item_xml)
+            if matcher is not None:
+                for keyword in matcher.find_tags(endpoint):
+                    pool.write_raw(os.path.join(directories["keywords"], f"{safe_name(keyword)}.xml"), item_xml)
     
-    # Create XML files for endpoints
-    for endpoint, items in endpoints_data.items():
-        safe_endpoint = "".join(x for x in endpoint if x.isalnum() or x in "._-/")
-        safe_endpoint = safe_endpoint.replace("/", "_")
-        output_file = os.path.join(directories["endpoints"], f"{safe_endpoint}.xml")
-        create_xml_file(output_file, items)
-    
-    # Create XML files for filetypes
-    for filetype, items in filetypes_data.items():
-        output_file = os.path.join(directories["filetypes"], f"{filetype}.xml")
-        create_xml_file(output_file, items)
-
-def create_xml_file(output_file, items):
-    """Create XML file with given items"""
-    # Create root element
-    root = ET.Element("items")
-    root.set("burpVersion", "2024.5.4")  # You might want to make this dynamic
-    
-    # Add all items
-    for item in items:
-        root.append(item)
-    
-    # Create the XML tree and save
-    tree = ET.ElementTree(root)
-    tree.write(output_file, encoding="utf-8", xml_declaration=True)
+    if clusterer is not None:
+        with open(summary_file, 'w') as f:
+            json.dump(clusterer.summary(), f, indent=2)
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python script.py <input_xml_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description='Organize a Burp Suite XML export into Method/Endpoints/Filetypes')
+    parser.add_argument('input_file', help='Burp XML export')
+    parser.add_argument('keyword_files', nargs='*',
+                        help='Keyword JSON files (e.g. IDORList.json, DefaultPathsEnum1.json); matches go to Keywords/')
+    parser.add_argument('--seen', help='Fingerprint file of items organized in earlier runs; only new items are added')
+    parser.add_argument('--cluster', action='store_true',
+                        help='Group endpoints by template (/api/user/{int}) and keep one representative per method')
+    parser.add_argument('--max-open', type=int, default=128,
+                        help='Maximum output files kept open at once (default: 128)')
+    args = parser.parse_intermixed_args()
     
-    input_file = sys.argv[1]
-    if not os.path.exists(input_file):
-        print(f"Error: File {input_file} does not exist")
-        sys.exit(1)
+    for path in [args.input_file] + args.keyword_files:
+        if not os.path.exists(path):
+            print(f"Error: File {path} does not exist")
+            sys.exit(1)
     
     try:
-        organize_burp_xml(input_file)
+        if args.seen:
+            with SeenSet(args.seen) as seen:
+                organize_burp_xml(args.input_file, args.keyword_files, seen, args.cluster, args.max_open)
+            print(f"Added {seen.added} new items ({len(seen)} seen in total)")
+        else:
+            organize_burp_xml(args.input_file, args.keyword_files, cluster=args.cluster,
+                              max_open=args.max_open)
         print("Organization complete! Check the 'burp_organized' directory.")
     except Exception as e:
         print(f"Error processing file: {str(e)}")
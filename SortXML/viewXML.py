@@ -1,9 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import xml.etree.ElementTree as ET
 import base64
+import sys
 from pathlib import Path
 
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import open_items
+from ChunkedText import ChunkedTextRenderer
+
 class HTTPViewer:
     def __init__(self, root):
         self.root = root
@@ -44,7 +49,8 @@ class HTTPViewer:
         self.req_text.pack(fill=tk.BOTH, expand=True)
         req_scroll = ttk.Scrollbar(req_frame, orient=tk.VERTICAL, command=self.req_text.yview)
         req_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.req_text['yscrollcommand'] = req_scroll.set
+        self.req_renderer = ChunkedTextRenderer(self.req_text)
+        self.req_renderer.attach_scrollbar(req_scroll)
         
         # Response Frame
         resp_frame = ttk.LabelFrame(main_frame, text="Response", padding="5")
@@ -59,7 +65,8 @@ class HTTPViewer:
         self.resp_text.pack(fill=tk.BOTH, expand=True)
         resp_scroll = ttk.Scrollbar(resp_frame, orient=tk.VERTICAL, command=self.resp_text.yview)
         resp_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.resp_text['yscrollcommand'] = resp_scroll.set
+        self.resp_renderer = ChunkedTextRenderer(self.resp_text)
+        self.resp_renderer.attach_scrollbar(resp_scroll)
         
         # Configure grid weights
         main_frame.columnconfigure(0, weight=1)
@@ -77,9 +84,8 @@ class HTTPViewer:
         
     def load_xml_file(self, filename):
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
-            self.items = root.findall('.//item')
+            # Items are parsed one at a time on display via a random-access index
+            self.items = open_items(filename)
             if self.items:
                 self.update_display()
             else:
@@ -113,8 +119,7 @@ class HTTPViewer:
         if request.get('base64') == 'true':
             request_content = self.decode_base64(request_content)
         
-        self.req_text.delete('1.0', tk.END)
-        self.req_text.insert('1.0', request_content)
+        self.req_renderer.set_content(request_content)
         
         # Update response
         response = item.find('response')
@@ -122,8 +127,7 @@ class HTTPViewer:
         if response.get('base64') == 'true':
             response_content = self.decode_base64(response_content)
         
-        self.resp_text.delete('1.0', tk.END)
-        self.resp_text.insert('1.0', response_content)
+        self.resp_renderer.set_content(response_content)
         
         # Update button states
         self.prev_button.state(['!disabled'] if self.current_index > 0 else ['disabled'])
@@ -4,17 +4,38 @@ import os
 import argparse
 from pathlib import Path
 import re
+import sys
+import shutil
+import multiprocessing
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import ItemIndex
+from BurpStore import is_store
+from BurpScanner import BurpScanner, scan_items
+from BurpDedup import SeenSet, dedup_items, scanned_fingerprint
+from ENVPack import PackWriter, next_index
+
+# Fields located by the scanner; everything else in an item is skipped
+EXTRACT_FIELDS = ('request', 'response')
+PACK_FIELDS = EXTRACT_FIELDS + ('url', 'status')
 
 class BurpExtractor:
-    def __init__(self, output_dir="output"):
-        """Initialize with output directory"""
+    def __init__(self, output_dir="output", pack=False):
+        """Initialize with output directory; pack writes one pack file instead of three files per item"""
         self.output_dir = Path(output_dir)
+        self.pack = pack
+        self.pack_writer = None
+        self.failed = False  # set when a file could not be written
+        self.fields = PACK_FIELDS if pack else EXTRACT_FIELDS
         self.create_output_dirs()
         
     def create_output_dirs(self):
         """Create output directories if they don't exist"""
         # Create main output directory
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.pack:
+            return
         
         # Create subdirectories for each type
         (self.output_dir / "requests").mkdir(exist_ok=True)
@@ -40,47 +61,156 @@ class BurpExtractor:
                 f.write(content)
         except Exception as e:
             print(f"Error saving {filename}: {str(e)}")
+            self.failed = True
             
-    def process_xml(self, xml_file):
-        """Process Burp XML file and extract items"""
-        try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
+    def next_index(self):
+        """Number after the highest existing ReqN.txt, so incremental runs don't overwrite"""
+        if self.pack:
+            return next_index(self.output_dir)
+        highest = 0
+        for entry in os.scandir(self.output_dir / "requests"):
+            match = re.fullmatch(r'Req(\d+)\.txt', entry.name)
+            if match:
+                highest = max(highest, int(match.group(1)))
+        return highest + 1
+
+    def extract_item(self, idx, item):
+        """Write the request, referrer and response files of one BurpScanner item"""
+        if self.pack:
+            self.pack_item(idx, item)
+            return
+
+        # Extract request
+        if 'request' in item:
+            request_content = item.decoded('request')
+            self.save_content(request_content, self.output_dir / "requests" / f"Req{idx}.txt")
             
-            # Process each item
-            for idx, item in enumerate(root.findall('.//item'), 1):
-                print(f"Processing item {idx}...")
-                
-                # Extract request
-                request = item.find('request')
-                if request is not None:
-                    request_content = self.decode_base64(request.text) if request.get('base64') == 'true' else request.text
-                    self.save_content(request_content, self.output_dir / "requests" / f"Req{idx}.txt")
-                    
-                    # Extract and save referrer
-                    referrer = self.extract_referrer(request_content)
-                    self.save_content(referrer, self.output_dir / "referrers" / f"Ref{idx}.txt")
-                
-                # Extract response
-                response = item.find('response')
-                if response is not None:
-                    response_content = self.decode_base64(response.text) if response.get('base64') == 'true' else response.text
-                    self.save_content(response_content, self.output_dir / "responses" / f"Resp{idx}.txt")
+            # Extract and save referrer
+            referrer = self.extract_referrer(request_content)
+            self.save_content(referrer, self.output_dir / "referrers" / f"Ref{idx}.txt")
+        
+        # Extract response
+        if 'response' in item:
+            response_content = item.decoded('response')
+            self.save_content(response_content, self.output_dir / "responses" / f"Resp{idx}.txt")
+
+    def pack_item(self, idx, item):
+        """Append one BurpScanner item to the pack"""
+        if self.pack_writer is None:
+            self.pack_writer = PackWriter(self.output_dir)
+        request_content = item.decoded('request') if 'request' in item else None
+        response_content = item.decoded('response') if 'response' in item else None
+        referrer = self.extract_referrer(request_content) if request_content is not None else None
+        self.pack_writer.add(idx, request_content, response_content,
+                             item.text('url'), referrer, item.text('status'))
+
+    def close(self):
+        """Flush and close the pack, if one is being written"""
+        if self.pack_writer is not None:
+            self.pack_writer.close()
+            self.pack_writer = None
+
+    def process_xml(self, xml_file, seen=None, processes=1):
+        """Process Burp XML file and extract items.
+
+        With seen (a BurpDedup.SeenSet), only items not extracted by an earlier
+        run are written, numbered after the files already in the output directory.
+        With processes > 1 the export is split into shards extracted in parallel.
+        Returns False if the run failed or any file could not be written.
+        """
+        try:
+            if processes > 1:
+                if seen is not None or is_store(xml_file):
+                    print("Note: --seen and store inputs are processed serially")
+                else:
+                    self.process_sharded(xml_file, processes)
+                    print(f"\nExtraction complete! Files saved in {self.output_dir}")
+                    return not self.failed
+
+            # Scan the export for the request/response fields only
+            start = 1
+            if seen is not None:
+                items = dedup_items(scan_items(xml_file, ('method', 'url') + self.fields), seen,
+                                    fingerprint=scanned_fingerprint)
+                start = self.next_index()
+            else:
+                items = scan_items(xml_file, self.fields)
+            if self.pack:
+                # A fresh run replaces the pack; an incremental one adds to it
+                self.pack_writer = PackWriter(self.output_dir, append=seen is not None)
+            try:
+                for idx, item in enumerate(items, start):
+                    print(f"Processing item {idx}...")
+                    self.extract_item(idx, item)
+            finally:
+                self.close()
                 
             print(f"\nExtraction complete! Files saved in {self.output_dir}")
+            return not self.failed
             
         except ET.ParseError as e:
             print(f"Error parsing XML file: {str(e)}")
         except Exception as e:
             print(f"Unexpected error: {str(e)}")
+        return False
+
+    def process_sharded(self, xml_file, processes):
+        """Extract item-aligned shards in a process pool.
+
+        Every item keeps its position in the export as its file number, so the
+        output is the same as a serial run whatever order the shards finish in.
+        """
+        index = ItemIndex.open(xml_file)
+        # Only the offsets and lengths are needed from here on
+        index.close()
+        ranges = index.shard_ranges(processes * 4)
+
+        # Pack shards are written separately and appended in order afterwards
+        shard_dirs = [self.output_dir / f".shard-{n}" if self.pack else self.output_dir
+                      for n in range(len(ranges))]
+        # Workers get their item spans rather than each loading (or rebuilding) the index
+        jobs = [(str(shard_dir), xml_file, start, index.offsets[start:stop], index.lengths[start:stop], self.pack)
+                for (start, stop), shard_dir in zip(ranges, shard_dirs)]
+        with multiprocessing.Pool(processes) as pool:
+            for start, count, failed in pool.starmap(extract_shard, jobs):
+                print(f"Processed items {start + 1}-{start + count}")
+                self.failed = self.failed or failed
+
+        if self.pack:
+            with PackWriter(self.output_dir) as writer:
+                for shard_dir in shard_dirs:
+                    writer.add_pack(shard_dir)
+                    shutil.rmtree(shard_dir)
+
+def extract_shard(output_dir, xml_file, start, offsets, lengths, pack=False):
+    """Pool worker: extract the items at offsets/lengths, numbered from their position start in the export.
+
+    Returns (start, item count, whether any file could not be written).
+    """
+    extractor = BurpExtractor(output_dir, pack)
+    try:
+        with BurpScanner(xml_file, extractor.fields) as scanner:
+            for idx, item in enumerate(scanner.items_at(zip(offsets, lengths)), start + 1):
+                extractor.extract_item(idx, item)
+    finally:
+        extractor.close()
+    return start, len(offsets), extractor.failed
 
 def main():
     parser = argparse.ArgumentParser(description='Extract requests, responses, and referrers from Burp XML')
     parser.add_argument('xml_file', help='Input Burp XML file')
     parser.add_argument('-o', '--output', default='output',
                       help='Output directory (default: output)')
+    parser.add_argument('--seen',
+                      help='Fingerprint file of items extracted in earlier runs; only new items are written')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                      help='Extract in parallel shards with this many processes (default: 1)')
+    parser.add_argument('--pack', action='store_true',
+                      help='Write one items.pack + items.idx instead of Req/Resp/Ref files per item')
     
     args = parser.parse_args()
+    if args.seen and args.processes > 1:
+        parser.error('--seen runs are incremental and serial; it cannot be combined with -j')
     
     # Check if input file exists
     if not Path(args.xml_file).exists():
@@ -88,8 +218,21 @@ def main():
         return
     
     # Process the XML file
-    extractor = BurpExtractor(args.output)
-    extractor.process_xml(args.xml_file)
+    extractor = BurpExtractor(args.output, args.pack)
+    if args.seen:
+        seen = SeenSet(args.seen)
+        completed = False
+        try:
+            completed = extractor.process_xml(args.xml_file, seen)
+        finally:
+            # After a failed run nothing is committed, so the next run retries every new item
+            seen.close(commit=completed)
+        if completed:
+            print(f"{seen.added} new items extracted ({len(seen)} seen in total)")
+        else:
+            print(f"Extraction failed; {args.seen} was left unchanged")
+    else:
+        extractor.process_xml(args.xml_file, processes=args.processes)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
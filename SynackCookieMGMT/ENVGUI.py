@@ -1,8 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import re
-import os
+from ENVPack import load_items
 
 class ModernStyle:
     """Modern styling constants"""
@@ -256,42 +255,25 @@ class GridViewer(tk.Frame):
             for widget in self.grid_frame.winfo_children():
                 widget.destroy()
             
-            # Load and process files (same as before)
-            req_files = sorted(dir_path.glob("requests/Req*.txt"),
-                             key=lambda x: int(re.findall(r'\d+', x.name)[0]))
-            resp_files = sorted(dir_path.glob("responses/Resp*.txt"),
-                              key=lambda x: int(re.findall(r'\d+', x.name)[0]))
-            ref_files = sorted(dir_path.glob("referrers/Ref*.txt"),
-                             key=lambda x: int(re.findall(r'\d+', x.name)[0]))
+            # Load the items from an ENVExtract pack or its per-item files
+            items = load_items(dir_path)
             
             # Calculate referrer counts
             referrer_counts = {}
-            for ref_file in ref_files:
-                with open(ref_file, 'r') as f:
-                    referrer = f.read().strip()
-                    referrer_counts[referrer] = referrer_counts.get(referrer, 0) + 1
+            for item in items:
+                referrer_counts[item['referrer']] = referrer_counts.get(item['referrer'], 0) + 1
             
             # Create grid
-            for i, (req_file, resp_file, ref_file) in enumerate(zip(req_files, resp_files, ref_files)):
-                # Read files
-                with open(req_file, 'r') as f:
-                    request_content = f.read()
-                with open(resp_file, 'r') as f:
-                    response_content = f.read()
-                with open(ref_file, 'r') as f:
-                    referrer = f.read().strip()
-                
-                # Extract URL
-                url = request_content.split('\n')[0].split(' ')[1] if ' ' in request_content.split('\n')[0] else "Unknown"
-                
+            for i, item in enumerate(items):
                 # Create and place box
                 row = i // 2
                 col = i % 2
                 box = RequestBox(self.grid_frame, i)
                 box.grid(row=row, column=col, padx=10, pady=10, sticky='nsew')
-                box.set_data(request_content, response_content, url, referrer, referrer_counts[referrer])
+                box.set_data(item['request'], item['response'], item['url'], item['referrer'],
+                             referrer_counts[item['referrer']])
             
-            self.status_var.set(f"Loaded {len(req_files)} items")
+            self.status_var.set(f"Loaded {len(items)} items")
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load directory: {str(e)}")
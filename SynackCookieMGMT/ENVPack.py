@@ -0,0 +1,173 @@
+from collections import namedtuple
+from pathlib import Path
+import json
+import re
+
+# Single-container alternative to the requests/, responses/ and referrers/
+# directories: bodies go into one append-only pack file and every item gets
+# one JSON line in a small index next to it.
+PACK_FILE = "items.pack"
+INDEX_FILE = "items.idx"
+
+PackEntry = namedtuple('PackEntry', ['idx', 'request_offset', 'request_length', 'response_offset',
+                                     'response_length', 'url', 'referrer', 'status'])
+
+def is_pack(directory):
+    """True if directory holds a pack written by PackWriter"""
+    return (Path(directory) / INDEX_FILE).exists()
+
+def read_index(directory):
+    """All PackEntry records of a pack, in item order"""
+    entries = []
+    with open(Path(directory) / INDEX_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entries.append(PackEntry(*json.loads(line)))
+    return entries
+
+def next_index(directory):
+    """Item number after the last one already in the pack (1 if there is none)"""
+    if not is_pack(directory):
+        return 1
+    entries = read_index(directory)
+    return entries[-1].idx + 1 if entries else 1
+
+class PackWriter:
+    """Write extracted items to a pack file and its index.
+
+    A new writer replaces any pack already in output_dir, as re-running the
+    file layout overwrites its files; with append (incremental --seen runs)
+    items are added after the existing ones instead.
+    """
+    def __init__(self, output_dir, append=False):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.pack = open(self.output_dir / PACK_FILE, 'ab' if append else 'wb')
+        self.index = open(self.output_dir / INDEX_FILE, 'a' if append else 'w', encoding='utf-8')
+
+    def add(self, idx, request, response, url=None, referrer=None, status=None):
+        """Append one item; request/response are str (or None if the item has none)"""
+        request_offset, request_length = self.write_body(request)
+        response_offset, response_length = self.write_body(response)
+        entry = PackEntry(idx, request_offset, request_length, response_offset, response_length,
+                          url, referrer, status)
+        self.index.write(json.dumps(list(entry)) + "\n")
+        return entry
+
+    def write_body(self, content):
+        """Write one body and return its (offset, length); length -1 means missing"""
+        offset = self.pack.tell()
+        if content is None:
+            return offset, -1
+        data = content.encode('utf-8')
+        self.pack.write(data)
+        return offset, len(data)
+
+    def add_pack(self, directory):
+        """Append every item of another pack (e.g. one written by a shard worker)"""
+        base = self.pack.tell()
+        with open(Path(directory) / PACK_FILE, 'rb') as source:
+            while True:
+                chunk = source.read(1024 * 1024)
+                if not chunk:
+                    break
+                self.pack.write(chunk)
+        for entry in read_index(directory):
+            entry = entry._replace(request_offset=entry.request_offset + base,
+                                   response_offset=entry.response_offset + base)
+            self.index.write(json.dumps(list(entry)) + "\n")
+
+    def close(self):
+        self.pack.close()
+        self.index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class PackReader:
+    """Random access to the items of a pack without opening a file per item"""
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.entries = read_index(directory)
+        self.pack = open(self.directory / PACK_FILE, 'rb')
+
+    def read_body(self, offset, length):
+        if length < 0:
+            return None
+        self.pack.seek(offset)
+        return self.pack.read(length).decode('utf-8', errors='replace')
+
+    def request(self, entry):
+        return self.read_body(entry.request_offset, entry.request_length)
+
+    def response(self, entry):
+        return self.read_body(entry.response_offset, entry.response_length)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        self.pack.close()
+
+def text_mode(content):
+    """Normalize newlines the way reading a file in text mode does"""
+    return content.replace('\r\n', '\n').replace('\r', '\n')
+
+def number_of(path):
+    return int(re.findall(r'\d+', path.name)[0])
+
+def request_line_url(request):
+    """Path from the request line, which is what the viewers showed for file layouts"""
+    first_line = request.split('\n')[0]
+    return first_line.split(' ')[1] if ' ' in first_line else "Unknown"
+
+def load_items(directory):
+    """Load every extracted item of an ENVExtract output directory, in order.
+
+    Reads a pack if the directory has one, otherwise the Req/Resp/Ref files;
+    both give the same text. Returns dicts with request, response, referrer,
+    url (the request-line path, whichever the layout) and status (None for
+    the file layout, which does not keep it).
+    """
+    dir_path = Path(directory)
+    items = []
+    if is_pack(dir_path):
+        reader = PackReader(dir_path)
+        try:
+            for entry in reader:
+                request = text_mode(reader.request(entry) or "")
+                items.append({
+                    'request': request,
+                    'response': text_mode(reader.response(entry) or ""),
+                    'referrer': (entry.referrer or "").strip(),
+                    'url': request_line_url(request),
+                    'status': entry.status,
+                })
+        finally:
+            reader.close()
+        return items
+
+    req_files = sorted(dir_path.glob("requests/Req*.txt"), key=number_of)
+    resp_files = sorted(dir_path.glob("responses/Resp*.txt"), key=number_of)
+    ref_files = sorted(dir_path.glob("referrers/Ref*.txt"), key=number_of)
+    for req_file, resp_file, ref_file in zip(req_files, resp_files, ref_files):
+        with open(req_file, 'r') as f:
+            request = f.read()
+        with open(resp_file, 'r') as f:
+            response = f.read()
+        with open(ref_file, 'r') as f:
+            referrer = f.read().strip()
+        items.append({
+            'request': request,
+            'response': response,
+            'referrer': referrer,
+            'url': request_line_url(request),
+            'status': None,
+        })
+    return items
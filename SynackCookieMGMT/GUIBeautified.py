@@ -1,8 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
-import re
-import math
+from ENVPack import load_items
 
 class ModernStyle:
     BG_MAIN = "#f0f0f0"
@@ -216,32 +215,20 @@ class FlowViewer(tk.Frame):
                 self.canvas.delete("all")
                 self.boxes.clear()
                 
-                # Load files
-                req_files = sorted(dir_path.glob("requests/Req*.txt"),
-                                 key=lambda x: int(re.findall(r'\d+', x.name)[0]))
-                resp_files = sorted(dir_path.glob("responses/Resp*.txt"),
-                                 key=lambda x: int(re.findall(r'\d+', x.name)[0]))
-                ref_files = sorted(dir_path.glob("referrers/Ref*.txt"),
-                                 key=lambda x: int(re.findall(r'\d+', x.name)[0]))
+                # Load the items from an ENVExtract pack or its per-item files
+                items = load_items(dir_path)
                 
                 # Create boxes
-                for i, (req_file, resp_file, ref_file) in enumerate(zip(req_files, resp_files, ref_files)):
-                    with open(req_file, 'r') as f:
-                        request = f.read()
-                    with open(resp_file, 'r') as f:
-                        response = f.read()
-                    with open(ref_file, 'r') as f:
-                        referrer = f.read().strip()
-                        
+                for i, item in enumerate(items):
                     # Create box
                     box = DraggableBox(
                         self.canvas,
                         x=50 + (i % 3) * 250,
                         y=50 + (i // 3) * 200,
                         title=f"EP{i+1}",
-                        request=request,
-                        response=response,
-                        referrer=referrer
+                        request=item['request'],
+                        response=item['response'],
+                        referrer=item['referrer']
                     )
                     self.boxes.append(box)
                 
@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import xml.etree.ElementTree as ET
 import base64
 from pathlib import Path
 import re
@@ -8,6 +7,12 @@ from datetime import datetime
 import os
 import sys
 import argparse
+import itertools
+import queue
+import threading
+from BurpStream import open_items, DecodedBodyCache
+from ChunkedText import ChunkedTextRenderer
+from CurlRequest import CurlRequest
 
 class HTTPViewer:
     def __init__(self, root):
@@ -19,10 +24,22 @@ class HTTPViewer:
         self.current_index = 0
         self.items = []
         self.current_item = None
+        self.body_cache = DecodedBodyCache()  # position -> decoded item, bounded by size
         self.output_dir = Path.home() / "http_viewer_output"  # Default output directory
         
+        # Background prefetch: a worker decodes the current item and its
+        # neighbours; the Tk thread picks results up from ready_queue
+        self.prefetch_radius = 3
+        self.prefetch_queue = queue.PriorityQueue()  # (distance, seq, items, position)
+        self.ready_queue = queue.Queue()  # positions decoded into body_cache
+        self.prefetch_seq = itertools.count()
+        self.items_lock = threading.Lock()  # held while swapping files and when caching a result
+        self.prefetch_thread = threading.Thread(target=self.prefetch_worker, daemon=True)
+        self.prefetch_thread.start()
+        
         self.setup_gui()
         self.setup_bindings()
+        self.root.after(20, self.poll_prefetch)
         
     # [Rest of the HTTPViewer class remains unchanged]
     def setup_gui(self):
@@ -97,7 +114,8 @@ class HTTPViewer:
         self.req_text.pack(fill=tk.BOTH, expand=True)
         req_scroll = ttk.Scrollbar(req_frame, orient=tk.VERTICAL, command=self.req_text.yview)
         req_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.req_text['yscrollcommand'] = req_scroll.set
+        self.req_renderer = ChunkedTextRenderer(self.req_text)
+        self.req_renderer.attach_scrollbar(req_scroll)
         
     def setup_response_frame(self):
         """Setup response display area"""
@@ -111,7 +129,8 @@ class HTTPViewer:
         self.resp_text.pack(fill=tk.BOTH, expand=True)
         resp_scroll = ttk.Scrollbar(resp_frame, orient=tk.VERTICAL, command=self.resp_text.yview)
         resp_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.resp_text['yscrollcommand'] = resp_scroll.set
+        self.resp_renderer = ChunkedTextRenderer(self.resp_text)
+        self.resp_renderer.attach_scrollbar(resp_scroll)
         
     def setup_bindings(self):
         """Setup all event bindings"""
@@ -136,7 +155,7 @@ class HTTPViewer:
         
         # Try to extract method and endpoint from request
         if self.current_item:
-            request_content = self.req_text.get('1.0', tk.END).strip()
+            request_content = self.req_renderer.get_text().strip()
             if request_content:
                 first_line = request_content.split('\n')[0]
                 method_match = re.match(r'^(\w+)', first_line)
@@ -155,10 +174,7 @@ class HTTPViewer:
     def on_url_change(self, event=None):
         """Handle URL or endpoint changes"""
         if self.current_item is not None:
-            full_url = self.get_full_url()
-            url_elem = self.current_item.find('url')
-            if url_elem is not None:
-                url_elem.text = full_url
+            self.current_item['url'] = self.get_full_url()
                 
     def get_full_url(self):
         """Combine base URL and endpoint"""
@@ -188,11 +204,12 @@ class HTTPViewer:
             return base_url, endpoint
             
     def load_xml_file(self, filename):
-        """Load and parse XML file"""
+        """Open XML file (or BurpStore database) for random access; items are parsed on display"""
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
-            self.items = root.findall('.//item')
+            items = open_items(filename)
+            with self.items_lock:
+                self.items = items
+                self.body_cache.clear()
             if self.items:
                 self.update_display()
             else:
@@ -207,80 +224,106 @@ class HTTPViewer:
         except:
             return "Unable to decode base64 content"
             
+    def decode_item(self, items, position):
+        """Parse one item from the index and decode its request and response"""
+        item = items[position]
+        decoded = {'url': item.find('url').text, 'status': item.find('status').text}
+        for field in ('request', 'response'):
+            element = item.find(field)
+            content = element.text
+            if element.get('base64') == 'true':
+                content = self.decode_base64(content)
+            decoded[field] = content
+        return decoded
+        
+    def decode_item_safe(self, items, position):
+        """decode_item for the worker thread: errors become displayable text"""
+        try:
+            return self.decode_item(items, position)
+        except Exception as e:
+            message = f"Failed to decode item: {str(e)}"
+            return {'url': '', 'status': '', 'request': message, 'response': message}
+        
+    def prefetch_worker(self):
+        """Decode queued positions into the cache, nearest to the current item first"""
+        while True:
+            _, _, items, position = self.prefetch_queue.get()
+            
+            # Skip work for a file that was replaced or a position we moved away from
+            if items is not self.items or abs(position - self.current_index) > self.prefetch_radius:
+                continue
+            if position in self.body_cache:
+                self.ready_queue.put(position)
+                continue
+                
+            decoded = self.decode_item_safe(items, position)
+            with self.items_lock:
+                # The file may have been replaced while decoding; its cache is already cleared
+                if items is not self.items:
+                    continue
+                self.body_cache.put(position, decoded)
+            self.ready_queue.put(position)
+            
+    def schedule_prefetch(self):
+        """Queue the current item and its neighbours for background decoding"""
+        items = self.items
+        for distance in range(self.prefetch_radius + 1):
+            for position in {self.current_index - distance, self.current_index + distance}:
+                if 0 <= position < len(items) and position not in self.body_cache:
+                    self.prefetch_queue.put((distance, next(self.prefetch_seq), items, position))
+                    
+    def poll_prefetch(self):
+        """Tk-thread side of the prefetcher: show the current item once it is ready"""
+        try:
+            while True:
+                position = self.ready_queue.get_nowait()
+                if position == self.current_index and self.current_item is None:
+                    self.update_display()
+        except queue.Empty:
+            pass
+        self.root.after(20, self.poll_prefetch)
+        
     def update_display(self):
         """Update all display elements with current item data"""
-        self.current_item = self.items[self.current_index]
+        # Decoding happens on the prefetch worker; never block the Tk thread on it
+        self.current_item = self.body_cache.get(self.current_index)
+        self.schedule_prefetch()
         
         # Update counter
         self.counter_label.config(text=f"Request {self.current_index + 1} of {len(self.items)}")
         
+        # Update button states
+        self.prev_button.state(['!disabled'] if self.current_index > 0 else ['disabled'])
+        self.next_button.state(['!disabled'] if self.current_index < len(self.items) - 1 else ['disabled'])
+        
+        if self.current_item is None:
+            # Placeholder until poll_prefetch sees this position decoded
+            self.status_label.config(text="Status: loading...")
+            self.req_renderer.set_content("Loading...")
+            self.resp_renderer.set_content("Loading...")
+            return
+        
         # Update URL fields
-        url = self.current_item.find('url').text
-        base_url, endpoint = self.split_url(url)
+        base_url, endpoint = self.split_url(self.current_item['url'])
         self.base_url_entry.delete(0, tk.END)
         self.base_url_entry.insert(0, base_url)
         self.endpoint_entry.delete(0, tk.END)
         self.endpoint_entry.insert(0, endpoint)
         
         # Update status
-        status = self.current_item.find('status').text
-        self.status_label.config(text=f"Status: {status}")
+        self.status_label.config(text=f"Status: {self.current_item['status']}")
         
         # Update request
-        request = self.current_item.find('request')
-        request_content = request.text
-        if request.get('base64') == 'true':
-            request_content = self.decode_base64(request_content)
-        
-        self.req_text.delete('1.0', tk.END)
-        self.req_text.insert('1.0', request_content)
+        self.req_renderer.set_content(self.current_item['request'])
         
         # Update response
-        response = self.current_item.find('response')
-        response_content = response.text
-        if response.get('base64') == 'true':
-            response_content = self.decode_base64(response_content)
-        
-        self.resp_text.delete('1.0', tk.END)
-        self.resp_text.insert('1.0', response_content)
-        
-        # Update button states
-        self.prev_button.state(['!disabled'] if self.current_index > 0 else ['disabled'])
-        self.next_button.state(['!disabled'] if self.current_index < len(self.items) - 1 else ['disabled'])
+        self.resp_renderer.set_content(self.current_item['response'])
         
     def format_curl_command(self, request_content, url):
         """Format request details into a curl command"""
         try:
-            # Split request into lines
-            lines = request_content.split('\n')
-            method = lines[0].split()[0]
-            headers = ["-H $'synack-WalkerTXSSRanger: 1'"]
-            cookie = None
-            
-            # Parse headers
-            for line in lines[1:]:
-                if not line.strip():
-                    continue
-                if ':' in line:
-                    key, value = line.split(':', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    if key.lower() == 'cookie':
-                        cookie = value
-                    elif key.lower() not in ['connection', 'content-length']:
-                        headers.append(f"-H $'{key}: {value}'")
-            
-            # Build curl command
-            curl_parts = [f"curl --path-as-is -i -s -k -X $'{method}'"]
-            curl_parts.extend(f"    {header}" for header in sorted(headers))
-            
-            if cookie:
-                curl_parts.append(f"    -b $'{cookie}'")
-            
-            curl_parts.append(f"    $'{url}'")
-            
-            return ' \\\n'.join(curl_parts)
+            request = CurlRequest.from_raw(url, request_content)
+            return request.to_curl(extra_headers=[('synack-WalkerTXSSRanger', '1')])
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to format curl command: {str(e)}")
@@ -296,7 +339,7 @@ class HTTPViewer:
             output_dir = Path(self.output_path_entry.get())
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            request_content = self.req_text.get('1.0', tk.END).strip()
+            request_content = self.req_renderer.get_text().strip()
             url = self.get_full_url()
             
             curl_command = self.format_curl_command(request_content, url)
@@ -1,102 +1,234 @@
 import xml.etree.ElementTree as ET
 import os
 from pathlib import Path
+from collections import defaultdict
 import shutil
 import argparse
+import json
+import multiprocessing
+import tempfile
+from BurpStream import iter_items, serialize_item, ItemWriter, ItemIndex
+from BurpStore import is_store
+from KeywordMatcher import KeywordAutomaton
+from BurpDedup import SeenSet, dedup_items
+
+def item_features(item):
+    """Pull the fields every rule looks at out of an item, once"""
+    path = item.find('path').text or ''
+    return {
+        'method': (item.find('method').text or '').strip(),
+        'path': path,
+        'path_lower': path.lower(),
+    }
+
+class ClassifierEngine:
+    """Single-pass classifier that streams each item to every matching bucket.
+
+    Taggers turn an item's features into a set of tags; buckets subscribe to
+    one or more tags. Each item is tagged once and each matching bucket is a
+    dict lookup, so the cost per item does not grow with the bucket count.
+    """
+    def __init__(self, append=False):
+        self.append = append  # add to existing bucket files instead of replacing them
+        self.taggers = []
+        self.buckets = defaultdict(list)  # tag -> [ItemWriter]
+        self.writers = []
+
+    def add_tagger(self, tagger):
+        """Register a function mapping item features to an iterable of tags"""
+        self.taggers.append(tagger)
+
+    def add_bucket(self, output_file, tags):
+        """Write every item carrying any of the given tags to output_file"""
+        writer = ItemWriter(output_file, append=self.append)
+        self.writers.append(writer)
+        for tag in tags:
+            self.buckets[tag].append(writer)
+        return writer
+
+    def tag(self, features):
+        """Return the set of tags for one item"""
+        tags = set()
+        for tagger in self.taggers:
+            tags.update(tagger(features))
+        return tags
+
+    def classify(self, item):
+        """Return the writers an item belongs to, each at most once"""
+        matched = {}
+        for tag in self.tag(item_features(item)):
+            for writer in self.buckets.get(tag, ()):
+                matched[id(writer)] = writer
+        return list(matched.values())
+
+    def run(self, items):
+        """Classify all items in one pass, serializing each matched item once"""
+        try:
+            for item in items:
+                writers = self.classify(item)
+                if writers:
+                    item_xml = serialize_item(item)
+                    for writer in writers:
+                        writer.write_raw(item_xml)
+        finally:
+            for writer in self.writers:
+                writer.close()
 
 class XMLProcessor:
-    def __init__(self, xml_file):
-        self.tree = ET.parse(xml_file)
-        self.root = self.tree.getroot()
-        
+    def __init__(self, xml_file, custom_rules=None, append=False, output_dir='.'):
+        # Items are streamed from disk in a single pass instead of parsing the whole export
+        self.xml_file = xml_file
+
+        # Bucket directories are created under output_dir (shard workers use a scratch dir)
+        self.output_dir = Path(output_dir)
+
+        # User-defined buckets: name -> keywords matched against the lowercased path
+        self.custom_rules = custom_rules or {}
+
+        # Incremental runs add new items to the existing bucket files
+        self.append = append
+
         # Create base directories if they don't exist
         self.base_dirs = ['POST', 'PUT', 'GET', 'DELETE', 'Objects', 'Functions']
+        if self.custom_rules:
+            self.base_dirs.append('Custom')
         for dir_name in self.base_dirs:
-            Path(dir_name).mkdir(exist_ok=True)
-            
+            (self.output_dir / dir_name).mkdir(parents=True, exist_ok=True)
+
         # Common file extensions to look for
-        self.file_extensions = {'.js', '.php', '.txt', '.html', '.asp', '.aspx', '.css', 
+        self.file_extensions = {'.js', '.php', '.txt', '.html', '.asp', '.aspx', '.css',
                               '.xml', '.json', '.pdf', '.doc', '.docx', '.xls', '.xlsx'}
-        
+
         # Authentication-related words to look for
         self.auth_words = {'login', 'signup', 'sign-up', 'log-in', 'authenticate', 'auth',
                           'register', 'signin', 'sign-in', 'logout', 'log-out'}
 
-    def sort_by_method(self):
-        """Sort requests by HTTP method (GET, POST, PUT, DELETE)"""
-        method_items = {'GET': [], 'POST': [], 'PUT': [], 'DELETE': []}
-        
-        for item in self.root.findall('.//item'):
-            method = item.find('method').text.strip()
-            if method in method_items:
-                method_items[method].append(item)
-        
-        # Create separate XML files for each method
-        for method, items in method_items.items():
-            if items:
-                new_root = ET.Element('items')
-                for item in items:
-                    new_root.append(item)
-                tree = ET.ElementTree(new_root)
-                tree.write(f"{method}/requests_{method.lower()}.xml")
-
-    def sort_by_filetype_and_api(self):
-        """Sort requests by file extension and API endpoints"""
-        objects_items = []
-        
-        for item in self.root.findall('.//item'):
-            path = item.find('path').text
-            url = item.find('url').text
-            
-            # Check for file extensions
-            has_extension = any(ext in path.lower() for ext in self.file_extensions)
-            
-            # Check for 'api' in path
-            has_api = 'api' in path.lower()
-            
-            if has_extension or has_api:
-                objects_items.append(item)
-        
-        if objects_items:
-            new_root = ET.Element('items')
-            for item in objects_items:
-                new_root.append(item)
-            tree = ET.ElementTree(new_root)
-            tree.write("Objects/objects_endpoints.xml")
-
-    def sort_by_api_and_auth(self):
-        """Sort requests by API endpoints and authentication-related paths"""
-        functions_items = []
-        
-        for item in self.root.findall('.//item'):
-            path = item.find('path').text.lower()
-            
-            # Check for 'api' in path or auth-related words
-            has_api = 'api' in path
-            has_auth = any(word in path for word in self.auth_words)
-            
-            if has_api or has_auth:
-                functions_items.append(item)
-        
-        if functions_items:
-            new_root = ET.Element('items')
-            for item in functions_items:
-                new_root.append(item)
-            tree = ET.ElementTree(new_root)
-            tree.write("Functions/api_auth_endpoints.xml")
-
-    def process(self):
-        """Run all sorting operations"""
-        self.sort_by_method()
-        self.sort_by_filetype_and_api()
-        self.sort_by_api_and_auth()
+        self.matcher = self.build_matcher()
+        self.engine = self.build_engine()
+
+    def build_matcher(self):
+        """Compile every path keyword into one automaton, tagged by bucket"""
+        matcher = KeywordAutomaton()
+        for ext in self.file_extensions:
+            matcher.add(ext, 'extension')
+        matcher.add('api', 'api')
+        for word in self.auth_words:
+            matcher.add(word, 'auth')
+        for name, keywords in self.custom_rules.items():
+            for keyword in keywords:
+                matcher.add(keyword, f"custom:{name}")
+        return matcher.compile()
+
+    def tag_path(self, features):
+        """Tag an item by HTTP method plus every keyword group found in its path"""
+        tags = self.matcher.find_tags(features['path_lower'])
+        tags.add(f"method:{features['method']}")
+        return tags
+
+    def build_engine(self):
+        """Register every bucket with a single-pass classifier"""
+        engine = ClassifierEngine(append=self.append)
+        engine.add_tagger(self.tag_path)
+
+        # Sort requests by HTTP method (GET, POST, PUT, DELETE)
+        for method in ('GET', 'POST', 'PUT', 'DELETE'):
+            engine.add_bucket(self.output_dir / f"{method}/requests_{method.lower()}.xml", [f"method:{method}"])
+
+        # Sort requests by file extension and API endpoints
+        engine.add_bucket(self.output_dir / "Objects/objects_endpoints.xml", ['extension', 'api'])
+
+        # Sort requests by API endpoints and authentication-related paths
+        engine.add_bucket(self.output_dir / "Functions/api_auth_endpoints.xml", ['api', 'auth'])
+
+        # User-defined keyword buckets
+        for name in self.custom_rules:
+            engine.add_bucket(self.output_dir / f"Custom/{name}.xml", [f"custom:{name}"])
+
+        return engine
+
+    def process(self, seen=None, processes=1):
+        """Run all sorting operations in a single pass over the export.
+
+        If seen (a BurpDedup.SeenSet) is given, items already processed in
+        earlier runs are skipped and new ones are recorded. With processes > 1
+        the export is split into shards classified in parallel.
+        """
+        self.dedup_stats = {}
+        if processes > 1:
+            if seen is not None or is_store(self.xml_file):
+                print("Note: --seen and store inputs are processed serially")
+            else:
+                self.process_sharded(processes)
+                return
+
+        items = iter_items(self.xml_file)
+        if seen is not None:
+            items = dedup_items(items, seen, self.dedup_stats)
+        self.engine.run(items)
+
+    def process_sharded(self, processes):
+        """Classify item-aligned shards in a process pool, then merge them in shard order.
+
+        Each worker writes complete bucket documents into its own scratch
+        directory; the merge copies their items into the real buckets shard by
+        shard, so the output is identical to a serial run.
+        """
+        index = ItemIndex.open(self.xml_file)
+        # Only the offsets and lengths are needed from here on
+        index.close()
+        # A few shards per process evens out shards that classify slower
+        ranges = index.shard_ranges(processes * 4)
+
+        with tempfile.TemporaryDirectory(dir=self.output_dir, prefix='.shards-') as work_dir:
+            shard_dirs = [os.path.join(work_dir, str(n)) for n in range(len(ranges))]
+            # Workers get their item spans rather than each loading (or rebuilding) the index
+            jobs = [(self.xml_file, self.custom_rules, index.offsets[start:stop], index.lengths[start:stop], shard_dir)
+                    for (start, stop), shard_dir in zip(ranges, shard_dirs)]
+            with multiprocessing.Pool(processes) as pool:
+                shard_counts = pool.starmap(classify_shard, jobs)
+
+            for writer in self.engine.writers:
+                bucket = os.path.relpath(writer.output_file, self.output_dir)
+                try:
+                    for shard_dir, counts in zip(shard_dirs, shard_counts):
+                        if bucket in counts:
+                            writer.copy_items_from(os.path.join(shard_dir, bucket), counts[bucket])
+                finally:
+                    writer.close()
+
+def classify_shard(xml_file, custom_rules, offsets, lengths, shard_dir):
+    """Pool worker: classify the items at offsets/lengths into buckets under shard_dir.
+
+    Returns {bucket path relative to shard_dir: item count} for non-empty buckets.
+    """
+    processor = XMLProcessor(xml_file, custom_rules, output_dir=shard_dir)
+    index = ItemIndex(xml_file, offsets, lengths)
+    try:
+        processor.engine.run(index.iter_range(0, len(index)))
+    finally:
+        index.close()
+    return {os.path.relpath(writer.output_file, shard_dir): writer.count
+            for writer in processor.engine.writers if writer.count}
+
+def load_rules(rules_file):
+    """Load custom bucket rules: a JSON object of bucket name -> list of keywords"""
+    with open(rules_file, 'r') as f:
+        rules = json.load(f)
+    return {name: [keyword.lower() for keyword in keywords] for name, keywords in rules.items()}
 
 def main():
     # Set up argument parser
     parser = argparse.ArgumentParser(description='Process XML file and sort requests into categories')
     parser.add_argument('-f', '--file', required=True, help='Input XML file to process')
     parser.add_argument('--no-cleanup', action='store_true', help='Skip cleaning up existing directories')
+    parser.add_argument('--rules', help='JSON file of custom buckets ({"name": ["keyword", ...]}), written to Custom/')
+    parser.add_argument('--seen', help='Fingerprint file of items processed in earlier runs; only new items are '
+                                       'sorted and appended to the existing output (implies --no-cleanup)')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help='Classify the export in parallel shards with this many processes (default: 1)')
     args = parser.parse_args()
+    if args.seen and args.processes > 1:
+        parser.error('--seen runs are incremental and serial; it cannot be combined with -j')
 
     # Verify file exists
     if not os.path.exists(args.file):
@@ -104,15 +236,23 @@ def main():
         return
 
     # Clean up existing directories unless --no-cleanup is specified
-    if not args.no_cleanup:
-        for dir_name in ['POST', 'PUT', 'GET', 'DELETE', 'Objects', 'Functions']:
+    if not args.no_cleanup and not args.seen:
+        for dir_name in ['POST', 'PUT', 'GET', 'DELETE', 'Objects', 'Functions', 'Custom']:
             if os.path.exists(dir_name):
                 shutil.rmtree(dir_name)
+        for dir_name in ['POST', 'PUT', 'GET', 'DELETE', 'Objects', 'Functions']:
             os.makedirs(dir_name)
 
     try:
-        processor = XMLProcessor(args.file)
-        processor.process()
+        custom_rules = load_rules(args.rules) if args.rules else None
+        processor = XMLProcessor(args.file, custom_rules, append=bool(args.seen))
+        if args.seen:
+            with SeenSet(args.seen) as seen:
+                processor.process(seen)
+            stats = processor.dedup_stats
+            print(f"New items: {stats.get('new', 0)}, already seen: {stats.get('duplicate', 0)}")
+        else:
+            processor.process(processes=args.processes)
         print(f"XML processing complete. Input file: {args.file}")
         print("Check the respective directories for sorted XML files.")
     except ET.ParseError as e:
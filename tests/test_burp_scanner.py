@@ -0,0 +1,62 @@
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Shared Burp helpers live in the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from BurpStream import iter_items, item_text, decode_field, raw_body
+from BurpScanner import scan_items
+
+FIELDS = ('url', 'method', 'request', 'response')
+
+# Raw CRLF and lone CR line endings in CDATA and in escaped text, as Burp writes plain-text items
+CRLF_EXPORT = (
+    b'<?xml version="1.0"?>\r\n<items>\r\n'
+    b'<item><url><![CDATA[https://example.com/a]]></url><method>GET</method>'
+    b'<request base64="false"><![CDATA[GET /a HTTP/1.1\r\nHost: example.com\r\n\r\n]]></request>'
+    b'<response base64="false">HTTP/1.1 200 OK\r\nX-A: &lt;b&gt; &amp;\r\rbody\r\n</response></item>\r\n'
+    b'<item><url>https://example.com/b</url><method>POST</method>'
+    b'<request base64="true">UE9TVCAvYiBIVFRQLzEuMQ0KDQp4PTE=</request>'
+    b'<response base64="false"></response></item>\r\n'
+    b'</items>\r\n'
+)
+
+class ScannerMatchesIterparseTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.xml_file = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(handle, 'wb') as f:
+            f.write(CRLF_EXPORT)
+
+    def tearDown(self):
+        os.remove(self.xml_file)
+
+    def test_crlf_items(self):
+        expected = []
+        for item in iter_items(self.xml_file):
+            expected.append({
+                'text': {name: item_text(item, name) for name in FIELDS},
+                'decoded': {name: decode_field(item.find(name)) for name in ('request', 'response')},
+                'body': {name: raw_body(item.find(name)) for name in ('request', 'response')},
+            })
+
+        scanned = []
+        for item in scan_items(self.xml_file, FIELDS):
+            scanned.append({
+                'text': {name: item.text(name) for name in FIELDS if not item.is_base64(name)},
+                'decoded': {name: item.decoded(name) for name in ('request', 'response')},
+                'body': {name: item.body(name) for name in ('request', 'response')},
+            })
+
+        self.assertEqual(len(scanned), 2)
+        for want, got in zip(expected, scanned):
+            for name, text in got['text'].items():
+                self.assertEqual(text, want['text'][name], name)
+            self.assertEqual(got['decoded'], want['decoded'])
+            self.assertEqual(got['body'], want['body'])
+        # Base64 payloads keep the CRLFs they encode
+        self.assertIn('\r\n', scanned[1]['decoded']['request'])
+
+if __name__ == "__main__":
+    unittest.main()